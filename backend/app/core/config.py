@@ -42,9 +42,30 @@ class Settings:
     SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
     EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@unipass.edu")
     EMAIL_FROM_NAME = os.getenv("EMAIL_FROM_NAME", "UniPass")
+    SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "5"))
+    SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+    SMTP_SEND_RATE_PER_SECOND = float(os.getenv("SMTP_SEND_RATE_PER_SECOND", "10"))
+    SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "30"))  # Seconds before a pooled connection is reopened
     
     # Server Configuration
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "8000"))
+    # Sync route handlers run in this many worker threads (Starlette's default is 40)
+    THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
+    
+    # Rate limiting: memory:// counts per worker process; point every worker at
+    # the same redis:// URI (needs the redis package) for cluster-wide limits
+    RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window")
+    # Proxies in front of the app that append to X-Forwarded-For (0 = use the socket peer)
+    TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+    
+    # Database connection pool
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Recycle connections before server/proxy idle timeouts close them
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Application Logging Setup
+Routes all log records through a queue so handler I/O runs on a
+background thread instead of the request thread
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+
+
+def setup_logging():
+    """
+    Install a QueueHandler on the root logger, drained by a QueueListener
+    that writes to stderr. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    ))
+    
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(QueueHandler(log_queue))
+    
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
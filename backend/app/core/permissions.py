@@ -6,10 +6,14 @@ Provides FastAPI dependencies for checking user roles
 from fastapi import Depends, HTTPException, status, Request
 from typing import Optional
 from app.models.user import User, UserRole
+from app.models.event import Event
 from app.security.jwt import get_current_user, decode_access_token
 from app.db.database import get_db
 from sqlalchemy.orm import Session
 
+# Roles allowed through require_organizer (hashed lookup per request)
+ORGANIZER_ROLES = frozenset({UserRole.ADMIN, UserRole.ORGANIZER})
+
 
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """
@@ -29,7 +33,7 @@ def require_organizer(current_user: User = Depends(get_current_user)) -> User:
     Dependency to ensure current user has ORGANIZER or ADMIN role
     Organizers can manage events and view analytics
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
+    if current_user.role not in ORGANIZER_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Event organizer access required"
@@ -37,6 +41,28 @@ def require_organizer(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+def require_event_organizer(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_organizer)
+) -> Event:
+    """
+    Dependency to load an event the current user is allowed to manage
+    Admins can manage every event, organizers only the events they created
+    Usage: event: Event = Depends(require_event_organizer)
+    """
+    event = db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    if current_user.role != UserRole.ADMIN and event.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return event
+
+
 def require_scanner(current_user: User = Depends(get_current_user)) -> User:
     """
     Dependency to ensure current user is authenticated
@@ -76,7 +102,7 @@ def get_current_user_optional(
         if not user_id:
             return None
         
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         return user
     except:
         return None
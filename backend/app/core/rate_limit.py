@@ -0,0 +1,35 @@
+"""
+Rate Limiting
+Shared slowapi setup so every router counts requests in the same storage
+and keys them by the real client address
+"""
+
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from app.core.config import settings
+
+
+def client_ip(request: Request) -> str:
+    """
+    Rate-limit key for a request
+    Behind TRUSTED_PROXY_HOPS proxies, takes the address the outermost trusted
+    proxy saw from X-Forwarded-For; entries further left are client-supplied
+    """
+    hops = settings.TRUSTED_PROXY_HOPS
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if hops > 0 and forwarded_for:
+        addresses = [part.strip() for part in forwarded_for.split(",") if part.strip()]
+        if addresses:
+            return addresses[-min(hops, len(addresses))]
+    return get_remote_address(request)
+
+
+def create_limiter(**kwargs) -> Limiter:
+    """Limiter backed by RATE_LIMIT_STORAGE_URI (memory:// per process, redis:// cluster-wide)"""
+    return Limiter(
+        key_func=client_ip,
+        storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+        strategy=settings.RATE_LIMIT_STRATEGY,
+        **kwargs
+    )
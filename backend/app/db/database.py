@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, cast, case, JSON
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
@@ -6,10 +6,11 @@ from app.core.config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    pool_size=10,           # Number of connections to keep in pool
-    max_overflow=20,        # Max connections above pool_size
+    pool_size=settings.DB_POOL_SIZE,        # Number of connections to keep in pool
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Max connections above pool_size
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Fail fast instead of queueing behind a surge
     pool_pre_ping=True,     # Verify connection health before using
-    pool_recycle=3600,      # Recycle connections after 1 hour
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections before idle timeouts
     echo=False              # Set to True for SQL query logging
 )
 
@@ -20,4 +21,63 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def pool_info() -> dict:
+    """Connection pool usage counters for the shared engine"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def year_month(db, column):
+    """
+    SQL expression formatting a datetime column as 'YYYY-MM'
+    Uses to_char on PostgreSQL and strftime on SQLite
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime('%Y-%m', column)
+    return func.to_char(column, 'YYYY-MM')
+
+
+def json_array_length(db, column):
+    """
+    SQL expression for the length of a JSON array column
+    Non-array values (e.g. JSON null) yield NULL on PostgreSQL and 0 on SQLite
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.json_array_length(column)
+    as_json = cast(column, JSON)
+    return case((func.json_typeof(as_json) == 'array', func.json_array_length(as_json)))
+
+
+def minute_bucket(db, column):
+    """
+    SQL expression truncating a datetime column to the minute
+    Uses date_trunc on PostgreSQL and strftime on SQLite (returns text there)
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime('%Y-%m-%d %H:%M:00', column)
+    return func.date_trunc('minute', column)
+
+
+def insert_ignoring_conflicts(db, model, index_elements, index_where=None):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO NOTHING for the session's dialect
+    index_where selects a partial unique index as the conflict target
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(model).on_conflict_do_nothing(
+        index_elements=index_elements,
+        index_where=index_where
+    )
@@ -0,0 +1,26 @@
+from datetime import timezone
+from sqlalchemy.types import DateTime, TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime that always comes back timezone-aware in UTC
+    Timestamps are stored as UTC; naive columns get tzinfo attached on load
+    and aware values are converted to naive UTC before they are written
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            # Normalised even for timezone columns: SQLite keeps only the
+            # wall-clock time and would silently drop a non-UTC offset
+            value = value.astimezone(timezone.utc)
+            if not self.impl.timezone:
+                value = value.replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
@@ -1,11 +1,14 @@
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.core.rate_limit import create_limiter
 from app.db.database import engine
 from app.db.base import Base
 
@@ -37,10 +40,12 @@ from app.routes.lecture_ai import router as lecture_ai_router
 
 Base.metadata.create_all(bind=engine)
 
+setup_logging()
+
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+limiter = create_limiter(default_limits=["100/minute"])
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=ORJSONResponse)
 
 # Add rate limiter to app state
 app.state.limiter = limiter
@@ -83,4 +88,10 @@ def root():
 
 @app.on_event("startup")
 def startup():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+
+@app.on_event("startup")
+async def configure_threadpool():
+    # Route handlers are sync, so concurrent requests are capped by AnyIO's
+    # worker threads; the limiter has to be resized from inside the event loop
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
\ No newline at end of file
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Text
+from sqlalchemy import Index, Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import UTCDateTime
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -15,10 +16,10 @@ class Attendance(Base):
     __tablename__ = "attendance"
 
     id = Column(Integer, primary_key=True, index=True)
-    ticket_id = Column(Integer, index=True)
+    ticket_id = Column(Integer, ForeignKey('tickets.id', ondelete='CASCADE'), index=True)  # Rows go with their ticket
     event_id = Column(Integer, index=True)
     student_prn = Column(String, index=True)
-    scanned_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)  # Indexed for time analysis
+    scanned_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), index=True)  # Indexed for time analysis
     
     # Multi-Day Event Support
     day_number = Column(Integer, nullable=True)  # Which day of the event (1, 2, 3, etc.)
@@ -37,4 +38,22 @@ class Attendance(Base):
     
     # Relationships
     scanner = relationship("User", foreign_keys=[scanner_id])
-    invalidator = relationship("User", foreign_keys=[invalidated_by])
\ No newline at end of file
+    invalidator = relationship("User", foreign_keys=[invalidated_by])
+    
+    # Serves per-event counts and "latest scan" lookups (backward index scan)
+    __table_args__ = (
+        Index("idx_attendance_time_range", "event_id", "scanned_at"),
+        # Valid-attendance lookups per student (reconciliation, bulk resolve)
+        Index(
+            "ix_att_event_prn_valid", "event_id", "student_prn",
+            postgresql_where=(invalidated == False),
+            sqlite_where=(invalidated == False),
+        ),
+        # One valid scan per student per day; conflict target for scan inserts
+        Index(
+            "ix_att_event_prn_day", "event_id", "student_prn", "day_number",
+            unique=True,
+            postgresql_where=(invalidated == False),
+            sqlite_where=(invalidated == False),
+        ),
+    )
\ No newline at end of file
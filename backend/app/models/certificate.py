@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Enum as SQLEnum
+from sqlalchemy import Index, Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime, timezone
 import hashlib
+import hmac
 import os
 from enum import Enum
 
@@ -54,6 +55,7 @@ class Certificate(Base):
     
     # Unique constraint: one certificate per student per event
     __table_args__ = (
+        Index("idx_certificate_event_student", "event_id", "student_prn"),
         {"sqlite_autoincrement": True},
     )
     
@@ -69,4 +71,4 @@ class Certificate(Base):
     def verify_hash(self, provided_hash: str, secret_key: str = None) -> bool:
         """Verify if provided hash matches the certificate"""
         expected_hash = self.generate_verification_hash(secret_key)
-        return expected_hash == provided_hash
+        return hmac.compare_digest(expected_hash.encode(), (provided_hash or "").encode())
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Index, Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.types import UTCDateTime
 from datetime import datetime, timezone
 
 class Event(Base):
@@ -10,9 +11,9 @@ class Event(Base):
     title = Column(String, index=True)
     description = Column(String)
     location = Column(String)
-    start_time = Column(DateTime, index=True)  # Indexed for AI time-based queries
-    end_time = Column(DateTime)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    start_time = Column(UTCDateTime, index=True)  # Indexed for AI time-based queries
+    end_time = Column(UTCDateTime)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Track event creator
     
     share_slug = Column(String, unique=True, index=True, nullable=False)
@@ -33,4 +34,9 @@ class Event(Base):
     audit_logs = relationship("AuditLog", back_populates="event", cascade="all, delete-orphan")
     
     # Relationship to StudentSnapshots (PS1 Phase 2)
-    student_snapshots = relationship("StudentSnapshot", back_populates="event", cascade="all, delete-orphan")
\ No newline at end of file
+    student_snapshots = relationship("StudentSnapshot", back_populates="event", cascade="all, delete-orphan")
+    
+    # Organizer dashboards list events by creator, newest first
+    __table_args__ = (
+        Index("idx_event_created_by_created_at", "created_by", "created_at"),
+    )
\ No newline at end of file
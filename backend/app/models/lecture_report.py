@@ -16,7 +16,7 @@ class LectureReport(Base):
     audio_filename = Column(String, nullable=False)  # Original audio file name
     transcript = Column(Text, nullable=True)  # Full speech-to-text transcript
     keywords = Column(JSON, nullable=True)  # Extracted keywords as JSON array
-    summary = Column(Text, nullable=True)  # AI-generated structured summary (JSON string)
+    summary = Column(JSON, nullable=True)  # AI-generated structured summary
     generated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     generated_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
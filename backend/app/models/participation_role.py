@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Index, Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime, timezone
@@ -37,5 +37,6 @@ class ParticipationRole(Base):
     assigner = relationship("User", foreign_keys=[assigned_by])
     
     __table_args__ = (
+        Index("idx_participation_role_event_student", "event_id", "student_prn"),
         {"sqlite_autoincrement": True},
     )
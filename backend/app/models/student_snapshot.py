@@ -4,8 +4,8 @@ Captures historical state of student profile at registration time
 Enables "as-of" queries for retroactive analysis
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index, Text, cast
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 
 from app.db.base import Base
@@ -41,6 +41,10 @@ class StudentSnapshot(Base):
     }
     """
     
+    # profile_data as the stored JSON text, for responses that pass it through
+    # without decoding (deferred - only loaded when asked for)
+    profile_data_raw = column_property(cast(profile_data, Text), deferred=True)
+    
     # Participation status at capture time
     participation_status = Column(JSON, nullable=True)
     """
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Index, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base   # ✅ FIXED
 
@@ -11,4 +12,13 @@ class Ticket(Base):
 
     token = Column(String, nullable=False, index=True)  # ✅ REQUIRED - indexed for fast token lookups
 
-    issued_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    issued_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    event = relationship("Event")
+    # The database cascades attendance deletes; the ORM never loads them for it
+    attendance = relationship("Attendance", cascade="all, delete-orphan", passive_deletes=True)
+
+    # One ticket per student per event; also serves duplicate-registration checks
+    __table_args__ = (
+        Index("ix_ticket_event_prn", "event_id", "student_prn", unique=True),
+    )
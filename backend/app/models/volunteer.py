@@ -3,7 +3,7 @@ Volunteer Model
 Tracks volunteers for events who receive certificates but don't have student accounts
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Index, Column, Integer, String, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime, timezone
@@ -37,5 +37,6 @@ class Volunteer(Base):
     
     # Unique constraint: one volunteer record per email per event
     __table_args__ = (
+        Index("ix_volunteer_event_email", "event_id", "email", unique=True),
         {"sqlite_autoincrement": True},
     )
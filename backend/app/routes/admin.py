@@ -2,11 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_db, pool_info
 from app.models.user import User, UserRole
 from app.models.event import Event
 from app.models.attendance import Attendance
 from app.core.permissions import require_admin
+from app.services.qr_service import qr_cache_info
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -143,7 +144,7 @@ def get_scanner_analytics(
     for scan in recent_scans:
         from app.models.student import Student
         student = db.query(Student).filter(Student.prn == scan.student_prn).first()
-        event = db.query(Event).filter(Event.id == scan.event_id).first()
+        event = db.get(Event, scan.event_id)
         
         unique_students.add(scan.student_prn)
         unique_events.add(scan.event_id)
@@ -185,7 +186,7 @@ def update_user_name(
     """
     Admin-only: Update user's display name
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -219,7 +220,7 @@ def delete_user(
     Admin-only: Delete a user (scanner or organizer)
     Prevents deletion of admin users for safety
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -261,3 +262,23 @@ def delete_user(
         "message": f"{user.role.value.capitalize()} deleted successfully",
         "deleted_user": user_info
     }
+
+
+@router.get("/cache/qr")
+def get_qr_cache_info(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Admin-only: Hit rate of the in-process QR code caches
+    """
+    return qr_cache_info()
+
+
+@router.get("/db/pool")
+def get_db_pool_info(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Admin-only: Current database connection pool usage
+    """
+    return pool_info()
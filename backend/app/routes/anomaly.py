@@ -101,7 +101,7 @@ def explain_anomaly(
     - Feature values
     - Attendance record details
     """
-    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    attendance = db.get(Attendance, attendance_id)
     if not attendance:
         raise HTTPException(status_code=404, detail="Attendance record not found")
     
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Dict
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.db.database import get_db
 from app.models.attendance import Attendance
@@ -31,7 +31,7 @@ def get_event_attendance(
     current_user: User = Depends(require_organizer)
 ):
     """Get attendance list for event - requires ORGANIZER or ADMIN role"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -149,7 +149,7 @@ def get_registered_students(
     db: Session = Depends(get_db)
 ):
     """Get all students who registered (have tickets) for this event"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -196,7 +196,7 @@ def get_attended_students(
     db: Session = Depends(get_db)
 ):
     """Get all students who actually attended (scanned) this event"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -248,7 +248,7 @@ def override_attendance(
     Requires ADMIN role only.
     """
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -279,16 +279,19 @@ def override_attendance(
         }
     
     # Create attendance record with override flag
+    scanned_at = datetime.now(timezone.utc)  # Mark with current time
     attendance = Attendance(
         ticket_id=ticket.id,
         event_id=event_id,
         student_prn=student_prn,
-        scanned_at=datetime.utcnow()  # Mark with current time
+        scanned_at=scanned_at
     )
     
+    # Flush to get the id, then commit without reloading the row
     db.add(attendance)
+    db.flush()
+    attendance_id = attendance.id
     db.commit()
-    db.refresh(attendance)
     
     # Get student info
     student = db.query(Student).filter(Student.prn == student_prn).first()
@@ -296,9 +299,9 @@ def override_attendance(
     return {
         "status": "success",
         "message": f"Attendance marked via override for {student.name if student else student_prn}",
-        "attendance_id": attendance.id,
+        "attendance_id": attendance_id,
         "student_prn": student_prn,
         "student_name": student.name if student else "Unknown",
-        "scanned_at": attendance.scanned_at.isoformat(),
+        "scanned_at": scanned_at.isoformat(),
         "override": True
     }
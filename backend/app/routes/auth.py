@@ -1,16 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
+from app.core.rate_limit import create_limiter
 from app.db.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, TokenResponse, UserResponse
 from app.security.jwt import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter()
 
 pwd_context = CryptContext(
     schemes=["pbkdf2_sha256"],
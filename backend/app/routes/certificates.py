@@ -33,7 +33,7 @@ def get_event_certificate_stats(
     Get certificate statistics for an event
     Shows how many certificates have been issued and how many are pending
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -57,7 +57,7 @@ def get_pending_certificates(
     """
     Get list of students who are eligible for certificates but haven't received them yet
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -95,7 +95,7 @@ def push_certificates(
         event_id: Event ID
         dry_run: If True, only preview who would get certificates without sending
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -147,7 +147,7 @@ def resend_failed_emails(
     
     Useful when SMTP connection was down or timed out
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -199,7 +199,7 @@ def get_role_certificate_stats(
     from app.models.volunteer import Volunteer
     from app.models.certificate import Certificate
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -214,7 +214,7 @@ def get_role_certificate_stats(
     attendee_count = len(get_students_without_certificates(db, event_id))
     
     # Organizers: event creator (if no certificate exists for their email)
-    creator = db.query(User).filter(User.id == event.created_by).first()
+    creator = db.get(User, event.created_by) if event.created_by else None
     organizer_count = 0
     if creator:
         organizer_exists = db.query(Certificate).filter(
@@ -233,7 +233,7 @@ def get_role_certificate_stats(
     scanner_count = 0
     for scanner_id_tuple in scanner_ids:
         scanner_id = scanner_id_tuple[0]
-        scanner = db.query(User).filter(User.id == scanner_id).first()
+        scanner = db.get(User, scanner_id)
         if scanner:
             scanner_cert = db.query(Certificate).filter(
                 Certificate.event_id == event_id,
@@ -276,7 +276,7 @@ def push_certificates_by_roles(
         "volunteers": true
     }
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -366,7 +366,7 @@ def resend_failed_certificates(
     from app.services.email_service import send_certificate_email
     from datetime import datetime, timezone
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
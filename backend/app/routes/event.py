@@ -2,8 +2,9 @@ import uuid
 from slugify import slugify
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.event import Event
@@ -13,9 +14,13 @@ from app.schemas.audit_log import AuditLogResponse
 from app.core.permissions import require_organizer
 from app.services.audit_service import create_audit_log, get_event_audit_logs
 from app.services.report_service import generate_event_report_pdf
+from app.routes.scan import invalidate_event_cache
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+# Built once; validates ORM rows and dumps JSON inside pydantic-core
+EVENT_LIST_ADAPTER = TypeAdapter(List[EventResponse])
+
 
 def generate_share_slug(title: str) -> str:
     return f"{slugify(title)}-{uuid.uuid4().hex[:6]}"
@@ -35,10 +40,8 @@ def create_event(
     end_time = event.end_time
     
     # If timezone-aware, convert to UTC; if naive, assume UTC
-    if start_time.tzinfo is not None:
-        start_time = start_time.astimezone(tz.utc).replace(tzinfo=None)
-    if end_time.tzinfo is not None:
-        end_time = end_time.astimezone(tz.utc).replace(tzinfo=None)
+    start_time = start_time.astimezone(tz.utc) if start_time.tzinfo else start_time.replace(tzinfo=tz.utc)
+    end_time = end_time.astimezone(tz.utc) if end_time.tzinfo else end_time.replace(tzinfo=tz.utc)
     
     new_event = Event(
         title=event.title,
@@ -49,26 +52,29 @@ def create_event(
         share_slug=generate_share_slug(event.title),
         created_by=current_user.id  # Track who created the event
     )
+    # The flush's INSERT ... RETURNING fills in the id; build the response
+    # before commit expires the instance instead of refreshing it with a SELECT
     db.add(new_event)
+    db.flush()
+    response = EventResponse.model_validate(new_event)
     db.commit()
-    db.refresh(new_event)
     
     # Audit log: Event created
     create_audit_log(
         db=db,
-        event_id=new_event.id,
+        event_id=response.id,
         user_id=current_user.id,
         action_type="event_created",
         details={
-            "title": new_event.title,
-            "location": new_event.location,
-            "start_time": new_event.start_time.isoformat(),
-            "end_time": new_event.end_time.isoformat()
+            "title": response.title,
+            "location": response.location,
+            "start_time": response.start_time.isoformat(),
+            "end_time": response.end_time.isoformat()
         },
         ip_address=request.client.host if request.client else None
     )
     
-    return new_event
+    return response
 
 
 @router.get("/", response_model=EventsPaginatedResponse)
@@ -92,22 +98,22 @@ def get_events(
     # Apply pagination and order by created date desc
     events = query.order_by(Event.created_at.desc()).offset(skip).limit(limit).all()
     
-    # Convert SQLAlchemy models to Pydantic schemas
-    events_response = [EventResponse.model_validate(event) for event in events]
-    
-    return EventsPaginatedResponse(
+    # Validate the page in one adapter call and return the JSON bytes directly,
+    # skipping FastAPI's response_model re-validation and jsonable_encoder pass
+    page = EventsPaginatedResponse(
         total=total,
         skip=skip,
         limit=limit,
-        events=events_response
+        events=EVENT_LIST_ADAPTER.validate_python(events, from_attributes=True)
     )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @router.get("/{event_id}/share")
 def get_share_link(event_id: int, db: Session = Depends(get_db)):
     from app.core.config import settings
 
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -125,7 +131,7 @@ def update_event(
     current_user: User = Depends(require_organizer)
 ):
     """Update event - Organizers can only update their own events, Admins can update any"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
 
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -137,15 +143,13 @@ def update_event(
             detail="You can only edit your own events"
         )
     
-    # Convert timezone-aware times to naive UTC for storage
+    # Normalize to UTC so they compare with the loaded (UTC-aware) times
     from datetime import timezone as tz
     start_time = payload.start_time
     end_time = payload.end_time
     
-    if start_time.tzinfo is not None:
-        start_time = start_time.astimezone(tz.utc).replace(tzinfo=None)
-    if end_time.tzinfo is not None:
-        end_time = end_time.astimezone(tz.utc).replace(tzinfo=None)
+    start_time = start_time.astimezone(tz.utc) if start_time.tzinfo else start_time.replace(tzinfo=tz.utc)
+    end_time = end_time.astimezone(tz.utc) if end_time.tzinfo else end_time.replace(tzinfo=tz.utc)
     
     # Track changes for audit log
     changes = {}
@@ -166,21 +170,23 @@ def update_event(
     event.start_time = start_time
     event.end_time = end_time
 
+    # Every field is already loaded, so respond from memory rather than refresh
+    response = EventResponse.model_validate(event)
     db.commit()
-    db.refresh(event)
+    invalidate_event_cache(event_id)
     
     # Audit log: Event edited (only if there were changes)
     if changes:
         create_audit_log(
             db=db,
-            event_id=event.id,
+            event_id=event_id,
             user_id=current_user.id,
             action_type="event_edited",
             details={"changes": changes},
             ip_address=request.client.host if request.client else None
         )
 
-    return event
+    return response
 
 @router.delete("/{event_id}")
 def delete_event(
@@ -197,7 +203,7 @@ def delete_event(
             detail="Only administrators can delete events"
         )
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
 
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -217,6 +223,7 @@ def delete_event(
 
     db.delete(event)
     db.commit()
+    invalidate_event_cache(event_id)
 
     return {"message": "Event deleted successfully"}
 
@@ -228,7 +235,7 @@ def get_audit_logs(
     current_user: User = Depends(require_organizer)
 ):
     """Get audit logs for an event - Organizers can only see logs for their events, Admins see all"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -271,7 +278,7 @@ def generate_event_report(
     Includes: Total registered, Total attended, Attendance %, Absentees list
     """
     # Get event to verify it exists and check permissions
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -19,7 +19,7 @@ def export_event_attendance_csv(
     event_id: int,
     db: Session = Depends(get_db)
 ):
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -60,7 +60,7 @@ def send_teacher_attendance(
     """
     Send attendance report email to teacher
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -1,6 +1,9 @@
+import logging
+
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, exists, and_, insert
 from typing import List
 
 from app.db.database import get_db
@@ -15,51 +18,50 @@ from app.schemas.feedback import (
     FeedbackSummary,
     SendFeedbackRequest
 )
-from app.core.permissions import require_organizer
-from app.services.email_service import send_feedback_request_email
+from app.core.permissions import require_organizer, require_event_organizer
+from app.services.email_service import send_feedback_request_email, submit_email
 from app.services.audit_service import create_audit_log
 from app.services.sentiment_analysis_service import get_sentiment_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
 
+def _feedback_exists(db: Session, event_id: int, prn: str) -> bool:
+    """Check whether a student already submitted feedback without loading the row"""
+    return db.query(
+        exists().where(and_(Feedback.event_id == event_id, Feedback.student_prn == prn))
+    ).scalar()
+
+
 @router.post("/send-requests/{event_id}")
 def send_feedback_requests(
     event_id: int,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_organizer)
+    current_user: User = Depends(require_organizer),
+    event: Event = Depends(require_event_organizer)
 ):
     """
     Send feedback form links to all students who attended ALL DAYS of the event.
     For multi-day events: only sends to students who completed full attendance.
     """
-    # Verify event exists and user has access
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check ownership (organizers can only send for their events, admins for all)
-    if current_user.role != "ADMIN" and event.created_by != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only send feedback for your own events")
-    
     # Get total days required
     total_days = event.total_days or 1
     
-    # Find students who attended ALL required days
-    from sqlalchemy import func
-    fully_attended_students = db.query(
-        Attendance.student_prn,
-        func.count(func.distinct(Attendance.day_number)).label('days_attended')
-    ).filter(
+    # Find students who attended ALL required days (only the PRN is needed)
+    rows = db.query(Attendance.student_prn).filter(
         Attendance.event_id == event_id
     ).group_by(
         Attendance.student_prn
     ).having(
         func.count(func.distinct(Attendance.day_number)) >= total_days
     ).all()
+    fully_attended_prns = [row[0] for row in rows]
+    total_fully_attended = len(fully_attended_prns)
     
-    if not fully_attended_students:
+    if not fully_attended_prns:
         raise HTTPException(
             status_code=400, 
             detail=f"No students have completed all {total_days} day(s) of this event yet"
@@ -70,32 +72,51 @@ def send_feedback_requests(
     failed_count = 0
     already_submitted = 0
     
-    for record in fully_attended_students:
-        student = db.query(Student).filter(Student.prn == record.student_prn).first()
-        
-        if student and student.email:
-            try:
-                # Check if already submitted feedback
-                existing_feedback = db.query(Feedback).filter(
-                    Feedback.event_id == event_id,
-                    Feedback.student_prn == student.prn
-                ).first()
-                
-                if existing_feedback:
-                    already_submitted += 1
-                    continue  # Skip if already submitted
-                
-                send_feedback_request_email(
-                    to_email=student.email,
-                    student_name=student.name,
-                    event_title=event.title,
-                    event_id=event.id,
-                    student_prn=student.prn
-                )
-                sent_count += 1
-            except Exception as e:
-                failed_count += 1
-                print(f"Failed to send feedback email to {student.email}: {str(e)}")
+    # Load contact details for every eligible student in one query
+    students = db.query(Student.prn, Student.name, Student.email).filter(
+        Student.prn.in_(fully_attended_prns)
+    ).all()
+    
+    # Students who already submitted feedback, in one query
+    submitted_prns = {
+        prn for (prn,) in db.query(Feedback.student_prn).filter(
+            Feedback.event_id == event_id,
+            Feedback.student_prn.in_(fully_attended_prns)
+        )
+    }
+    
+    recipients = []
+    for student in students:
+        if student.email:
+            if student.prn in submitted_prns:
+                already_submitted += 1
+                continue  # Skip if already submitted
+            recipients.append(student)
+    
+    # Queue the sends on the bounded email threads; they run concurrently
+    # up to the SMTP pool size while this request waits for the results
+    futures = [
+        submit_email(
+            send_feedback_request_email,
+            to_email=student.email,
+            student_name=student.name,
+            event_title=event.title,
+            event_id=event.id,
+            student_prn=student.prn
+        )
+        for student in recipients
+    ]
+    
+    for student, future in zip(recipients, futures):
+        try:
+            sent = future.result()
+        except Exception:
+            logger.exception("Feedback email failed to %s for event %s", student.email, event_id)
+            sent = False
+        if sent is True:
+            sent_count += 1
+        else:
+            failed_count += 1
     
     # Audit log
     create_audit_log(
@@ -107,7 +128,7 @@ def send_feedback_requests(
             "sent_count": sent_count,
             "failed_count": failed_count,
             "already_submitted": already_submitted,
-            "total_fully_attended": len(fully_attended_students),
+            "total_fully_attended": total_fully_attended,
             "total_days_required": total_days
         },
         ip_address=request.client.host if request.client else None
@@ -115,7 +136,7 @@ def send_feedback_requests(
     
     return {
         "status": "success",
-        "total_fully_attended": len(fully_attended_students),
+        "total_fully_attended": total_fully_attended,
         "emails_sent": sent_count,
         "emails_failed": failed_count,
         "already_submitted": already_submitted,
@@ -132,21 +153,26 @@ def submit_feedback(
     Public endpoint for students to submit feedback.
     Validates that student attended ALL DAYS of the event (for multi-day events).
     """
+    # Fetch required days and the student's distinct attended days in one query
+    attended_days_subquery = db.query(
+        func.count(func.distinct(Attendance.day_number))
+    ).filter(
+        Attendance.event_id == Event.id,
+        Attendance.student_prn == feedback.student_prn
+    ).correlate(Event).scalar_subquery()
+    
+    row = db.query(
+        Event.total_days,
+        attended_days_subquery.label("attended_days")
+    ).filter(Event.id == feedback.event_id).one_or_none()
+    
     # Verify event exists
-    event = db.query(Event).filter(Event.id == feedback.event_id).first()
-    if not event:
+    if not row:
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Get total days required
-    total_days = event.total_days or 1
-    
-    # Count how many distinct days student attended
-    attended_days = db.query(
-        func.count(func.distinct(Attendance.day_number))
-    ).filter(
-        Attendance.event_id == feedback.event_id,
-        Attendance.student_prn == feedback.student_prn
-    ).scalar()
+    total_days = row.total_days or 1
+    attended_days = row.attended_days
     
     # Verify student attended ALL days
     if attended_days < total_days:
@@ -156,31 +182,14 @@ def submit_feedback(
         )
     
     # Check if feedback already submitted
-    existing_feedback = db.query(Feedback).filter(
-        Feedback.event_id == feedback.event_id,
-        Feedback.student_prn == feedback.student_prn
-    ).first()
-    
-    if existing_feedback:
+    if _feedback_exists(db, feedback.event_id, feedback.student_prn):
         raise HTTPException(
             status_code=409, 
             detail="You have already submitted feedback for this event"
         )
     
-    # Create feedback record
-    new_feedback = Feedback(
-        event_id=feedback.event_id,
-        student_prn=feedback.student_prn,
-        overall_rating=feedback.overall_rating,
-        content_quality=feedback.content_quality,
-        organization_rating=feedback.organization_rating,
-        venue_rating=feedback.venue_rating,
-        speaker_rating=feedback.speaker_rating,
-        what_liked=feedback.what_liked,
-        what_improve=feedback.what_improve,
-        additional_comments=feedback.additional_comments,
-        would_recommend=feedback.would_recommend
-    )
+    # Build (unsaved) feedback record for sentiment analysis
+    new_feedback = Feedback(**feedback.model_dump())
     
     # Advanced sentiment analysis using NLP
     try:
@@ -191,7 +200,7 @@ def submit_feedback(
         )
     except Exception as e:
         # Fallback to basic rule-based sentiment if NLP fails
-        print(f"Sentiment analysis failed: {e}, using fallback")
+        logger.warning("Sentiment analysis failed: %s, using fallback", e)
         avg_rating = (
             feedback.overall_rating + 
             feedback.content_quality + 
@@ -206,38 +215,42 @@ def submit_feedback(
         else:
             new_feedback.sentiment_score = -1  # Negative
     
-    db.add(new_feedback)
+    # INSERT ... RETURNING gives back generated columns without a refresh SELECT
+    created = db.execute(
+        insert(Feedback).values(
+            **feedback.model_dump(),
+            sentiment_score=new_feedback.sentiment_score
+        ).returning(*Feedback.__table__.c)
+    ).mappings().one()
     db.commit()
-    db.refresh(new_feedback)
     
-    return new_feedback
+    return FeedbackResponse(**created)
 
 
 @router.get("/event/{event_id}/summary", response_model=FeedbackSummary)
 def get_feedback_summary(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_organizer)
+    event: Event = Depends(require_event_organizer)
 ):
     """
     Get aggregated feedback summary for an event.
     Organizers can only view their own events, admins can view all.
     Returns empty summary if no feedback submitted yet.
     """
-    # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check ownership
-    if current_user.role != "ADMIN" and event.created_by != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    # Get all feedback for event
-    feedbacks = db.query(Feedback).filter(Feedback.event_id == event_id).all()
+    # Load only the rating columns for the event
+    rows = db.query(
+        Feedback.overall_rating,
+        Feedback.content_quality,
+        Feedback.organization_rating,
+        Feedback.venue_rating,
+        Feedback.speaker_rating,
+        Feedback.would_recommend,
+        Feedback.sentiment_score
+    ).filter(Feedback.event_id == event_id).all()
     
     # Return empty summary if no feedback (not an error)
-    if not feedbacks:
+    if not rows:
         return FeedbackSummary(
             event_id=event_id,
             total_responses=0,
@@ -252,36 +265,35 @@ def get_feedback_summary(
             sentiment_negative=0
         )
     
-    total = len(feedbacks)
+    # One float matrix (NULL -> NaN) so every aggregate is a single vectorized pass
+    ratings = np.array(rows, dtype=float)
+    total = len(ratings)
     
     # Calculate averages
-    avg_overall = sum(f.overall_rating for f in feedbacks) / total
-    avg_content = sum(f.content_quality for f in feedbacks) / total
-    avg_organization = sum(f.organization_rating for f in feedbacks) / total
-    avg_venue = sum(f.venue_rating for f in feedbacks) / total
+    avg_overall, avg_content, avg_organization, avg_venue = ratings[:, 0:4].mean(axis=0)
     
     # Speaker rating (may be None for some)
-    speaker_ratings = [f.speaker_rating for f in feedbacks if f.speaker_rating]
-    avg_speaker = sum(speaker_ratings) / len(speaker_ratings) if speaker_ratings else None
+    speaker_ratings = ratings[:, 4][~np.isnan(ratings[:, 4])]
+    avg_speaker = float(speaker_ratings.mean()) if speaker_ratings.size else None
     
     # Recommendation percentage
-    recommend_count = sum(1 for f in feedbacks if f.would_recommend)
-    recommend_percentage = (recommend_count / total) * 100
+    recommend_percentage = (np.count_nonzero(ratings[:, 5] == 1) / total) * 100
     
     # Sentiment breakdown
-    sentiment_positive = sum(1 for f in feedbacks if f.sentiment_score == 1)
-    sentiment_neutral = sum(1 for f in feedbacks if f.sentiment_score == 0)
-    sentiment_negative = sum(1 for f in feedbacks if f.sentiment_score == -1)
+    sentiment = ratings[:, 6]
+    sentiment_positive = int(np.count_nonzero(sentiment == 1))
+    sentiment_neutral = int(np.count_nonzero(sentiment == 0))
+    sentiment_negative = int(np.count_nonzero(sentiment == -1))
     
     return FeedbackSummary(
         event_id=event_id,
         total_responses=total,
-        avg_overall_rating=round(avg_overall, 2),
-        avg_content_quality=round(avg_content, 2),
-        avg_organization=round(avg_organization, 2),
-        avg_venue=round(avg_venue, 2),
+        avg_overall_rating=round(float(avg_overall), 2),
+        avg_content_quality=round(float(avg_content), 2),
+        avg_organization=round(float(avg_organization), 2),
+        avg_venue=round(float(avg_venue), 2),
         avg_speaker=round(avg_speaker, 2) if avg_speaker else None,
-        recommendation_percentage=round(recommend_percentage, 1),
+        recommendation_percentage=round(float(recommend_percentage), 1),
         sentiment_positive=sentiment_positive,
         sentiment_neutral=sentiment_neutral,
         sentiment_negative=sentiment_negative
@@ -292,21 +304,12 @@ def get_feedback_summary(
 def get_event_feedback(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_organizer)
+    event: Event = Depends(require_event_organizer)
 ):
     """
     Get all feedback submissions for an event with student names.
     Returns empty list if no feedback submitted yet.
     """
-    # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check ownership
-    if current_user.role != "ADMIN" and event.created_by != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     # Get feedbacks with student names
     feedbacks = db.query(Feedback).filter(
         Feedback.event_id == event_id
@@ -349,44 +352,30 @@ def check_feedback_eligibility(
     Check if a student is eligible to submit feedback (attended and hasn't submitted yet).
     Public endpoint for feedback form validation.
     """
-    # Get event details
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
+    # Event title, attendance and prior submission in a single round trip
+    row = db.query(
+        Event.title,
+        exists().where(and_(
+            Attendance.event_id == event_id,
+            Attendance.student_prn == student_prn
+        )).label("attended"),
+        exists().where(and_(
+            Feedback.event_id == event_id,
+            Feedback.student_prn == student_prn
+        )).label("already_submitted")
+    ).filter(Event.id == event_id).one_or_none()
+    
+    if not row:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Check if attended
-    attendance = db.query(Attendance).filter(
-        Attendance.event_id == event_id,
-        Attendance.student_prn == student_prn
-    ).first()
-    
-    if not attendance:
-        return {
-            "eligible": False,
-            "event_name": event.title,
-            "attended": False,
-            "already_submitted": False
-        }
-    
-    # Check if already submitted
-    existing_feedback = db.query(Feedback).filter(
-        Feedback.event_id == event_id,
-        Feedback.student_prn == student_prn
-    ).first()
-    
-    if existing_feedback:
-        return {
-            "eligible": False,
-            "event_name": event.title,
-            "attended": True,
-            "already_submitted": True
-        }
+    # Feedback only counts once the student has actually attended
+    already_submitted = bool(row.attended and row.already_submitted)
     
     return {
-        "eligible": True,
-        "event_name": event.title,
-        "attended": True,
-        "already_submitted": False
+        "eligible": bool(row.attended) and not already_submitted,
+        "event_name": row.title,
+        "attended": bool(row.attended),
+        "already_submitted": already_submitted
     }
 
 
@@ -413,7 +402,7 @@ def get_event_sentiment_analysis(
     - Actionable insights
     """
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -481,7 +470,7 @@ def analyze_single_feedback(
     Get detailed sentiment analysis for a single feedback entry.
     Returns detailed NLP breakdown including confidence scores and themes.
     """
-    feedback = db.query(Feedback).filter(Feedback.id == feedback_id).first()
+    feedback = db.get(Feedback, feedback_id)
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     
@@ -3,31 +3,34 @@ Cortex Lecture Intelligence Engine - API Routes
 Endpoints for audio upload and report retrieval
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Request
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from typing import List, Dict, Optional
-import json
 
 from app.db.database import get_db
 from app.models.user import User
 from app.models.event import Event
 from app.models.lecture_report import LectureReport
-from app.core.permissions import require_organizer, get_current_user
-from app.services.lecture_ai_service import LectureAIService
+from app.core.permissions import require_organizer
+from app.services.lecture_ai_service import LectureAIService, run_lecture_pipeline
 from app.services.audit_service import create_audit_log
 
 router = APIRouter(prefix="/ai/lecture", tags=["Cortex Lecture AI"])
 
 
-@router.post("/upload/{event_id}")
+@router.post("/upload/{event_id}", status_code=202)
 async def upload_lecture_audio(
     event_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_organizer)
 ):
     """
-    Upload audio recording for an event and trigger AI processing
+    Upload audio recording for an event and queue AI processing
+    Returns 202 immediately; poll GET /report/{event_id} for the result
     
     Requirements:
     - User must be admin or event organizer
@@ -38,8 +41,14 @@ async def upload_lecture_audio(
     - Report ID
     - Processing status
     """
+    # Reject oversized or non-audio uploads before touching the database
+    LectureAIService.validate_upload_headers(
+        request.headers.get("content-length"),
+        file.content_type
+    )
+    
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -50,30 +59,38 @@ async def upload_lecture_audio(
             detail="Only event organizer or admin can upload lecture audio"
         )
     
-    # Process audio through AI pipeline
+    # Stream audio to disk, then queue the AI pipeline
     service = LectureAIService(db)
     try:
-        report = await service.process_lecture_audio(
-            event_id=event_id,
-            user_id=current_user.id,
-            file=file
-        )
+        audio_path = await service.save_audio_file(file, event_id)
+        try:
+            report = service.create_pending_report(
+                audio_path=audio_path,
+                event_id=event_id,
+                user_id=current_user.id
+            )
+            
+            # Log action; commits the report together with the audit entry
+            create_audit_log(
+                db=db,
+                event_id=event_id,
+                user_id=current_user.id,
+                action_type="lecture_ai_upload",
+                details={"filename": file.filename}
+            )
+        except BaseException:
+            # No report row will point at the file, so don't keep it
+            db.rollback()
+            LectureAIService.discard_audio_file(audio_path)
+            raise
         
-        # Log action
-        create_audit_log(
-            db=db,
-            event_id=event_id,
-            user_id=current_user.id,
-            action_type="lecture_ai_upload",
-            details={"filename": file.filename}
-        )
+        background_tasks.add_task(run_lecture_pipeline, report.id, audio_path)
         
         return {
             "report_id": report.id,
             "event_id": event_id,
             "status": report.status,
-            "message": "Audio uploaded and processing initiated" if report.status == "completed" 
-                      else "Audio processing in progress",
+            "message": "Audio uploaded and processing initiated",
             "filename": report.audio_filename
         }
         
@@ -90,7 +107,7 @@ async def upload_lecture_audio(
 def get_lecture_report(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Retrieve AI-generated lecture report for an event
@@ -102,17 +119,11 @@ def get_lecture_report(
     - Metadata
     """
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Check permissions
-    if current_user.role not in ["ADMIN", "ORGANIZER"]:
-        raise HTTPException(
-            status_code=403,
-            detail="Only admins and organizers can view lecture reports"
-        )
-    
+    # Organizers can only view their own events
     if current_user.role == "ORGANIZER" and event.created_by != current_user.id:
         raise HTTPException(
             status_code=403,
@@ -129,14 +140,6 @@ def get_lecture_report(
             detail="No lecture report found for this event"
         )
     
-    # Parse summary JSON
-    summary_data = None
-    if report.summary:
-        try:
-            summary_data = json.loads(report.summary)
-        except:
-            summary_data = {"raw_summary": report.summary}
-    
     return {
         "report_id": report.id,
         "event": {
@@ -149,7 +152,7 @@ def get_lecture_report(
         "error_message": report.error_message,
         "transcript": report.transcript,
         "keywords": report.keywords,
-        "summary": summary_data,
+        "summary": report.summary,
         "audio_filename": report.audio_filename,
         "generated_at": report.generated_at,
         "generated_by": {
@@ -163,6 +166,7 @@ def get_lecture_report(
 @router.get("/reports/all")
 def get_all_lecture_reports(
     limit: int = 50,
+    offset: int = 0,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_organizer)
 ):
@@ -171,30 +175,42 @@ def get_all_lecture_reports(
     
     For organizers: only their events
     For admins: all events
+    
+    total is the number of reports available, not the page size.
+    Offset pagination is fine for this volume; switch to keyset on
+    generated_at if deep pages ever get slow.
     """
     service = LectureAIService(db)
     
     if current_user.role == "ADMIN":
-        reports = service.get_all_reports(limit=limit)
+        total = db.query(func.count(LectureReport.id)).scalar()
+        rows = service.get_all_reports(limit=limit, offset=offset)
     else:
         # Organizers see only their events
-        reports = db.query(LectureReport).join(Event).filter(
+        total = db.query(func.count(LectureReport.id)).join(Event).filter(
             Event.created_by == current_user.id
-        ).order_by(LectureReport.generated_at.desc()).limit(limit).all()
+        ).scalar()
+        rows = service.get_all_reports(
+            limit=limit,
+            offset=offset,
+            created_by=current_user.id
+        )
     
     return {
-        "total": len(reports),
+        "total": total,
+        "offset": offset,
+        "limit": limit,
         "reports": [
             {
-                "report_id": r.id,
-                "event_id": r.event_id,
-                "event_title": r.event.title,
-                "status": r.status,
-                "generated_at": r.generated_at,
-                "keywords_count": len(r.keywords) if r.keywords else 0,
-                "has_transcript": bool(r.transcript),
+                "report_id": row.id,
+                "event_id": row.event_id,
+                "event_title": row.event_title,
+                "status": row.status,
+                "generated_at": row.generated_at,
+                "keywords_count": row.keywords_count,
+                "has_transcript": bool(row.has_transcript),
             }
-            for r in reports
+            for row in rows
         ]
     }
 
@@ -209,13 +225,14 @@ def delete_lecture_report(
     Delete a lecture report
     Only admin or event organizer can delete
     """
-    report = db.query(LectureReport).filter(LectureReport.id == report_id).first()
+    report = db.query(LectureReport).options(
+        joinedload(LectureReport.event)
+    ).filter(LectureReport.id == report_id).first()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     
     # Check permissions
-    event = db.query(Event).filter(Event.id == report.event_id).first()
-    if current_user.role != "ADMIN" and event.created_by != current_user.id:
+    if current_user.role != "ADMIN" and report.event.created_by != current_user.id:
         raise HTTPException(
             status_code=403,
             detail="Only event organizer or admin can delete reports"
@@ -1,21 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import SessionLocal
 from app.models.event import Event
 from app.models.attendance import Attendance
 from app.models.student import Student
 from sqlalchemy import func
+import anyio
 import asyncio
-import json
-from typing import Dict, Set
+import time
+import orjson
+from collections import deque
+from typing import Dict, List, Optional
 from datetime import datetime
 
 router = APIRouter(prefix="/monitor", tags=["Live Monitor"])
 
 # In-memory event broadcasting system
-# Maps event_id -> set of asyncio queues for connected clients
-event_monitors: Dict[int, Set[asyncio.Queue]] = {}
+# Each event has one channel holding a bounded ring buffer of recent scans;
+# connected clients keep their own read cursor instead of a private queue
+CHANNEL_BUFFER_SIZE = 256
+
+# Heartbeat cadence, so idle streams still write something regularly
+HEARTBEAT_INTERVAL = 25.0
+
+# A client that has not taken a write for this long has stopped reading
+# (half-open TCP); its stream is closed
+SEND_TIMEOUT = 2 * HEARTBEAT_INTERVAL
+
+# Scans published within this window wake monitors once, so a burst at the
+# gate goes out as one write per client instead of one per scan
+PUBLISH_COALESCE_DELAY = 0.05
+
+
+class EventChannel:
+    """
+    Ring buffer of serialized scan frames for a single event plus a wakeup signal
+    shared by every connected monitor
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.buffer: deque = deque(maxlen=CHANNEL_BUFFER_SIZE)
+        self.last_seq = 0
+        self.subscribers = 0
+        self.wakeup = asyncio.Event()
+        self.flush_scheduled = False
+
+    def publish(self, frame: bytes):
+        """Append a frame and schedule a coalesced wakeup (runs on the event loop)"""
+        self.last_seq += 1
+        self.buffer.append((self.last_seq, frame))
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.loop.call_later(PUBLISH_COALESCE_DELAY, self.flush)
+
+    def flush(self):
+        """Wake all waiting monitors for the frames published since the last flush"""
+        self.flush_scheduled = False
+        # Swap in a fresh Event so monitors that are still draining the
+        # buffer don't have their wakeup cleared by a faster neighbour
+        wakeup, self.wakeup = self.wakeup, asyncio.Event()
+        wakeup.set()
+
+    def read_since(self, cursor: int) -> List[tuple]:
+        """Return buffered (seq, frame) entries newer than cursor"""
+        return [entry for entry in self.buffer if entry[0] > cursor]
+
+
+def sse(data: dict) -> bytes:
+    """Serialize a payload as a single SSE data frame"""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+# Maps event_id -> channel shared by connected clients
+event_monitors: Dict[int, EventChannel] = {}
 
 
 def broadcast_scan_event(event_id: int, scan_data: dict):
@@ -23,36 +82,27 @@ def broadcast_scan_event(event_id: int, scan_data: dict):
     Broadcast a scan event to all connected monitors for this event
     Called from scan.py when a QR code is scanned
     """
-    if event_id not in event_monitors:
+    channel = event_monitors.get(event_id)
+    if channel is None:
         return
-    
-    # Send to all connected monitors
-    for queue in event_monitors[event_id]:
-        try:
-            queue.put_nowait(scan_data)
-        except asyncio.QueueFull:
-            # Skip if queue is full
-            pass
 
+    # Serialize once here; every monitor streams the same bytes
+    frame = sse(scan_data)
+
+    # scan.py runs in the threadpool, so hand the append over to the loop
+    channel.loop.call_soon_threadsafe(channel.publish, frame)
 
-async def event_stream(event_id: int, db: Session):
+
+def load_initial_snapshot(event_id: int) -> Optional[dict]:
     """
-    Server-Sent Events stream for live monitoring
-    Sends initial data + live updates when scans happen
+    Build the initial monitor payload with a short-lived session
+    The stream itself can stay open for hours, so it must not pin a pooled
+    connection; live updates come from the in-memory channel instead
     """
-    # Register this monitor
-    queue = asyncio.Queue(maxsize=100)
-    
-    if event_id not in event_monitors:
-        event_monitors[event_id] = set()
-    event_monitors[event_id].add(queue)
-    
-    try:
-        # Send initial data
-        event = db.query(Event).filter(Event.id == event_id).first()
+    with SessionLocal() as db:
+        event = db.get(Event, event_id)
         if not event:
-            yield f"data: {json.dumps({'error': 'Event not found'})}\n\n"
-            return
+            return None
         
         # Get current attendance count
         total_scans = db.query(func.count(Attendance.id)).filter(
@@ -73,47 +123,99 @@ async def event_stream(event_id: int, db: Session):
                 "time": last_scan.scanned_at.strftime("%H:%M:%S")
             }
         
-        initial_data = {
+        return {
             "type": "initial",
             "event_title": event.title,
             "total_scans": total_scans,
             "last_scan": last_scan_data
         }
+
+
+async def event_stream(event_id: int):
+    """
+    Server-Sent Events stream for live monitoring
+    Sends initial data + live updates when scans happen
+    """
+    # Register this monitor
+    channel = event_monitors.get(event_id)
+    if channel is None:
+        channel = EventChannel(asyncio.get_running_loop())
+        event_monitors[event_id] = channel
+    channel.subscribers += 1
+    cursor = channel.last_seq
+    
+    try:
+        # Send initial data
+        initial_data = await run_in_threadpool(load_initial_snapshot, event_id)
+        if initial_data is None:
+            yield sse({"error": "Event not found"})
+            return
         
-        yield f"data: {json.dumps(initial_data)}\n\n"
+        yield sse(initial_data)
         
         # Keep connection alive and send updates
+        heartbeat_seq = 0
+        
         while True:
-            try:
-                # Wait for new scan with timeout
-                scan_data = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield f"data: {json.dumps(scan_data)}\n\n"
-            except asyncio.TimeoutError:
-                # Send heartbeat every 30 seconds
-                yield f": heartbeat\n\n"
+            wakeup = channel.wakeup
+            pending = channel.read_since(cursor)
+            if pending:
+                # Frames are self-delimiting, so the backlog goes out in one write
+                cursor = pending[-1][0]
+                yield b"".join(frame for _, frame in pending)
+            else:
+                try:
+                    # Wait for new scan with timeout
+                    await asyncio.wait_for(wakeup.wait(), timeout=HEARTBEAT_INTERVAL)
+                    continue
+                except asyncio.TimeoutError:
+                    # Typed heartbeat so clients can spot a stalled stream too
+                    heartbeat_seq += 1
+                    yield sse({"type": "heartbeat", "seq": heartbeat_seq, "ts": time.time()})
             
     except asyncio.CancelledError:
         # Client disconnected
         pass
     finally:
         # Cleanup: remove this monitor
-        if event_id in event_monitors:
-            event_monitors[event_id].discard(queue)
-            if not event_monitors[event_id]:
-                del event_monitors[event_id]
+        channel.subscribers -= 1
+        if channel.subscribers <= 0 and event_monitors.get(event_id) is channel:
+            del event_monitors[event_id]
+
+
+class TimedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that gives up on a client that stops reading
+    The server's send() waits for the socket buffer to drain, so without a
+    deadline a half-open connection blocks the stream (and its generator)
+    forever
+    """
+
+    def __init__(self, content, send_timeout: float, **kwargs):
+        super().__init__(content, **kwargs)
+        self.send_timeout = send_timeout
+
+    async def stream_response(self, send):
+        async def timed_send(message):
+            with anyio.fail_after(self.send_timeout):
+                await send(message)
+
+        try:
+            await super().stream_response(timed_send)
+        except TimeoutError:
+            # Close the generator now so its finally releases the subscription
+            await self.body_iterator.aclose()
 
 
 @router.get("/event/{event_id}")
-async def monitor_event(
-    event_id: int,
-    db: Session = Depends(get_db)
-):
+async def monitor_event(event_id: int):
     """
     SSE endpoint for real-time event monitoring
     Returns a stream of scan events
     """
-    return StreamingResponse(
-        event_stream(event_id, db),
+    return TimedStreamingResponse(
+        event_stream(event_id),
+        send_timeout=SEND_TIMEOUT,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
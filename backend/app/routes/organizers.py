@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import datetime
+from datetime import datetime, timezone
 
-from app.db.database import get_db
+from app.db.database import get_db, year_month
 from app.models.user import User, UserRole
 from app.models.event import Event
 from app.models.ticket import Ticket
@@ -35,54 +35,67 @@ def get_organizer_analytics(
     if not organizer:
         raise HTTPException(status_code=404, detail="Organizer not found")
     
-    # Get all events created by this organizer
-    events = db.query(Event).filter(Event.created_by == organizer_id).all()
+    # Get all events created by this organizer, newest first (undated last)
+    events = db.query(Event).filter(
+        Event.created_by == organizer_id
+    ).order_by(Event.created_at.desc().nullslast()).all()
+    
+    event_ids = [event.id for event in events]
+    
+    # Per-event registration and attendance counts in one GROUP BY each
+    reg_map = dict(
+        db.query(Ticket.event_id, func.count(Ticket.id))
+        .filter(Ticket.event_id.in_(event_ids))
+        .group_by(Ticket.event_id)
+        .all()
+    )
+    att_map = dict(
+        db.query(Attendance.event_id, func.count(Attendance.id))
+        .filter(Attendance.event_id.in_(event_ids))
+        .group_by(Attendance.event_id)
+        .all()
+    )
     
     # Calculate overall statistics
     total_events = len(events)
-    total_registrations = 0
-    total_attended = 0
+    total_registrations = sum(reg_map.values())
+    total_attended = sum(att_map.values())
     
     # Get detailed event list with individual stats
     events_list = []
     for event in events:
-        reg_count = db.query(Ticket).filter(Ticket.event_id == event.id).count()
-        att_count = db.query(Attendance).filter(Attendance.event_id == event.id).count()
-        
-        total_registrations += reg_count
-        total_attended += att_count
+        reg_count = reg_map.get(event.id, 0)
+        att_count = att_map.get(event.id, 0)
         
         events_list.append({
             "event_id": event.id,
             "event_title": event.title,
             "event_location": event.location,
-            "event_start_time": event.start_time.isoformat() if event.start_time else None,
-            "event_end_time": event.end_time.isoformat() if event.end_time else None,
-            "created_at": event.created_at.isoformat() if event.created_at else None,
+            "event_start_time": event.start_time,
+            "event_end_time": event.end_time,
+            "created_at": event.created_at,
             "total_registered": reg_count,
             "total_attended": att_count,
             "attendance_rate": round((att_count / reg_count * 100), 2) if reg_count > 0 else 0,
-            "status": "completed" if event.end_time and event.end_time < datetime.utcnow() else "upcoming"
+            "status": "completed" if event.end_time and event.end_time < datetime.now(timezone.utc) else "upcoming"
         })
     
-    # Sort events by created_at desc
-    events_list.sort(key=lambda x: x["created_at"] or "", reverse=True)
-    
-    # Calculate monthly event creation stats (last 6 months)
-    from collections import defaultdict
-    monthly_stats = defaultdict(int)
-    
-    for event in events:
-        if event.created_at:
-            month_key = event.created_at.strftime("%Y-%m")
-            monthly_stats[month_key] += 1
+    # Calculate monthly event creation stats (last 6 months) in the database
+    month = year_month(db, Event.created_at)
+    monthly_rows = (
+        db.query(month.label('month'), func.count(Event.id))
+        .filter(Event.created_by == organizer_id, Event.created_at.isnot(None))
+        .group_by(month)
+        .order_by(month.desc())
+        .limit(6)
+        .all()
+    )
     
-    # Convert to list and sort
+    # Show oldest to newest
     monthly_list = [
-        {"month": month, "count": count}
-        for month, count in sorted(monthly_stats.items(), reverse=True)[:6]
+        {"month": month_key, "count": count}
+        for month_key, count in reversed(monthly_rows)
     ]
-    monthly_list.reverse()  # Show oldest to newest
     
     return {
         "organizer": {
@@ -3,21 +3,29 @@ PS1 API Routes - Unified Campus Participation Intelligence System
 Implements Features 1, 3, 4, 5 from PS1
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from datetime import datetime, timezone
+import hashlib
+import hmac
+import orjson
+import threading
+import time
 
 from app.db.database import get_db
 from app.security.jwt import get_current_user
-from app.models.user import User, UserRole
+from app.core.permissions import require_organizer
+from app.models.user import User
 from app.models.participation_role import ParticipationRole, RoleType
 from app.models.certificate import Certificate
 from app.services.reconciliation_service import ReconciliationService
 from app.services.transcript_service import TranscriptService
 from app.services.snapshot_service import SnapshotService
-from app.services.audit_service import AuditService
+from app.services.audit_service import AuditService, invalidate_audit_summary
 from app.services.fraud_detection_service import FraudDetectionService
 from app.services.qr_service import generate_certificate_qr_code, generate_transcript_qr_code
 from app.models.attendance import Attendance
@@ -67,14 +75,14 @@ class RoleResponse(BaseModel):
 
 class CertificateVerificationResponse(BaseModel):
     authentic: bool
-    certificate_id: Optional[str]
-    student_prn: Optional[str]
-    student_name: Optional[str]
-    event_title: Optional[str]
-    event_date: Optional[datetime]
-    issued_at: Optional[datetime]
+    certificate_id: Optional[str] = None
+    student_prn: Optional[str] = None
+    student_name: Optional[str] = None
+    event_title: Optional[str] = None
+    event_date: Optional[datetime] = None
+    issued_at: Optional[datetime] = None
     revoked: bool
-    revocation_reason: Optional[str]
+    revocation_reason: Optional[str] = None
     verification_hash_valid: bool
     message: str
 
@@ -124,7 +132,7 @@ class BulkResolutionResponse(BaseModel):
     summary="Get Canonical Participation Status",
     description="PS1 Feature 1: Get reconciled participation status from multiple sources"
 )
-async def get_participation_status(
+def get_participation_status(
     event_id: int,
     student_prn: str,
     db: Session = Depends(get_db),
@@ -145,21 +153,15 @@ async def get_participation_status(
     summary="Detect Event Conflicts",
     description="PS1 Feature 1: Detect all participation conflicts in an event"
 )
-async def get_event_conflicts(
+def get_event_conflicts(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Get all participation conflicts for an event.
     Returns students with conflicting data.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions"
-        )
-    
     service = ReconciliationService(db)
     conflicts = service.get_event_conflicts(event_id)
     return conflicts
@@ -169,13 +171,46 @@ async def get_event_conflicts(
 # FEATURE 3: CERTIFICATE VERIFICATION
 # ============================================================================
 
+# Public verification is read-mostly, so found certificates are cached per
+# process for a short TTL; revocation in this module evicts the entry
+CERT_VERIFY_CACHE_TTL = 60
+CERT_VERIFY_CACHE_MAX = 10_000
+_cert_verify_cache: Dict[str, Tuple[float, dict]] = {}
+_cert_verify_cache_lock = threading.Lock()
+
+
+def _get_cached_certificate(certificate_id: str) -> Optional[dict]:
+    entry = _cert_verify_cache.get(certificate_id)
+    if entry is None:
+        return None
+    cached_at, data = entry
+    if time.monotonic() - cached_at > CERT_VERIFY_CACHE_TTL:
+        _cert_verify_cache.pop(certificate_id, None)
+        return None
+    return data
+
+
+def _cache_certificate(certificate_id: str, data: dict):
+    # Handlers run on the threadpool, so guard the evict-then-insert step
+    with _cert_verify_cache_lock:
+        if len(_cert_verify_cache) >= CERT_VERIFY_CACHE_MAX:
+            # Drop the oldest entry (dicts keep insertion order)
+            _cert_verify_cache.pop(next(iter(_cert_verify_cache)), None)
+        _cert_verify_cache[certificate_id] = (time.monotonic(), data)
+
+
+def invalidate_certificate_cache(certificate_id: str):
+    """Evict a certificate from the verification cache after it changes"""
+    _cert_verify_cache.pop(certificate_id, None)
+
+
 @router.get(
     "/verify/certificate/{certificate_id}",
     response_model=CertificateVerificationResponse,
     summary="Verify Certificate",
     description="PS1 Feature 3: Public certificate verification endpoint"
 )
-async def verify_certificate(
+def verify_certificate(
     certificate_id: str,
     verification_hash: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -184,48 +219,69 @@ async def verify_certificate(
     Public endpoint to verify certificate authenticity.
     Does not require authentication.
     """
-    certificate = db.query(Certificate).filter_by(certificate_id=certificate_id).first()
+    data = _get_cached_certificate(certificate_id)
     
-    if not certificate:
-        return CertificateVerificationResponse(
-            authentic=False,
-            certificate_id=certificate_id,
-            revoked=False,
-            verification_hash_valid=False,
-            message="Certificate not found in system"
-        )
+    if data is None:
+        certificate = db.query(Certificate).filter_by(certificate_id=certificate_id).first()
+        
+        if not certificate:
+            return CertificateVerificationResponse(
+                authentic=False,
+                certificate_id=certificate_id,
+                revoked=False,
+                verification_hash_valid=False,
+                message="Certificate not found in system"
+            )
+        
+        # Get student name
+        from app.models.student import Student
+        student = None
+        if not certificate.revoked:
+            student = db.query(Student).filter_by(prn=certificate.student_prn).first()
+        
+        data = {
+            "certificate_id": certificate.certificate_id,
+            "student_prn": certificate.student_prn,
+            "student_name": student.name if student else None,
+            "event_title": certificate.event.title if certificate.event else None,
+            "event_date": certificate.event.start_time if certificate.event else None,
+            "issued_at": certificate.issued_at,
+            "revoked": certificate.revoked,
+            "revocation_reason": certificate.revocation_reason,
+            "verification_hash": certificate.verification_hash,
+        }
+        _cache_certificate(certificate_id, data)
     
     # Check if revoked
-    if certificate.revoked:
+    if data["revoked"]:
         return CertificateVerificationResponse(
             authentic=False,
             certificate_id=certificate_id,
-            student_prn=certificate.student_prn,
-            event_title=certificate.event.title if certificate.event else None,
-            issued_at=certificate.issued_at,
+            student_prn=data["student_prn"],
+            event_title=data["event_title"],
+            issued_at=data["issued_at"],
             revoked=True,
-            revocation_reason=certificate.revocation_reason,
+            revocation_reason=data["revocation_reason"],
             verification_hash_valid=False,
             message="Certificate has been revoked"
         )
     
-    # Verify hash if provided
+    # Verify hash if provided (constant-time, this endpoint is public)
     hash_valid = True
-    if verification_hash and certificate.verification_hash:
-        hash_valid = certificate.verification_hash == verification_hash
-    
-    # Get student name
-    from app.models.student import Student
-    student = db.query(Student).filter_by(prn=certificate.student_prn).first()
+    if verification_hash and data["verification_hash"]:
+        hash_valid = hmac.compare_digest(
+            data["verification_hash"].encode(),
+            verification_hash.encode()
+        )
     
     return CertificateVerificationResponse(
         authentic=hash_valid,
-        certificate_id=certificate.certificate_id,
-        student_prn=certificate.student_prn,
-        student_name=student.name if student else None,
-        event_title=certificate.event.title if certificate.event else None,
-        event_date=certificate.event.start_time if certificate.event else None,
-        issued_at=certificate.issued_at,
+        certificate_id=data["certificate_id"],
+        student_prn=data["student_prn"],
+        student_name=data["student_name"],
+        event_title=data["event_title"],
+        event_date=data["event_date"],
+        issued_at=data["issued_at"],
         revoked=False,
         revocation_reason=None,
         verification_hash_valid=hash_valid,
@@ -242,23 +298,20 @@ async def verify_certificate(
     summary="Revoke Certificate",
     description="PS1 Feature 4: Revoke a certificate with reason"
 )
-async def revoke_certificate(
+def revoke_certificate(
     certificate_id: str,
     request: RevokeCertificateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Revoke a certificate with reason.
     Preserves history and prevents future use.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to revoke certificates"
-        )
-    
-    certificate = db.query(Certificate).filter_by(certificate_id=certificate_id).first()
+    # Row lock: a concurrent revoke waits here and then sees revoked=True
+    certificate = db.query(Certificate).filter_by(
+        certificate_id=certificate_id
+    ).with_for_update().first()
     
     if not certificate:
         raise HTTPException(
@@ -294,6 +347,8 @@ async def revoke_certificate(
     db.add(audit_log)
     
     db.commit()
+    invalidate_certificate_cache(certificate.certificate_id)
+    invalidate_audit_summary(certificate.event_id)
     
     return {
         "status": "success",
@@ -308,35 +363,33 @@ async def revoke_certificate(
 # FEATURE 5: MULTI-ROLE PARTICIPATION
 # ============================================================================
 
+# Role lookup and error text are fixed, so build them once at import
+_ROLE_BY_NAME = {r.name: r for r in RoleType}
+_VALID_ROLES_STR = ", ".join(r.value for r in RoleType)
+
+
 @router.post(
     "/roles/{event_id}/assign",
     response_model=RoleResponse,
     summary="Assign Event Role",
     description="PS1 Feature 5: Assign event-specific role to student"
 )
-async def assign_role(
+def assign_role(
     event_id: int,
     request: RoleAssignmentRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Assign event-specific role to a student.
     A student can have multiple roles per event.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to assign roles"
-        )
-    
     # Validate role
-    try:
-        role_type = RoleType[request.role.upper()]
-    except KeyError:
+    role_type = _ROLE_BY_NAME.get(request.role.upper())
+    if role_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role. Must be one of: {', '.join([r.value for r in RoleType])}"
+            detail=f"Invalid role. Must be one of: {_VALID_ROLES_STR}"
         )
     
     # Create role assignment
@@ -348,33 +401,37 @@ async def assign_role(
         time_segment=request.time_segment
     )
     
-    db.add(role_assignment)
-    db.commit()
-    db.refresh(role_assignment)
-    
-    # Log audit trail
+    # Role and audit entry are written in one transaction
     from app.models.audit_log import AuditLog
-    audit_log = AuditLog(
-        event_id=event_id,
-        user_id=current_user.id,
-        action_type="role_assigned",
-        details={
-            "student_prn": request.student_prn,
-            "role": role_type.value,
-            "time_segment": request.time_segment
-        }
-    )
-    db.add(audit_log)
-    db.commit()
+    try:
+        db.add(role_assignment)
+        db.add(AuditLog(
+            event_id=event_id,
+            user_id=current_user.id,
+            action_type="role_assigned",
+            details={
+                "student_prn": request.student_prn,
+                "role": role_type.value,
+                "time_segment": request.time_segment
+            }
+        ))
+        db.flush()
+        
+        response = RoleResponse(
+            id=role_assignment.id,
+            event_id=role_assignment.event_id,
+            student_prn=role_assignment.student_prn,
+            role=role_assignment.role.value,
+            assigned_at=role_assignment.assigned_at,
+            time_segment=role_assignment.time_segment
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    invalidate_audit_summary(event_id)
     
-    return RoleResponse(
-        id=role_assignment.id,
-        event_id=role_assignment.event_id,
-        student_prn=role_assignment.student_prn,
-        role=role_assignment.role.value,
-        assigned_at=role_assignment.assigned_at,
-        time_segment=role_assignment.time_segment
-    )
+    return response
 
 
 @router.get(
@@ -383,7 +440,7 @@ async def assign_role(
     summary="Get Event Roles",
     description="PS1 Feature 5: Get all role assignments for an event"
 )
-async def get_event_roles(
+def get_event_roles(
     event_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -412,7 +469,7 @@ async def get_event_roles(
     summary="Get Student Roles",
     description="PS1 Feature 5: Get all roles assigned to a student across events"
 )
-async def get_student_roles(
+def get_student_roles(
     student_prn: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -440,20 +497,14 @@ async def get_student_roles(
     summary="Remove Role Assignment",
     description="PS1 Feature 5: Remove a role assignment"
 )
-async def remove_role(
+def remove_role(
     role_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Remove a role assignment.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to remove roles"
-        )
-    
     role = db.query(ParticipationRole).filter_by(id=role_id).first()
     
     if not role:
@@ -476,8 +527,10 @@ async def remove_role(
     )
     db.add(audit_log)
     
+    event_id = role.event_id
     db.delete(role)
     db.commit()
+    invalidate_audit_summary(event_id)
     
     return {
         "status": "success",
@@ -489,30 +542,54 @@ async def remove_role(
 # PHASE 2: TRANSCRIPT GENERATOR
 # ============================================================================
 
+# Transcript and change-history JSON is revalidated with If-None-Match on
+# every use, so revocations and corrections show up immediately
+HISTORY_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def _json_etag_response(request: Request, data: dict, volatile_keys: Tuple[str, ...] = ()) -> Response:
+    """
+    Tag data with a content hash and answer 304 when the client already
+    holds that version. volatile_keys (e.g. generated_at) are left out of
+    the hash so they don't change the tag on every call.
+    """
+    stable = {k: v for k, v in data.items() if k not in volatile_keys}
+    digest = hashlib.sha256(
+        orjson.dumps(stable, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    ).hexdigest()
+    headers = {"ETag": f'"{digest[:32]}"', "Cache-Control": HISTORY_CACHE_CONTROL}
+    
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ORJSONResponse(data, headers=headers)
+
+
 @router.get(
     "/transcript/{prn}",
     summary="Get participation transcript (JSON)",
     description="PS1 Phase 2: Get structured participation transcript data for a student"
 )
-async def get_transcript_data(
+def get_transcript_data(
     prn: str,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Get comprehensive participation transcript for a student.
     Returns JSON data including all participations, statistics, and roles.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to view transcripts"
-        )
-    
     service = TranscriptService(db)
     transcript_data = service.get_student_participations(prn)
     
-    return transcript_data
+    return _json_etag_response(request, transcript_data, volatile_keys=("generated_at",))
 
 
 @router.get(
@@ -520,10 +597,10 @@ async def get_transcript_data(
     summary="Download participation transcript as PDF",
     description="PS1 Phase 2: Generate and download PDF transcript"
 )
-async def download_transcript_pdf(
+def download_transcript_pdf(
     prn: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Generate and download PDF transcript for a student.
@@ -531,22 +608,17 @@ async def download_transcript_pdf(
     """
     from fastapi.responses import StreamingResponse
     
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to generate transcripts"
-        )
-    
     service = TranscriptService(db)
     
     try:
         pdf_buffer = service.generate_transcript_pdf(prn)
         
         return StreamingResponse(
-            pdf_buffer,
+            service.iter_pdf_chunks(pdf_buffer),
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename=transcript_{prn}.pdf"
+                "Content-Disposition": f"attachment; filename=transcript_{prn}.pdf",
+                "Content-Length": str(pdf_buffer.getbuffer().nbytes)
             }
         )
     except Exception as e:
@@ -565,23 +637,17 @@ async def download_transcript_pdf(
     summary="Capture student snapshot",
     description="PS1 Phase 2: Capture current state of student profile"
 )
-async def capture_student_snapshot(
+def capture_student_snapshot(
     event_id: int,
     student_prn: str,
     trigger: str = "manual",
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Capture a snapshot of student's current profile and participation status.
     Usually triggered automatically on registration, but can be manual.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to capture snapshots"
-        )
-    
     service = SnapshotService(db)
     snapshot = service.capture_snapshot(student_prn, event_id, trigger)
     
@@ -596,12 +662,27 @@ async def capture_student_snapshot(
     }
 
 
+def _intern_strings(value, pool: Dict[str, str]):
+    """
+    Rebuild a decoded JSON value so equal strings share one object.
+    Snapshot histories repeat the same role and status strings in every
+    row; pooling them keeps the response list small.
+    """
+    if isinstance(value, str):
+        return pool.setdefault(value, value)
+    if isinstance(value, dict):
+        return {pool.setdefault(k, k): _intern_strings(v, pool) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(v, pool) for v in value]
+    return value
+
+
 @router.get(
     "/snapshots/student/{prn}",
     summary="Get student snapshot history",
     description="PS1 Phase 2: Get all historical snapshots for a student"
 )
-async def get_student_snapshots(
+def get_student_snapshots(
     prn: str,
     limit: int = 50,
     db: Session = Depends(get_db),
@@ -613,18 +694,21 @@ async def get_student_snapshots(
     """
     service = SnapshotService(db)
     snapshots = service.get_student_history(prn, limit)
+    pool: Dict[str, str] = {}
     
-    return [
+    # profile_data is spliced in as the stored JSON text, so it is never
+    # decoded into dicts or re-encoded on the way out
+    return ORJSONResponse([
         {
             "id": s.id,
             "event_id": s.event_id,
             "captured_at": s.captured_at,
-            "trigger": s.snapshot_trigger,
-            "profile_data": s.profile_data,
-            "participation_status": s.participation_status
+            "trigger": pool.setdefault(s.snapshot_trigger, s.snapshot_trigger),
+            "profile_data": orjson.Fragment(s.profile_data_raw),
+            "participation_status": _intern_strings(s.participation_status, pool)
         }
         for s in snapshots
-    ]
+    ])
 
 
 @router.get(
@@ -632,7 +716,7 @@ async def get_student_snapshots(
     summary="Get snapshot at specific event",
     description="PS1 Phase 2: Get student profile as it was at event registration"
 )
-async def get_snapshot_at_event(
+def get_snapshot_at_event(
     prn: str,
     event_id: int,
     db: Session = Depends(get_db),
@@ -651,15 +735,15 @@ async def get_snapshot_at_event(
             detail="No snapshot found for this student at this event"
         )
     
-    return {
+    return ORJSONResponse({
         "id": snapshot.id,
         "student_prn": snapshot.student_prn,
         "event_id": snapshot.event_id,
         "captured_at": snapshot.captured_at,
         "trigger": snapshot.snapshot_trigger,
-        "profile_data": snapshot.profile_data,
+        "profile_data": orjson.Fragment(snapshot.profile_data_raw),
         "participation_status": snapshot.participation_status
-    }
+    })
 
 
 @router.get(
@@ -667,7 +751,7 @@ async def get_snapshot_at_event(
     summary="Compare two snapshots",
     description="PS1 Phase 2: Compare student profile evolution between two snapshots"
 )
-async def compare_snapshots(
+def compare_snapshots(
     snapshot1_id: int,
     snapshot2_id: int,
     db: Session = Depends(get_db),
@@ -698,24 +782,20 @@ async def compare_snapshots(
     summary="Invalidate Attendance Record",
     description="PS1 Feature 4: Mark an attendance record as invalid with reason"
 )
-async def invalidate_attendance(
+def invalidate_attendance(
     attendance_id: int,
     request: InvalidateAttendanceRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Invalidate an attendance record (e.g., mistaken scan, fraudulent attendance).
     Preserves the original record but marks it as invalid.
     Updates canonical status accordingly.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to invalidate attendance"
-        )
-    
-    attendance = db.query(Attendance).filter_by(id=attendance_id).first()
+    # Row lock: a concurrent invalidation waits here and then sees
+    # invalidated=True instead of writing a second audit entry
+    attendance = db.query(Attendance).filter_by(id=attendance_id).with_for_update().first()
     
     if not attendance:
         raise HTTPException(
@@ -753,6 +833,7 @@ async def invalidate_attendance(
     db.add(audit_log)
     
     db.commit()
+    invalidate_audit_summary(attendance.event_id)
     
     return {
         "status": "success",
@@ -769,70 +850,59 @@ async def invalidate_attendance(
 # ============================================================================
 
 @router.get(
-    "/audit/{event_id}/{student_prn}",
-    summary="Get Change History",
-    description="PS1 Feature 4: Get comprehensive change history for a student in an event"
+    "/audit/summary/{event_id}",
+    summary="Get Event Audit Summary",
+    description="PS1 Feature 4: Get audit summary for entire event"
 )
-async def get_change_history(
+def get_event_audit_summary(
     event_id: int,
-    student_prn: str,
-    limit: int = 50,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
-    Get complete change history for a student in an event.
-    Shows: certificate revocations, attendance invalidations, corrections, and all audit entries.
-    Displays old vs new state for each change.
+    Get audit summary for an entire event.
+    Shows total revocations, invalidations, corrections across all students.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to view audit history"
-        )
-    
     service = AuditService(db)
-    history = service.get_change_history(event_id, student_prn, limit)
+    summary = service.get_event_audit_summary(event_id)
     
-    if "error" in history:
+    if "error" in summary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=history["error"]
+            detail=summary["error"]
         )
     
-    return history
+    return summary
 
 
 @router.get(
-    "/audit/summary/{event_id}",
-    summary="Get Event Audit Summary",
-    description="PS1 Feature 4: Get audit summary for entire event"
+    "/audit/{event_id}/{student_prn}",
+    summary="Get Change History",
+    description="PS1 Feature 4: Get comprehensive change history for a student in an event"
 )
-async def get_event_audit_summary(
+def get_change_history(
     event_id: int,
+    student_prn: str,
+    request: Request,
+    limit: int = 50,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
-    Get audit summary for an entire event.
-    Shows total revocations, invalidations, corrections across all students.
+    Get complete change history for a student in an event.
+    Shows: certificate revocations, attendance invalidations, corrections, and all audit entries.
+    Displays old vs new state for each change.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to view audit summary"
-        )
-    
     service = AuditService(db)
-    summary = service.get_event_audit_summary(event_id)
+    history = service.get_change_history(event_id, student_prn, limit)
     
-    if "error" in summary:
+    if "error" in history:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=summary["error"]
+            detail=history["error"]
         )
     
-    return summary
+    return _json_etag_response(request, history)
 
 
 # ============================================================================
@@ -844,23 +914,17 @@ async def get_event_audit_summary(
     summary="Correct Participation Data",
     description="PS1 Feature 4: Apply manual correction to participation records"
 )
-async def correct_participation(
+def correct_participation(
     event_id: int,
     student_prn: str,
     request: CorrectionRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Apply manual correction to participation data.
     Logs the change with reason for audit trail.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to correct participation data"
-        )
-    
     service = AuditService(db)
     
     # Log the correction
@@ -895,10 +959,10 @@ async def correct_participation(
     summary="Detect Fraud Patterns",
     description="PS1 Feature 3: Run fraud detection algorithms on event data"
 )
-async def detect_fraud(
+def detect_fraud(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Run comprehensive fraud detection on event participation data.
@@ -912,12 +976,6 @@ async def detect_fraud(
     - Manual override abuse
     - Bulk upload anomalies
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to run fraud detection"
-        )
-    
     service = FraudDetectionService(db)
     fraud_report = service.detect_fraud(event_id)
     
@@ -928,16 +986,26 @@ async def detect_fraud(
 # FEATURE 3: QR CODE GENERATION FOR CERTIFICATES (PS1 Phase 3)
 # ============================================================================
 
-from fastapi.responses import StreamingResponse
+# QR payloads are deterministic in (id, size), so clients and CDNs may keep
+# them for a day without revalidating against the origin.
+QR_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def _qr_etag(kind: str, identifier: str, size: int, format: str) -> str:
+    digest = hashlib.sha256(f"{kind}|{identifier}|{size}|{format}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
 
 @router.get(
     "/certificate/{certificate_id}/qr",
     summary="Generate Certificate QR Code",
     description="PS1 Feature 3: Generate QR code with verification link for a certificate"
 )
-async def get_certificate_qr_code(
+def get_certificate_qr_code(
     certificate_id: str,
-    size: int = 300,
+    request: Request,
+    response: Response,
+    size: int = Query(300, ge=64, le=1000),
     format: str = "png"
 ):
     """
@@ -946,6 +1014,11 @@ async def get_certificate_qr_code(
     
     Public endpoint - no authentication required for verification QR codes.
     """
+    etag = _qr_etag("cert", certificate_id, size, format)
+    cache_headers = {"ETag": etag, "Cache-Control": QR_CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
     try:
         if format == "base64":
             qr_data = generate_certificate_qr_code(
@@ -953,14 +1026,16 @@ async def get_certificate_qr_code(
                 size=size,
                 return_base64=True
             )
+            response.headers.update(cache_headers)
             return {"qr_code": qr_data, "format": "base64"}
         else:
             qr_buffer = generate_certificate_qr_code(certificate_id, size=size)
-            return StreamingResponse(
-                qr_buffer,
+            return Response(
+                content=qr_buffer.getvalue(),
                 media_type="image/png",
                 headers={
-                    "Content-Disposition": f"inline; filename=cert_{certificate_id}_qr.png"
+                    "Content-Disposition": f"inline; filename=cert_{certificate_id}_qr.png",
+                    **cache_headers
                 }
             )
     except Exception as e:
@@ -975,9 +1050,11 @@ async def get_certificate_qr_code(
     summary="Generate Transcript QR Code",
     description="PS1 Feature 3: Generate QR code with transcript link for a student"
 )
-async def get_transcript_qr_code(
+def get_transcript_qr_code(
     prn: str,
-    size: int = 200,
+    request: Request,
+    response: Response,
+    size: int = Query(200, ge=64, le=1000),
     format: str = "png"
 ):
     """
@@ -986,6 +1063,11 @@ async def get_transcript_qr_code(
     
     Public endpoint - transcripts are publicly verifiable.
     """
+    etag = _qr_etag("transcript", prn, size, format)
+    cache_headers = {"ETag": etag, "Cache-Control": QR_CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
     try:
         if format == "base64":
             qr_data = generate_transcript_qr_code(
@@ -993,14 +1075,16 @@ async def get_transcript_qr_code(
                 size=size,
                 return_base64=True
             )
+            response.headers.update(cache_headers)
             return {"qr_code": qr_data, "format": "base64"}
         else:
             qr_buffer = generate_transcript_qr_code(prn, size=size)
-            return StreamingResponse(
-                qr_buffer,
+            return Response(
+                content=qr_buffer.getvalue(),
                 media_type="image/png",
                 headers={
-                    "Content-Disposition": f"inline; filename=transcript_{prn}_qr.png"
+                    "Content-Disposition": f"inline; filename=transcript_{prn}_qr.png",
+                    **cache_headers
                 }
             )
     except Exception as e:
@@ -1020,11 +1104,11 @@ async def get_transcript_qr_code(
     summary="Bulk Resolve Conflicts",
     description="PS1 Feature 1: Resolve multiple conflicts at once with specified actions"
 )
-async def bulk_resolve_conflicts(
+def bulk_resolve_conflicts(
     event_id: int,
     request: BulkResolutionRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_organizer)
 ):
     """
     Bulk resolve conflicts for an event.
@@ -1037,12 +1121,6 @@ async def bulk_resolve_conflicts(
     
     Returns summary of actions taken and any failures.
     """
-    if current_user.role not in [UserRole.ADMIN, UserRole.ORGANIZER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions to bulk resolve conflicts"
-        )
-    
     results = {
         "total_actions": len(request.actions),
         "successful": 0,
@@ -1061,6 +1139,43 @@ async def bulk_resolve_conflicts(
             detail="Event not found"
         )
     
+    # Load everything the actions need up front: one query per table
+    # instead of one per action
+    prns = {action_item.student_prn for action_item in request.actions}
+    
+    ticket_ids = dict(
+        db.query(Ticket.student_prn, Ticket.id).filter(
+            Ticket.event_id == event_id,
+            Ticket.student_prn.in_(prns)
+        ).order_by(Ticket.id.desc()).all()
+    )
+    
+    attended_prns = {
+        prn for (prn,) in db.query(Attendance.student_prn).filter(
+            Attendance.event_id == event_id,
+            Attendance.student_prn.in_(prns),
+            Attendance.invalidated == False
+        ).distinct()
+    }
+    
+    # Active certificates are locked until commit so a concurrent revoke
+    # cannot revoke (and audit) the same certificate twice
+    active_certificates = {}
+    for cert_pk, cert_id, prn in db.query(
+        Certificate.id, Certificate.certificate_id, Certificate.student_prn
+    ).filter(
+        Certificate.event_id == event_id,
+        Certificate.student_prn.in_(prns),
+        Certificate.revoked == False
+    ).order_by(Certificate.id.desc()).with_for_update():
+        active_certificates[prn] = (cert_pk, cert_id)
+    
+    now = datetime.now(timezone.utc)
+    new_attendances: List[dict] = []
+    new_audit_logs: List[dict] = []
+    revocations = {}  # reason -> certificate primary keys
+    revoked_cert_ids: List[str] = []
+    
     for action_item in request.actions:
         try:
             student_prn = action_item.student_prn
@@ -1068,12 +1183,9 @@ async def bulk_resolve_conflicts(
             reason = action_item.reason or "Bulk conflict resolution"
             
             if action == "add_attendance":
-                ticket = db.query(Ticket).filter_by(
-                    event_id=event_id,
-                    student_prn=student_prn
-                ).first()
+                ticket_id = ticket_ids.get(student_prn)
                 
-                if not ticket:
+                if not ticket_id:
                     results["details"].append({
                         "student_prn": student_prn,
                         "action": action,
@@ -1083,73 +1195,61 @@ async def bulk_resolve_conflicts(
                     results["failed"] += 1
                     continue
                 
-                existing = db.query(Attendance).filter_by(
-                    event_id=event_id,
-                    student_prn=student_prn,
-                    invalidated=False
-                ).first()
-                
-                if existing:
+                if student_prn in attended_prns:
                     results["successful"] += 1
                     continue
+                attended_prns.add(student_prn)
                 
-                attendance = Attendance(
-                    ticket_id=ticket.id,
-                    event_id=event_id,
-                    student_prn=student_prn,
-                    scanned_at=datetime.now(timezone.utc),
-                    scan_source="admin_override",
-                    scanner_id=current_user.id,
-                    day_number=1
-                )
-                db.add(attendance)
-                
-                audit_log = AuditLog(
-                    event_id=event_id,
-                    user_id=current_user.id,
-                    action_type="bulk_attendance_added",
-                    details={"student_prn": student_prn, "reason": reason, "bulk_resolution": True}
-                )
-                db.add(audit_log)
+                new_attendances.append({
+                    "ticket_id": ticket_id,
+                    "event_id": event_id,
+                    "student_prn": student_prn,
+                    "scanned_at": now,
+                    "scan_source": "admin_override",
+                    "scanner_id": current_user.id,
+                    "day_number": 1
+                })
+                new_audit_logs.append({
+                    "event_id": event_id,
+                    "user_id": current_user.id,
+                    "action_type": "bulk_attendance_added",
+                    "details": {"student_prn": student_prn, "reason": reason, "bulk_resolution": True},
+                    "timestamp": now
+                })
                 
                 results["details"].append({"student_prn": student_prn, "action": action, "status": "success"})
                 results["successful"] += 1
                 
             elif action == "revoke_certificate":
-                certificate = db.query(Certificate).filter_by(
-                    event_id=event_id,
-                    student_prn=student_prn,
-                    revoked=False
-                ).first()
+                certificate = active_certificates.pop(student_prn, None)
                 
                 if not certificate:
                     results["failed"] += 1
                     continue
                 
-                certificate.revoked = True
-                certificate.revoked_at = datetime.now(timezone.utc)
-                certificate.revoked_by = current_user.id
-                certificate.revocation_reason = reason
+                cert_pk, cert_id = certificate
+                revocations.setdefault(reason, []).append(cert_pk)
+                revoked_cert_ids.append(cert_id)
                 
-                audit_log = AuditLog(
-                    event_id=event_id,
-                    user_id=current_user.id,
-                    action_type="bulk_certificate_revoked",
-                    details={"student_prn": student_prn, "reason": reason, "bulk_resolution": True}
-                )
-                db.add(audit_log)
+                new_audit_logs.append({
+                    "event_id": event_id,
+                    "user_id": current_user.id,
+                    "action_type": "bulk_certificate_revoked",
+                    "details": {"student_prn": student_prn, "reason": reason, "bulk_resolution": True},
+                    "timestamp": now
+                })
                 
                 results["details"].append({"student_prn": student_prn, "action": action, "status": "success"})
                 results["successful"] += 1
                 
             elif action in ["ignore", "manual_review"]:
-                audit_log = AuditLog(
-                    event_id=event_id,
-                    user_id=current_user.id,
-                    action_type=f"bulk_{action}",
-                    details={"student_prn": student_prn, "reason": reason}
-                )
-                db.add(audit_log)
+                new_audit_logs.append({
+                    "event_id": event_id,
+                    "user_id": current_user.id,
+                    "action_type": f"bulk_{action}",
+                    "details": {"student_prn": student_prn, "reason": reason},
+                    "timestamp": now
+                })
                 results["successful"] += 1
                 
             else:
@@ -1159,6 +1259,25 @@ async def bulk_resolve_conflicts(
             results["details"].append({"student_prn": action_item.student_prn, "status": "failed", "reason": str(e)})
             results["failed"] += 1
     
+    # Plain executemany INSERTs - no ORM objects to build or track in the session
+    if new_attendances:
+        db.execute(insert(Attendance), new_attendances)
+    if new_audit_logs:
+        db.execute(insert(AuditLog), new_audit_logs)
+    
+    # One UPDATE per distinct reason rather than loading each certificate
+    for reason, cert_pks in revocations.items():
+        db.execute(
+            update(Certificate)
+            .where(Certificate.id.in_(cert_pks))
+            .values(
+                revoked=True,
+                revoked_at=now,
+                revoked_by=current_user.id,
+                revocation_reason=reason
+            )
+        )
+    
     try:
         db.commit()
     except Exception as e:
@@ -1168,4 +1287,10 @@ async def bulk_resolve_conflicts(
             detail=f"Failed to commit: {str(e)}"
         )
     
+    # Only drop cached certificates once the revocations are committed, so
+    # a concurrent verify cannot re-cache the old state before the commit
+    for cert_id in revoked_cert_ids:
+        invalidate_certificate_cache(cert_id)
+    invalidate_audit_summary(event_id)
+    
     return BulkResolutionResponse(**results)
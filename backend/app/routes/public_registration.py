@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
@@ -6,7 +7,7 @@ from app.models.event import Event
 from app.models.ticket import Ticket
 from app.models.student import Student
 from app.security.jwt import create_ticket_token
-from app.services.email_service import send_ticket_email
+from app.services.email_service import send_ticket_email, submit_email
 
 router = APIRouter(prefix="/register/slug", tags=["Public Registration"])
 
@@ -47,7 +48,7 @@ def retrieve_ticket(
     # Return all tickets with event details
     ticket_list = []
     for ticket in tickets:
-        event = db.query(Event).filter(Event.id == ticket.event_id).first()
+        event = db.get(Event, ticket.event_id)
         if event:
             ticket_list.append({
                 "ticket_id": ticket.id,
@@ -81,7 +82,6 @@ def register_student(
     share_slug: str,
     prn: str,
     name: str,
-    background_tasks: BackgroundTasks,
     email: str | None = None,
     branch: str | None = None,
     year: int | None = None,
@@ -117,7 +117,8 @@ def register_student(
     db.flush()  # Save student first
 
     # 3. Check for duplicate registration - return existing ticket instead of error
-    existing = db.query(Ticket).filter(
+    # Only the id and token are needed, so skip hydrating the Ticket row
+    existing = db.query(Ticket.id, Ticket.token).filter(
         Ticket.event_id == event.id,
         Ticket.student_prn == prn
     ).first()
@@ -146,30 +147,26 @@ def register_student(
             }
         }
 
-    # 4. Create ticket with TEMP token
-    ticket = Ticket(
-        event_id=event.id,
-        student_prn=prn,
-        token="TEMP"  # important
-    )
-
-    db.add(ticket)
-    db.flush()  # ✅ ticket.id generated here
+    # 4. Insert ticket with TEMP token and get its id back in one statement
+    ticket_id = db.execute(
+        insert(Ticket)
+        .values(event_id=event.id, student_prn=prn, token="TEMP")
+        .returning(Ticket.id)
+    ).scalar_one()
 
     # 5. Generate JWT with real ticket_id
     token = create_ticket_token({
-        "ticket_id": ticket.id,
+        "ticket_id": ticket_id,
         "event_id": event.id,
         "student_prn": prn
     })
 
-    ticket.token = token
+    db.execute(update(Ticket).where(Ticket.id == ticket_id).values(token=token))
     db.commit()
-    db.refresh(ticket)
 
-    # 6. Send ticket email to student in background (non-blocking)
+    # 6. Send ticket email to student on the email threads (non-blocking)
     if email:
-        background_tasks.add_task(
+        submit_email(
             send_ticket_email,
             to_email=email,
             student_name=name,
@@ -183,7 +180,7 @@ def register_student(
     # 7. Return ticket with full event and student details
     return {
         "message": "Registration successful",
-        "ticket_id": ticket.id,
+        "ticket_id": ticket_id,
         "token": token,
         "student": {
             "prn": prn,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import exists, insert, update
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
@@ -8,7 +9,7 @@ from app.models.student import Student
 from app.models.user import User
 from app.schemas.ticket import TicketResponse
 from app.security.jwt import create_ticket_token
-from app.services.email_service import send_ticket_email
+from app.services.email_service import send_ticket_email, submit_email
 from app.core.permissions import require_organizer
 
 router = APIRouter(prefix="/register", tags=["Registration"])
@@ -22,61 +23,55 @@ def register_for_event(
     current_user: User = Depends(require_organizer)
 ):
     # 1. Check event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
     # 2. Prevent duplicate registration
-    existing = db.query(Ticket).filter(
+    already_registered = db.query(exists().where(
         Ticket.event_id == event_id,
         Ticket.student_prn == student_prn
-    ).first()
-    if existing:
+    )).scalar()
+    if already_registered:
         raise HTTPException(status_code=400, detail="Already registered")
 
-    # 3. Create JWT FIRST (ticket_id will be set after flush)
-    temp_payload = {
-        "event_id": event_id,
-        "student_prn": student_prn
-    }
-
-    # 4. Create ticket WITHOUT committing yet
-    ticket = Ticket(
-        event_id=event_id,
-        student_prn=student_prn,
-        token="TEMP"  # placeholder to satisfy NOT NULL
-    )
-
-    db.add(ticket)
-    db.flush()  # ✅ assigns ticket.id WITHOUT committing
+    # 3. Insert ticket with a placeholder token (NOT NULL) and get its id
+    #    and issued_at back from the same statement
+    ticket_id, issued_at = db.execute(
+        insert(Ticket)
+        .values(event_id=event_id, student_prn=student_prn, token="TEMP")
+        .returning(Ticket.id, Ticket.issued_at)
+    ).one()
 
-    # 5. Now generate REAL token with ticket_id
+    # 4. Now generate REAL token with ticket_id
     token = create_ticket_token({
-        "ticket_id": ticket.id,
+        "ticket_id": ticket_id,
         "event_id": event_id,
         "student_prn": student_prn
     })
 
-    ticket.token = token
+    # 5. Swap in the real token in the same transaction - no refetch needed
+    db.execute(update(Ticket).where(Ticket.id == ticket_id).values(token=token))
     db.commit()
-    db.refresh(ticket)
 
-    # 6. Send ticket email to student
+    # 6. Send ticket email to student on the email threads (non-blocking)
     student = db.query(Student).filter(Student.prn == student_prn).first()
     if student and student.email:
-        try:
-            send_ticket_email(
-                to_email=student.email,
-                student_name=student.name,
-                event_title=event.title,
-                event_location=event.location,
-                event_start_time=event.start_time,
-                event_end_time=event.end_time,
-                ticket_token=token
-            )
-        except Exception as e:
-            # Don't fail registration if email fails
-            print(f"Warning: Failed to send ticket email: {str(e)}")
+        submit_email(
+            send_ticket_email,
+            to_email=student.email,
+            student_name=student.name,
+            event_title=event.title,
+            event_location=event.location,
+            event_start_time=event.start_time,
+            event_end_time=event.end_time,
+            ticket_token=token
+        )
     
-    print("JWT TOKEN:", token)
-    return ticket
\ No newline at end of file
+    return TicketResponse(
+        id=ticket_id,
+        event_id=event_id,
+        student_prn=student_prn,
+        issued_at=issued_at,
+        token=token
+    )
\ No newline at end of file
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from app.db.database import get_db
+from app.core.rate_limit import create_limiter
+from app.db.database import get_db, insert_ignoring_conflicts
 from app.security.jwt import decode_ticket_token
 from app.models.attendance import Attendance
 from app.models.ticket import Ticket
@@ -10,12 +10,63 @@ from app.models.student import Student
 from app.models.event import Event
 from app.models.user import User
 from app.core.permissions import get_current_user_optional
-from app.services.audit_service import create_audit_log
+from app.services.audit_service import create_audit_log_background
 from app.routes.monitor import broadcast_scan_event
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/scan", tags=["Scan & Attendance"])
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter()
+
+# Event fields needed to validate a scan, cached per process; edits in this
+# process drop the entry, the TTL bounds staleness from other workers
+EVENT_CACHE_TTL = 60
+
+
+@dataclass(frozen=True)
+class ScanEvent:
+    title: str
+    start_time: datetime
+    end_time: Optional[datetime]
+    total_days: int
+    start_date: date  # Day 1, derived once when the entry is filled
+
+
+_event_cache: Dict[int, Tuple[float, ScanEvent]] = {}
+
+
+def invalidate_event_cache(event_id: int):
+    """Drop the cached scan fields for an event after it is edited or deleted"""
+    _event_cache.pop(event_id, None)
+
+
+def get_event_cached(db: Session, event_id: int) -> Optional[ScanEvent]:
+    """Load the event's scan-window fields, hitting the database at most once per TTL"""
+    cached = _event_cache.get(event_id)
+    if cached and time.monotonic() - cached[0] < EVENT_CACHE_TTL:
+        return cached[1]
+
+    row = db.query(
+        Event.title, Event.start_time, Event.end_time, Event.total_days
+    ).filter(Event.id == event_id).first()
+    if not row:
+        return None
+
+    title, start_time, end_time, total_days = row
+    event = ScanEvent(
+        title=title,
+        start_time=start_time,
+        end_time=end_time,
+        total_days=total_days or 1,
+        start_date=start_time.date()
+    )
+    _event_cache[event_id] = (time.monotonic(), event)
+    return event
 
 
 @router.post("/")
@@ -23,6 +74,7 @@ limiter = Limiter(key_func=get_remote_address)
 def scan_qr(
     token: str,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_optional)
 ):
@@ -42,7 +94,7 @@ def scan_qr(
         raise HTTPException(status_code=400, detail="Invalid token payload")
     
     # Verify the ticket exists and matches
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = db.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
@@ -50,70 +102,86 @@ def scan_qr(
         raise HTTPException(status_code=400, detail="Token mismatch with ticket")
     
     # Check if event has ended
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = get_event_cached(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
+    # One clock reading for every window check in this scan
+    now = datetime.now(timezone.utc)
+    
     # Check if event has started
-    if event.start_time > datetime.utcnow():
-        print(f"❌ Scan rejected: Event {event_id} hasn't started. Starts at {event.start_time}")
+    if event.start_time > now:
+        logger.warning("Scan rejected: event %s hasn't started, starts at %s", event_id, event.start_time)
         raise HTTPException(
             status_code=403,
             detail=f"Event '{event.title}' has not started yet. It begins on {event.start_time.strftime('%d %b %Y, %I:%M %p')}."
         )
     
     # Check if event has ended (primary validation via end_time)
-    if event.end_time and event.end_time < datetime.utcnow():
-        print(f"❌ Scan rejected: Event {event_id} ended at {event.end_time}")
+    if event.end_time and event.end_time < now:
+        logger.warning("Scan rejected: event %s ended at %s", event_id, event.end_time)
         raise HTTPException(
             status_code=403, 
             detail=f"Event '{event.title}' has already ended on {event.end_time.strftime('%d %b %Y, %I:%M %p')}. Attendance marking is closed. Contact admin for override."
         )
     
     # Calculate current event day (for multi-day events)
-    # event.start_time is Day 1
-    from datetime import date
-    today = date.today()
-    event_start_date = event.start_time.date()
-    current_day = (today - event_start_date).days + 1
-    
-    # Get total days for the event (default: 1)
-    total_days = event.total_days or 1
+    # event.start_date is Day 1 (both dates in UTC, like the stored times)
+    current_day = (now.date() - event.start_date).days + 1
+    total_days = event.total_days
     
     # Day-based validation (secondary - only if no end_time or as a sanity check)
     # Allow some flexibility: if current_day is slightly over but end_time hasn't passed, allow it
     if not event.end_time and current_day > total_days:
-        print(f"❌ Scan rejected: Event {event_id} completed. Current day: {current_day}, Total days: {total_days}")
+        logger.warning("Scan rejected: event %s completed, current day %s of %s", event_id, current_day, total_days)
         raise HTTPException(
             status_code=403,
             detail=f"Event '{event.title}' has already completed all {total_days} day(s). Attendance marking is closed."
         )
     
-    # Check if already attended TODAY (prevent duplicate same-day scans)
-    existing = db.query(Attendance).filter(
+    # Student name and days attended so far, in one round trip
+    student_name, attended_days = db.query(
+        select(Student.name).where(Student.prn == student_prn).limit(1).scalar_subquery(),
+        func.count(func.distinct(Attendance.day_number))
+    ).filter(
         Attendance.event_id == event_id,
         Attendance.student_prn == student_prn,
-        Attendance.day_number == current_day
+        Attendance.invalidated == False
+    ).one()
+    student_name = student_name or "Unknown"
+    
+    # Record today's attendance; the unique index on valid
+    # (event_id, student_prn, day_number) rows turns a same-day rescan into a no-op
+    attendance = db.execute(
+        insert_ignoring_conflicts(
+            db, Attendance,
+            index_elements=["event_id", "student_prn", "day_number"],
+            index_where=(Attendance.invalidated == False)
+        ).values(
+            ticket_id=ticket_id,
+            event_id=event_id,
+            student_prn=student_prn,
+            day_number=current_day,
+            scan_source="qr_scan",
+            scanner_id=current_user.id if current_user else None,
+            device_info=request.headers.get("User-Agent")
+        ).returning(Attendance.id, Attendance.scanned_at)
     ).first()
+    db.commit()
     
-    if existing:
-        # Get student info
-        student = db.query(Student).filter(Student.prn == student_prn).first()
-        
-        # Calculate how many days attended so far
-        from sqlalchemy import func
-        attended_days = db.query(
-            func.count(func.distinct(Attendance.day_number))
-        ).filter(
+    if attendance is None:
+        # Already attended TODAY (prevent duplicate same-day scans)
+        existing = db.query(Attendance.id, Attendance.scanned_at).filter(
             Attendance.event_id == event_id,
-            Attendance.student_prn == student_prn
-        ).scalar()
-        
+            Attendance.student_prn == student_prn,
+            Attendance.day_number == current_day,
+            Attendance.invalidated == False
+        ).first()
         return {
             "status": "already_scanned",
             "message": f"Already marked present for Day {current_day} at {existing.scanned_at.strftime('%I:%M %p')}",
             "attendance_id": existing.id,
-            "student_name": student.name if student else "Unknown",
+            "student_name": student_name,
             "scanned_at": existing.scanned_at.isoformat(),
             "current_day": current_day,
             "total_days": total_days,
@@ -121,45 +189,21 @@ def scan_qr(
             "days_remaining": total_days - attended_days
         }
     
-    # Create new attendance record with day_number
-    attendance = Attendance(
-        ticket_id=ticket_id,
-        event_id=event_id,
-        student_prn=student_prn,
-        day_number=current_day,
-        scan_source="qr_scan",
-        scanner_id=current_user.id if current_user else None,
-        device_info=request.headers.get("User-Agent")
-    )
-
-    db.add(attendance)
-    db.commit()
-    db.refresh(attendance)
-    
-    # Get student info
-    student = db.query(Student).filter(Student.prn == student_prn).first()
-    
-    # Calculate how many days attended so far (including this scan)
-    from sqlalchemy import func
-    attended_days = db.query(
-        func.count(func.distinct(Attendance.day_number))
-    ).filter(
-        Attendance.event_id == event_id,
-        Attendance.student_prn == student_prn
-    ).scalar()
+    # No row existed for current_day, so this scan adds exactly one new day
+    attended_days += 1
     
     # Determine if certificate and feedback are unlocked
     is_fully_attended = (attended_days == total_days)
     
-    # Audit log: QR code scanned
-    create_audit_log(
-        db=db,
+    # Audit log: QR code scanned (written after the response is sent)
+    background_tasks.add_task(
+        create_audit_log_background,
         event_id=event_id,
         user_id=current_user.id if current_user else None,
         action_type="qr_scanned",
         details={
             "student_prn": student_prn,
-            "student_name": student.name if student else "Unknown",
+            "student_name": student_name,
             "ticket_id": ticket_id,
             "day_number": current_day,
             "attended_days": attended_days,
@@ -172,7 +216,7 @@ def scan_qr(
     broadcast_scan_event(event_id, {
         "type": "new_scan",
         "prn": student_prn,
-        "name": student.name if student else "Unknown",
+        "name": student_name,
         "time": attendance.scanned_at.strftime("%H:%M:%S"),
         "day": current_day
     })
@@ -182,7 +226,7 @@ def scan_qr(
         "message": f"Attendance marked for Day {current_day}/{total_days}",
         "attendance_id": attendance.id,
         "student_prn": student_prn,
-        "student_name": student.name if student else "Unknown",
+        "student_name": student_name,
         "event_id": event_id,
         "scanned_at": attendance.scanned_at.isoformat(),
         "current_day": current_day,
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy import func, select
+from app.db.database import get_db, year_month
 from app.models.student import Student
 from app.models.attendance import Attendance
 from app.models.event import Event
@@ -16,6 +16,8 @@ router = APIRouter(prefix="/students", tags=["students"])
 @router.get("/{prn}/analytics")
 def get_student_analytics(
     prn: str, 
+    limit: int = Query(50, ge=1, le=500, description="Page size for attendance history and registered events"),
+    offset: int = Query(0, ge=0, description="Rows to skip in both lists"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_organizer)
 ):
@@ -27,16 +29,43 @@ def get_student_analytics(
     - List of events registered for
     - Attendance history
     - Attendance statistics
-    """
-    # Get all tickets for this student first
-    tickets = db.query(Ticket).filter(Ticket.student_prn == prn).all()
     
+    attendance_history and registered_events are paged with limit/offset;
+    statistics and pagination carry the full totals.
+    """
     # If no tickets exist, student doesn't exist in system
-    if not tickets:
+    total_registered = db.query(func.count(Ticket.id)).filter(
+        Ticket.student_prn == prn
+    ).scalar()
+    if not total_registered:
         raise HTTPException(status_code=404, detail="Student not found in system")
     
+    # Latest scan per ticket, computed alongside the ticket rows
+    last_scanned_at = (
+        select(func.max(Attendance.scanned_at))
+        .where(Attendance.ticket_id == Ticket.id)
+        .scalar_subquery()
+    )
+    
+    # One page of tickets, newest first (only the serialized columns)
+    tickets = db.query(Ticket, last_scanned_at).options(
+        load_only(Ticket.id, Ticket.event_id, Ticket.token, Ticket.issued_at),
+        joinedload(Ticket.event).load_only(
+            Event.id, Event.title, Event.location, Event.start_time
+        )
+    ).filter(
+        Ticket.student_prn == prn
+    ).order_by(
+        Ticket.issued_at.desc(), Ticket.id.desc()
+    ).limit(limit).offset(offset).all()
+    
     # Get student info - create if doesn't exist
-    student = db.query(Student).filter(Student.prn == prn).first()
+    student = db.query(Student).options(
+        load_only(
+            Student.prn, Student.name, Student.email,
+            Student.branch, Student.year, Student.division
+        )
+    ).filter(Student.prn == prn).first()
     if not student:
         # Create placeholder student record from PRN
         student = Student(
@@ -51,19 +80,24 @@ def get_student_analytics(
         db.commit()
         db.refresh(student)
     
-    # Get all attendance records
-    attendance_records = (
-        db.query(Attendance, Event, Ticket)
+    # One page of attendance history, newest first
+    history_query = (
+        db.query(Attendance, Event)
+        .options(
+            load_only(Attendance.id, Attendance.ticket_id, Attendance.scanned_at),
+            load_only(Event.id, Event.title, Event.location, Event.start_time)
+        )
         .join(Ticket, Attendance.ticket_id == Ticket.id)
         .join(Event, Ticket.event_id == Event.id)
         .filter(Ticket.student_prn == prn)
-        .order_by(Attendance.scanned_at.desc())
-        .all()
+        .order_by(Attendance.scanned_at.desc(), Attendance.id.desc())
+        .limit(limit)
+        .offset(offset)
     )
     
     # Format attendance history
     attendance_history = []
-    for att, event, ticket in attendance_records:
+    for att, event in history_query.all():
         attendance_history.append({
             "attendance_id": att.id,
             "event_id": event.id,
@@ -75,12 +109,10 @@ def get_student_analytics(
     
     # Get registered events (both attended and pending)
     registered_events = []
-    for ticket in tickets:
-        # Check if attendance exists for this ticket
-        attendance = next((att for att, _, t in attendance_records if t.id == ticket.id), None)
-        has_attendance = attendance is not None
+    for ticket, attended_at in tickets:
+        has_attendance = attended_at is not None
         
-        event = db.query(Event).filter(Event.id == ticket.event_id).first()
+        event = ticket.event
         if event:
             registered_events.append({
                 "event_id": event.id,
@@ -91,34 +123,32 @@ def get_student_analytics(
                 "ticket_id": ticket.id,
                 "token": ticket.token,
                 "status": "completed" if has_attendance else "pending",
-                "attended_at": attendance.scanned_at.isoformat() if has_attendance and attendance.scanned_at else None,
+                "attended_at": attended_at.isoformat() if has_attendance else None,
             })
     
+    # Attendance per month; the buckets also sum to the total attended
+    monthly_data = (
+        db.query(
+            year_month(db, Attendance.scanned_at).label('month'),
+            func.count(Attendance.id).label('count')
+        )
+        .join(Ticket, Attendance.ticket_id == Ticket.id)
+        .join(Event, Ticket.event_id == Event.id)
+        .filter(Ticket.student_prn == prn)
+        .group_by('month')
+        .order_by('month')
+        .all()
+    )
+    
+    monthly_stats = [
+        {"month": month, "count": count}
+        for month, count in monthly_data
+    ]
+    
     # Calculate statistics
-    total_registered = len(tickets)
-    total_attended = len(attendance_records)
+    total_attended = sum(count for _, count in monthly_data)
     attendance_rate = (total_attended / total_registered * 100) if total_registered > 0 else 0
     
-    # Get events by month for graph data
-    monthly_stats = []
-    if attendance_records:
-        monthly_data = (
-            db.query(
-                func.to_char(Attendance.scanned_at, 'YYYY-MM').label('month'),
-                func.count(Attendance.id).label('count')
-            )
-            .join(Ticket, Attendance.ticket_id == Ticket.id)
-            .filter(Ticket.student_prn == prn)
-            .group_by('month')
-            .order_by('month')
-            .all()
-        )
-        
-        monthly_stats = [
-            {"month": month, "count": count}
-            for month, count in monthly_data
-        ]
-    
     return {
         "student": {
             "prn": student.prn,
@@ -137,6 +167,12 @@ def get_student_analytics(
         "attendance_history": attendance_history,
         "registered_events": registered_events,
         "monthly_stats": monthly_stats,
+        "pagination": {
+            "limit": limit,
+            "offset": offset,
+            "total_history": total_attended,
+            "total_registered": total_registered,
+        },
     }
 
 
@@ -157,7 +193,7 @@ def get_student_event_attendance_status(
     - List of days attended with timestamps
     """
     # Get event
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -4,13 +4,13 @@ Handles student CRUD and bulk import operations
 """
 
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from typing import List
-import csv
-from io import StringIO
+from typing import Dict, List, Optional
+import pandas as pd
 
-from app.db.database import get_db
+from app.db.database import get_db, insert_ignoring_conflicts
 from app.models.student import Student
 from app.schemas.student import StudentCreate, StudentResponse
 from app.security.jwt import get_current_user
@@ -18,6 +18,13 @@ from app.models.user import User, UserRole
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
+# CSV rows are inserted in chunks of this size, one transaction per chunk
+STUDENT_IMPORT_CHUNK_SIZE = 10_000
+
+# Shape check for imported emails, run over a whole column at once; no
+# deliverability or DNS lookups like EmailStr's validator
+STUDENT_IMPORT_EMAIL_PATTERN = r'[^@\s]+@[^@\s]+\.[^@\s]+'
+
 
 def require_admin(current_user: User = Depends(get_current_user)):
     """Require admin role for student management"""
@@ -29,6 +36,18 @@ def require_admin(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+def insert_new_students(db: Session, rows: List[Dict]) -> int:
+    """
+    Insert student rows in one executemany, skipping PRNs that already exist
+    Returns the number of rows actually inserted
+    """
+    if not rows:
+        return 0
+    stmt = insert_ignoring_conflicts(db, Student, index_elements=["prn"])
+    result = db.execute(stmt.returning(Student.prn), rows)
+    return len(result.all())
+
+
 @router.post("/bulk-import", response_model=dict)
 def bulk_import_students(
     students_data: List[StudentCreate],
@@ -46,35 +65,24 @@ def bulk_import_students(
         "errors": []
     }
     
+    # Keep the first occurrence of each PRN; the database skips existing ones
+    rows = {}
     for student_data in students_data:
-        try:
-            # Check if student already exists
-            existing = db.query(Student).filter(Student.prn == student_data.prn).first()
-            if existing:
-                results["duplicates"] += 1
-                continue
-            
-            # Create new student
-            new_student = Student(
-                prn=student_data.prn,
-                name=student_data.name,
-                email=student_data.email,
-                department=student_data.department,
-                year=student_data.year
-            )
-            db.add(new_student)
-            db.commit()
-            results["imported"] += 1
-            
-        except IntegrityError as e:
-            db.rollback()
-            results["duplicates"] += 1
-        except Exception as e:
-            db.rollback()
-            results["errors"].append({
-                "prn": student_data.prn,
-                "error": str(e)
-            })
+        rows.setdefault(student_data.prn, {
+            "prn": student_data.prn,
+            "name": student_data.name,
+            "email": student_data.email,
+            "branch": student_data.department,
+            "year": student_data.year
+        })
+    
+    try:
+        results["imported"] = insert_new_students(db, list(rows.values()))
+        db.commit()
+        results["duplicates"] = len(students_data) - results["imported"]
+    except Exception as e:
+        db.rollback()
+        results["errors"].append({"error": str(e)})
     
     return {
         "success": True,
@@ -84,7 +92,7 @@ def bulk_import_students(
 
 
 @router.post("/bulk-import-csv", response_model=dict)
-async def bulk_import_students_csv(
+def bulk_import_students_csv(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
@@ -110,68 +118,103 @@ async def bulk_import_students_csv(
     }
     
     try:
-        # Read CSV content
-        contents = await file.read()
-        csv_text = contents.decode('utf-8')
-        csv_reader = csv.DictReader(StringIO(csv_text))
-        
-        # Validate CSV headers
+        # Validate CSV headers before parsing any rows
         required_headers = {'prn', 'name', 'email', 'department', 'year'}
-        headers = set(csv_reader.fieldnames or [])
-        missing_headers = required_headers - headers
-        
+        try:
+            header = pd.read_csv(file.file, nrows=0, encoding='utf-8').columns
+        except pd.errors.EmptyDataError:
+            raise HTTPException(status_code=400, detail="CSV file is empty")
+        file.file.seek(0)
+        missing_headers = required_headers - set(header)
         if missing_headers:
             raise HTTPException(
                 status_code=400,
                 detail=f"Missing required CSV columns: {', '.join(missing_headers)}"
             )
         
-        # Process each row
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
-            results["total"] += 1
+        # Parse the spooled upload in chunks so memory stays bounded by the
+        # chunk size; the index keeps counting across chunks. With usecols,
+        # rows carrying extra fields (e.g. a trailing comma from Excel) are
+        # read with the extras ignored, as csv.DictReader did, instead of
+        # failing the whole file.
+        seen_prns = set()
+        reader = pd.read_csv(
+            file.file,
+            usecols=list(required_headers),
+            index_col=False,
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8',
+            chunksize=STUDENT_IMPORT_CHUNK_SIZE
+        )
+        
+        while True:
+            try:
+                df = next(reader)
+            except StopIteration:
+                break
+            except pd.errors.ParserError as e:
+                # Earlier chunks are already committed; report where parsing
+                # stopped so the counts below still describe what was imported
+                results["errors"].append({
+                    "row": results["total"] + 2,
+                    "error": f"Could not parse the CSV from this row on: {str(e).strip()}"
+                })
+                break
+            
+            results["total"] += len(df)
+            df = df.fillna('')
+            df['row'] = df.index + 2  # Header is row 1
+            
+            # Validate required fields
+            invalid = (df['prn'] == '') | (df['name'] == '')
+            results["errors"].extend(
+                {"row": int(row_num), "error": "PRN and Name are required"}
+                for row_num in df.loc[invalid, 'row']
+            )
+            df = df[~invalid]
+            
+            # Repeated PRNs within the file count as duplicates
+            df['prn'] = df['prn'].str.strip()
+            repeated = df['prn'].duplicated() | df['prn'].isin(seen_prns)
+            results["duplicates"] += int(repeated.sum())
+            df = df[~repeated]
+            seen_prns.update(df['prn'])
+            if df.empty:
+                continue
+            
+            # Blank optional text becomes NULL; malformed emails and
+            # non-integer years are dropped, and each dropped email is
+            # reported so the row can be fixed by hand
+            email = df['email'].str.strip()
+            malformed = (email != '') & ~email.str.fullmatch(STUDENT_IMPORT_EMAIL_PATTERN)
+            results["errors"].extend(
+                {"row": int(row_num), "prn": prn, "error": f"Invalid email '{value}' was not imported"}
+                for row_num, prn, value in zip(df.loc[malformed, 'row'], df.loc[malformed, 'prn'], email[malformed])
+            )
+            email = email.where(~malformed & (email != ''))
+            year = df['year'].str.strip()
+            year = year.where(year.str.fullmatch(r'[+-]?\d+'))
+            students = pd.DataFrame({
+                'prn': df['prn'],
+                'name': df['name'].str.strip(),
+                'email': email,
+                'branch': df['department'].str.strip().replace('', None),
+                'year': pd.to_numeric(year).astype('Int64'),
+            }).astype(object)
+            students = students.where(students.notna(), None)
             
+            # Existing PRNs count as duplicates
             try:
-                # Validate required fields
-                if not row['prn'] or not row['name']:
-                    results["errors"].append({
-                        "row": row_num,
-                        "error": "PRN and Name are required"
-                    })
-                    continue
-                
-                # Check if student already exists
-                existing = db.query(Student).filter(Student.prn == row['prn'].strip()).first()
-                if existing:
-                    results["duplicates"] += 1
-                    continue
-                
-                # Parse year (handle empty or invalid values)
-                try:
-                    year = int(row['year']) if row['year'].strip() else None
-                except (ValueError, AttributeError):
-                    year = None
-                
-                # Create new student
-                new_student = Student(
-                    prn=row['prn'].strip(),
-                    name=row['name'].strip(),
-                    email=row['email'].strip() if row['email'] else None,
-                    branch=row['department'].strip() if row['department'] else None,
-                    year=year
-                )
-                db.add(new_student)
+                imported = insert_new_students(db, students.to_dict('records'))
                 db.commit()
-                results["imported"] += 1
-                
-            except IntegrityError as e:
-                db.rollback()
-                results["duplicates"] += 1
+                results["imported"] += imported
+                results["duplicates"] += len(students) - imported
             except Exception as e:
                 db.rollback()
                 results["errors"].append({
-                    "row": row_num,
-                    "prn": row.get('prn', 'N/A'),
-                    "error": str(e)
+                    "row": int(df['row'].iloc[0]),
+                    "error": f"Failed to import {len(students)} rows: {str(e)}"
                 })
         
         return {
@@ -180,6 +223,8 @@ async def bulk_import_students_csv(
             "results": results
         }
         
+    except HTTPException:
+        raise
     except UnicodeDecodeError:
         raise HTTPException(
             status_code=400,
@@ -194,23 +239,43 @@ async def bulk_import_students_csv(
 
 @router.get("/", response_model=dict)
 def list_students(
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    List all students with pagination
+    List students newest first with keyset pagination
+    Pass the previous page's next_cursor as after_id; the full COUNT(*) is
+    only run when include_total is set
     """
-    total = db.query(Student).count()
-    students = db.query(Student).order_by(Student.id.desc()).offset(skip).limit(limit).all()
+    query = db.query(Student)
+    if after_id is not None:
+        query = query.filter(Student.id < after_id)
+    students = query.order_by(Student.id.desc()).limit(limit).all()
     
-    return {
-        "total": total,
-        "skip": skip,
+    response = {
+        "after_id": after_id,
         "limit": limit,
-        "students": students
+        "next_cursor": students[-1].id if len(students) == limit else None,
+        "students": [
+            {
+                "id": student.id,
+                "prn": student.prn,
+                "name": student.name,
+                "email": student.email,
+                "branch": student.branch,
+                "year": student.year,
+                "division": student.division
+            }
+            for student in students
+        ]
     }
+    if include_total:
+        response["total"] = db.query(func.count(Student.id)).scalar()
+    # Returned as a response so orjson encodes it without a jsonable_encoder pass
+    return ORJSONResponse(response)
 
 
 @router.get("/stats/overview", response_model=dict)
@@ -222,8 +287,6 @@ def get_student_statistics(
     Get student statistics for visualization
     Returns department-wise breakdown, year-wise distribution, etc.
     """
-    from sqlalchemy import func
-    
     # Total students
     total_students = db.query(Student).count()
     
@@ -1,28 +1,34 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import StreamingResponse
-from io import BytesIO
-import qrcode
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response, status
+import hashlib
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.ticket import Ticket
 from app.models.attendance import Attendance
 from app.models.user import User
 from app.core.permissions import require_organizer
+from app.services.qr_service import ticket_qr_png
 
 router = APIRouter(prefix="/tickets", tags=["Tickets"])
 
+# The image is a pure function of the token, so clients may keep it forever
+TICKET_QR_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 @router.get("/qr")
-def get_ticket_qr(token: str = Query(...)):
+def get_ticket_qr(request: Request, token: str = Query(...)):
     if not token:
         raise HTTPException(status_code=400, detail="Token required")
 
-    img = qrcode.make(token)
-    buf = BytesIO()
-    img.save(buf)
-    buf.seek(0)
+    etag = f'"{hashlib.sha256(token.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": TICKET_QR_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=ticket_qr_png(token), media_type="image/png", headers=headers)
+
 
-    return StreamingResponse(buf, media_type="image/png")
 @router.delete("/{ticket_id}")
 def delete_ticket(
     ticket_id: int,
@@ -34,14 +40,14 @@ def delete_ticket(
     Used by organizers/admin to remove student registration from event.
     Requires ORGANIZER or ADMIN role.
     """
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = db.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    # Delete associated attendance records first
+    # Delete associated attendance records explicitly: SQLite deployments run
+    # without foreign key enforcement, so the ON DELETE CASCADE only fires on
+    # PostgreSQL
     db.query(Attendance).filter(Attendance.ticket_id == ticket_id).delete()
-    
-    # Delete the ticket
     db.delete(ticket)
     db.commit()
     
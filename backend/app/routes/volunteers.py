@@ -3,18 +3,21 @@ Volunteer Management Routes
 Allows organizers to add volunteers to events and manage volunteer certificates
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_db, insert_ignoring_conflicts
 from app.models.user import User, UserRole
 from app.models.event import Event
 from app.models.volunteer import Volunteer
 from app.models.certificate import Certificate
-from app.core.permissions import require_organizer
+from app.core.permissions import require_organizer, require_event_organizer
 from app.services.audit_service import create_audit_log
+from app.services.role_certificate_service import resend_volunteer_certificate_email
 
 router = APIRouter(prefix="/volunteers", tags=["Volunteers"])
 
@@ -49,7 +52,7 @@ def add_volunteer(
     Only admins and event organizers can add volunteers
     """
     # Check if event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -60,29 +63,24 @@ def add_volunteer(
             detail="Only event organizers and admins can add volunteers"
         )
     
-    # Check if volunteer already exists for this event
-    existing = db.query(Volunteer).filter(
-        Volunteer.event_id == event_id,
-        Volunteer.email == volunteer_data.email
+    # Create volunteer record; the (event_id, email) unique index rejects repeats
+    volunteer = db.execute(
+        insert_ignoring_conflicts(
+            db, Volunteer, index_elements=["event_id", "email"]
+        ).values(
+            event_id=event_id,
+            name=volunteer_data.name,
+            email=volunteer_data.email,
+            added_by=current_user.id
+        ).returning(Volunteer.id, Volunteer.name, Volunteer.email, Volunteer.added_at)
     ).first()
     
-    if existing:
+    if volunteer is None:
         raise HTTPException(
             status_code=400,
             detail=f"Volunteer with email {volunteer_data.email} already added to this event"
         )
-    
-    # Create volunteer record
-    volunteer = Volunteer(
-        event_id=event_id,
-        name=volunteer_data.name,
-        email=volunteer_data.email,
-        added_by=current_user.id
-    )
-    
-    db.add(volunteer)
     db.commit()
-    db.refresh(volunteer)
     
     # Create audit log
     create_audit_log(
@@ -110,6 +108,72 @@ def add_volunteer(
     }
 
 
+@router.post("/{event_id}/bulk")
+def add_volunteers_bulk(
+    event_id: int,
+    volunteers_data: List[VolunteerCreate],
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_organizer),
+    event: Event = Depends(require_event_organizer)
+):
+    """
+    Add several volunteers to an event in one insert
+    Emails already on the event (or repeated in the list) are skipped
+    """
+    # Keep the first entry for each email
+    rows = {}
+    for volunteer_data in volunteers_data:
+        rows.setdefault(volunteer_data.email, {
+            "event_id": event_id,
+            "name": volunteer_data.name,
+            "email": volunteer_data.email,
+            "added_by": current_user.id
+        })
+    
+    added = []
+    if rows:
+        result = db.execute(
+            insert_ignoring_conflicts(
+                db, Volunteer, index_elements=["event_id", "email"]
+            ).returning(Volunteer.id, Volunteer.name, Volunteer.email, Volunteer.added_at),
+            list(rows.values())
+        )
+        added = result.all()
+        db.commit()
+    
+    added_emails = {volunteer.email for volunteer in added}
+    skipped = [email for email in rows if email not in added_emails]
+    
+    if added:
+        create_audit_log(
+            db=db,
+            event_id=event_id,
+            user_id=current_user.id,
+            action_type="volunteers_bulk_added",
+            details={
+                "count": len(added),
+                "volunteer_emails": sorted(added_emails)
+            },
+            ip_address=request.client.host if request.client else None
+        )
+    
+    return {
+        "success": True,
+        "message": f"Added {len(added)} volunteers",
+        "added": [
+            {
+                "id": volunteer.id,
+                "name": volunteer.name,
+                "email": volunteer.email,
+                "added_at": volunteer.added_at.isoformat()
+            }
+            for volunteer in added
+        ],
+        "skipped": skipped
+    }
+
+
 @router.get("/{event_id}")
 def list_volunteers(
     event_id: int,
@@ -120,7 +184,7 @@ def list_volunteers(
     Get all volunteers for an event
     """
     # Check if event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -133,7 +197,9 @@ def list_volunteers(
     
     volunteers = db.query(Volunteer).filter(Volunteer.event_id == event_id).all()
     
-    return {
+    # orjson encodes the datetimes natively; returning the response directly
+    # skips FastAPI's jsonable_encoder walk over every row
+    return ORJSONResponse({
         "event_id": event_id,
         "event_title": event.title,
         "total_volunteers": len(volunteers),
@@ -142,13 +208,13 @@ def list_volunteers(
                 "id": v.id,
                 "name": v.name,
                 "email": v.email,
-                "added_at": v.added_at.isoformat(),
+                "added_at": v.added_at,
                 "certificate_sent": v.certificate_sent,
-                "certificate_sent_at": v.certificate_sent_at.isoformat() if v.certificate_sent_at else None
+                "certificate_sent_at": v.certificate_sent_at
             }
             for v in volunteers
         ]
-    }
+    })
 
 
 @router.delete("/{volunteer_id}")
@@ -162,12 +228,12 @@ def remove_volunteer(
     Remove a volunteer from an event
     Only admins and event organizers can remove volunteers
     """
-    volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
+    volunteer = db.get(Volunteer, volunteer_id)
     if not volunteer:
         raise HTTPException(status_code=404, detail="Volunteer not found")
     
     # Check if event exists and user has permission
-    event = db.query(Event).filter(Event.id == volunteer.event_id).first()
+    event = db.get(Event, volunteer.event_id)
     if current_user.role != UserRole.ADMIN and event.created_by != current_user.id:
         raise HTTPException(
             status_code=403,
@@ -202,93 +268,67 @@ def remove_volunteer(
     }
 
 
-@router.post("/{volunteer_id}/resend-certificate")
+@router.post("/{volunteer_id}/resend-certificate", status_code=status.HTTP_202_ACCEPTED)
 def resend_volunteer_certificate(
     volunteer_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_organizer)
 ):
     """
     Resend certificate to a volunteer
     Useful if email failed or volunteer lost the certificate
+    The email goes out after the response; the volunteer and certificate
+    are marked sent, and the resend audited, once SMTP accepts it
     """
-    volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
-    if not volunteer:
+    # Volunteer, event and certificate in one query
+    row = db.query(Volunteer, Event, Certificate).join(
+        Event, Event.id == Volunteer.event_id
+    ).outerjoin(
+        Certificate,
+        and_(
+            Certificate.event_id == Volunteer.event_id,
+            Certificate.recipient_email == Volunteer.email,
+            Certificate.role_type == "volunteer"
+        )
+    ).filter(
+        Volunteer.id == volunteer_id
+    ).first()
+    
+    if not row:
         raise HTTPException(status_code=404, detail="Volunteer not found")
+    volunteer, event, certificate = row
     
     # Check permissions
-    event = db.query(Event).filter(Event.id == volunteer.event_id).first()
     if current_user.role != UserRole.ADMIN and event.created_by != current_user.id:
         raise HTTPException(
             status_code=403,
             detail="Only event organizers and admins can resend certificates"
         )
     
-    # Find volunteer's certificate
-    certificate = db.query(Certificate).filter(
-        Certificate.event_id == volunteer.event_id,
-        Certificate.recipient_email == volunteer.email,
-        Certificate.role_type == "volunteer"
-    ).first()
-    
     if not certificate:
         raise HTTPException(
             status_code=404,
             detail="No certificate found for this volunteer. Push certificates first."
         )
     
-    try:
-        # Import certificate service to resend email
-        from app.services.certificate_service import send_certificate_email
-        
-        success = send_certificate_email(
-            db=db,
-            certificate_id=certificate.certificate_id,
-            recipient_email=volunteer.email,
-            recipient_name=volunteer.name,
-            event_title=event.title
-        )
-        
-        if success:
-            # Update volunteer record
-            from datetime import datetime, timezone
-            volunteer.certificate_sent = True
-            volunteer.certificate_sent_at = datetime.now(timezone.utc)
-            
-            # Update certificate record
-            certificate.email_sent = True
-            certificate.email_sent_at = datetime.now(timezone.utc)
-            
-            db.commit()
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                event_id=volunteer.event_id,
-                user_id=current_user.id,
-                action_type="volunteer_certificate_resent",
-                details={
-                    "volunteer_id": volunteer.id,
-                    "volunteer_name": volunteer.name,
-                    "volunteer_email": volunteer.email,
-                    "certificate_id": certificate.certificate_id
-                },
-                ip_address=request.client.host if request.client else None
-            )
-            
-            return {
-                "success": True,
-                "message": f"Certificate resent to {volunteer.email}"
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to send certificate email. Check SMTP configuration."
-            )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to resend certificate: {str(e)}"
-        )
+    background_tasks.add_task(
+        resend_volunteer_certificate_email,
+        volunteer_id=volunteer.id,
+        certificate_id=certificate.certificate_id,
+        to_email=volunteer.email,
+        volunteer_name=volunteer.name,
+        event_id=volunteer.event_id,
+        event_title=event.title,
+        event_location=event.location or 'TBD',
+        event_date=event.start_time.strftime('%B %d, %Y') if event.start_time else 'TBD',
+        user_id=current_user.id,
+        ip_address=request.client.host if request.client else None
+    )
+    
+    return {
+        "success": True,
+        "status": "queued",
+        "message": f"Certificate resend queued for {volunteer.email}"
+    }
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_serializer
-from datetime import datetime, timezone
+from pydantic import BaseModel
+from datetime import datetime
 from typing import Optional
 
 class AttendanceResponse(BaseModel):
@@ -9,12 +9,5 @@ class AttendanceResponse(BaseModel):
     scanned_at: datetime
     day_number: Optional[int] = None  # Which day of the event (for multi-day events)
 
-    @field_serializer('scanned_at')
-    def serialize_dt(self, dt: datetime, _info):
-        if dt and dt.tzinfo is None:
-            # If datetime is naive, assume it's UTC
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.isoformat() if dt else None
-
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_serializer
-from datetime import datetime, timezone
+from pydantic import BaseModel
+from datetime import datetime
 from typing import Optional, Dict, Any
 
 class AuditLogBase(BaseModel):
@@ -17,18 +17,7 @@ class AuditLogResponse(AuditLogBase):
     user_id: Optional[int]
     user_email: Optional[str] = None  # Include user email for display
     ip_address: Optional[str]
-    timestamp: datetime
-
-    @field_serializer('timestamp')
-    def serialize_dt(self, dt: datetime, _info):
-        if dt:
-            # Convert to UTC if it has timezone info
-            if dt.tzinfo is not None:
-                dt = dt.astimezone(timezone.utc)
-            else:
-                # If naive, assume UTC
-                dt = dt.replace(tzinfo=timezone.utc)
-        return dt.isoformat() if dt else None
+    timestamp: datetime  # UTC-aware from the column type
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from pydantic import BaseModel, field_serializer, field_validator
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
 
 
@@ -30,6 +30,7 @@ class EventResponse(BaseModel):
     title: str
     description: Optional[str] = None
     location: Optional[str] = None
+    # UTC-aware from the column type, serialized with the offset
     start_time: datetime
     end_time: datetime
     created_at: datetime
@@ -37,16 +38,6 @@ class EventResponse(BaseModel):
     guest_speaker: Optional[str] = None  # Guest speaker or special guest name
     total_days: Optional[int] = 1  # Number of days event spans
 
-    @field_serializer('created_at', 'start_time', 'end_time')
-    def serialize_dt(self, dt: datetime, _info):
-        if dt:
-            # Database stores naive UTC times, add UTC timezone for serialization
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            # Always return ISO format with timezone
-            return dt.isoformat()
-        return None
-
     class Config:
         from_attributes = True
 
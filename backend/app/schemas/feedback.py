@@ -57,6 +57,9 @@ class FeedbackSummary(BaseModel):
     sentiment_neutral: int
     sentiment_negative: int
 
+    class Config:
+        from_attributes = True
+
 
 class SendFeedbackRequest(BaseModel):
     event_id: int
@@ -1,5 +1,11 @@
+import json
+import time
+from calendar import timegm
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
+from functools import lru_cache
+from jose import jwk, jwt, JWTError
+from jose.exceptions import ExpiredSignatureError
+from jose.utils import base64url_encode
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -14,6 +20,50 @@ SECRET_KEY = settings.SECRET_KEY
 # Security scheme for FastAPI
 security = HTTPBearer()
 
+# Signing context built once at import: the key object and the encoded JWS
+# header are the same for every token this service issues
+_SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+_ENCODED_HEADER = base64url_encode(
+    json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode("utf-8")
+)
+
+
+def _encode_token(claims: dict) -> str:
+    """
+    Sign claims with the pre-built key and header.
+    Produces the same compact JWS as jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM).
+    """
+    for time_claim in ("exp", "iat", "nbf"):
+        if isinstance(claims.get(time_claim), datetime):
+            claims[time_claim] = timegm(claims[time_claim].utctimetuple())
+
+    encoded_claims = base64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = _ENCODED_HEADER + b"." + encoded_claims
+    signature = base64url_encode(_SIGNING_KEY.sign(signing_input))
+    return (signing_input + b"." + signature).decode("utf-8")
+
+
+# Verified claims keyed by the raw token, so rescans and repeated dashboard
+# requests skip signature checks; failures raise and are never cached
+TOKEN_CACHE_SIZE = 10_000
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _verified_claims(token: str) -> dict:
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def _decode_token(token: str) -> dict:
+    """
+    jwt.decode with a cache of verified tokens.
+    Expiry is re-checked on every call since a cached entry outlives it.
+    """
+    claims = _verified_claims(token)
+    exp = claims.get("exp")
+    if exp is not None and exp < time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+    return dict(claims)
+
 
 # =====================================================
 # USER AUTH TOKEN (LOGIN / DASHBOARD)
@@ -29,12 +79,12 @@ def create_access_token(data: dict, expires_minutes: int = 60 * 24):
         "type": "access"
     })
 
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _encode_token(to_encode)
 
 
 def decode_access_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         if payload.get("type") != "access":
             raise HTTPException(status_code=401, detail="Invalid access token")
         return payload
@@ -66,7 +116,7 @@ def get_current_user(
             )
         
         # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -97,12 +147,12 @@ def create_ticket_token(data: dict, expires_minutes: int = 60 * 24):
         "type": "ticket"
     })
 
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _encode_token(to_encode)
 
 
 def decode_ticket_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         if payload.get("type") != "ticket":
             raise HTTPException(status_code=401, detail="Invalid ticket token")
         return payload
@@ -24,7 +24,7 @@ class DescriptiveAnalyticsService:
         Analyze attendance timing behavior for a single event
         """
 
-        event = self.db.query(Event).filter(Event.id == event_id).first()
+        event = self.db.get(Event, event_id)
         if not event:
             return {"error": "Event not found"}
 
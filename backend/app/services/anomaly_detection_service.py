@@ -101,7 +101,7 @@ class AnomalyDetectionService:
         features = []
         
         for record in attendance_records:
-            event = db.query(Event).filter(Event.id == record.event_id).first()
+            event = db.get(Event, record.event_id)
             
             if not event:
                 continue
@@ -6,16 +6,35 @@ Provides consolidated view of all changes, corrections, and retroactive actions
 for participation records.
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, load_only
 from sqlalchemy import and_, or_, desc
+from app.db.database import SessionLocal
 from app.models.audit_log import AuditLog
 from app.models.certificate import Certificate
 from app.models.attendance import Attendance
 from app.models.user import User
 from app.models.event import Event
 from app.models.student import Student
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timezone
+import threading
+import time
+
+# Event audit summaries are cached per process and dropped whenever an audit
+# entry is written for the event; the TTL only bounds staleness from writers
+# that bypass invalidate_audit_summary()
+AUDIT_SUMMARY_CACHE_TTL = 600
+
+_audit_summary_cache: Dict[int, Tuple[float, Dict]] = {}
+_audit_summary_invalidated_at: Dict[int, float] = {}
+_audit_summary_locks: Dict[int, threading.Lock] = {}
+_audit_summary_guard = threading.Lock()
+
+
+def invalidate_audit_summary(event_id: int):
+    """Drop the cached audit summary for an event after its audit trail changes"""
+    _audit_summary_invalidated_at[event_id] = time.monotonic()
+    _audit_summary_cache.pop(event_id, None)
 
 def create_audit_log(
     db: Session,
@@ -46,14 +65,41 @@ def create_audit_log(
         ip_address=ip_address,
         timestamp=datetime.now(timezone.utc)
     )
+    # No refresh: callers don't read the row back, and the id came from
+    # the INSERT ... RETURNING; expired attributes still load on access
     db.add(audit_log)
     db.commit()
-    db.refresh(audit_log)
+    invalidate_audit_summary(event_id)
     return audit_log
 
+
+def create_audit_log_background(
+    event_id: int,
+    user_id: Optional[int],
+    action_type: str,
+    details: Optional[Dict[str, Any]] = None,
+    ip_address: Optional[str] = None
+):
+    """
+    Create an audit log entry with its own session
+    For BackgroundTasks: runs after the response, once the request session is closed
+    """
+    with SessionLocal() as db:
+        create_audit_log(
+            db=db,
+            event_id=event_id,
+            user_id=user_id,
+            action_type=action_type,
+            details=details,
+            ip_address=ip_address
+        )
+
 def get_event_audit_logs(db: Session, event_id: int, limit: int = 100):
     """Get audit logs for a specific event, ordered by most recent first"""
-    return db.query(AuditLog).filter(
+    # Actor email comes in the same query instead of one lazy load per log
+    return db.query(AuditLog).options(
+        joinedload(AuditLog.user).load_only(User.email)
+    ).filter(
         AuditLog.event_id == event_id
     ).order_by(AuditLog.timestamp.desc()).limit(limit).all()
 
@@ -79,10 +125,14 @@ class AuditService:
         """
         
         # Get student info
-        student = self.db.query(Student).filter_by(prn=student_prn).first()
+        student = self.db.query(Student).options(
+            load_only(Student.name, Student.email)
+        ).filter_by(prn=student_prn).first()
         
         # Get event info
-        event = self.db.query(Event).filter_by(id=event_id).first()
+        event = self.db.query(Event).options(
+            load_only(Event.title, Event.start_time)
+        ).filter_by(id=event_id).first()
         
         if not event:
             return {"error": "Event not found"}
@@ -90,14 +140,20 @@ class AuditService:
         changes = []
         
         # 1. Get certificate revocations
-        certificates = self.db.query(Certificate).filter_by(
+        certificates = self.db.query(Certificate).options(
+            load_only(
+                Certificate.certificate_id, Certificate.revoked_at,
+                Certificate.revoked_by, Certificate.revocation_reason
+            ),
+            joinedload(Certificate.revoker).load_only(User.email, User.full_name)
+        ).filter_by(
             event_id=event_id,
             student_prn=student_prn,
             revoked=True
         ).all()
         
         for cert in certificates:
-            revoker = self.db.query(User).filter_by(id=cert.revoked_by).first()
+            revoker = cert.revoker
             changes.append({
                 "timestamp": cert.revoked_at.isoformat() if cert.revoked_at else None,
                 "action": "certificate_revoked",
@@ -113,7 +169,13 @@ class AuditService:
             })
         
         # 2. Get attendance invalidations
-        invalidated_attendance = self.db.query(Attendance).filter(
+        invalidated_attendance = self.db.query(Attendance).options(
+            load_only(
+                Attendance.scanned_at, Attendance.day_number, Attendance.invalidated_at,
+                Attendance.invalidated_by, Attendance.invalidation_reason
+            ),
+            joinedload(Attendance.invalidator).load_only(User.email, User.full_name)
+        ).filter(
             and_(
                 Attendance.event_id == event_id,
                 Attendance.student_prn == student_prn,
@@ -122,7 +184,7 @@ class AuditService:
         ).all()
         
         for att in invalidated_attendance:
-            invalidator = self.db.query(User).filter_by(id=att.invalidated_by).first()
+            invalidator = att.invalidator
             changes.append({
                 "timestamp": att.invalidated_at.isoformat() if att.invalidated_at else None,
                 "action": "attendance_invalidated",
@@ -140,14 +202,17 @@ class AuditService:
             })
         
         # 3. Get audit log entries for this student
-        audit_logs = self.db.query(AuditLog).filter_by(
+        audit_logs = self.db.query(AuditLog).options(
+            load_only(AuditLog.action_type, AuditLog.details, AuditLog.timestamp, AuditLog.user_id),
+            joinedload(AuditLog.user).load_only(User.email, User.full_name)
+        ).filter_by(
             event_id=event_id
         ).order_by(desc(AuditLog.timestamp)).limit(limit).all()
         
         for log in audit_logs:
             if log.details and isinstance(log.details, dict):
                 if log.details.get('student_prn') == student_prn:
-                    user_obj = self.db.query(User).filter_by(id=log.user_id).first()
+                    user_obj = log.user
                     changes.append({
                         "timestamp": log.timestamp.isoformat() if log.timestamp else None,
                         "action": log.action_type,
@@ -190,7 +255,30 @@ class AuditService:
         """
         Get audit summary for entire event.
         Shows all changes across all students.
+        Served from cache until the event's audit trail changes.
         """
+        cached = _audit_summary_cache.get(event_id)
+        if cached and time.monotonic() - cached[0] < AUDIT_SUMMARY_CACHE_TTL:
+            return cached[1]
+        
+        # One rebuild per event at a time; concurrent callers wait for it
+        with _audit_summary_guard:
+            lock = _audit_summary_locks.setdefault(event_id, threading.Lock())
+        
+        with lock:
+            cached = _audit_summary_cache.get(event_id)
+            if cached and time.monotonic() - cached[0] < AUDIT_SUMMARY_CACHE_TTL:
+                return cached[1]
+            
+            built_at = time.monotonic()
+            summary = self._build_event_audit_summary(event_id)
+            # Don't store a result that a concurrent write has already outdated
+            if "error" not in summary and built_at > _audit_summary_invalidated_at.get(event_id, 0.0):
+                _audit_summary_cache[event_id] = (built_at, summary)
+            return summary
+    
+    def _build_event_audit_summary(self, event_id: int) -> Dict:
+        """Run the audit summary queries for an event"""
         
         event = self.db.query(Event).filter_by(id=event_id).first()
         if not event:
@@ -216,13 +304,15 @@ class AuditService:
         ).count()
         
         # Get recent changes
-        recent_logs = self.db.query(AuditLog).filter_by(
+        recent_logs = self.db.query(AuditLog).options(
+            joinedload(AuditLog.user)
+        ).filter_by(
             event_id=event_id
         ).order_by(desc(AuditLog.timestamp)).limit(10).all()
         
         recent_changes = []
         for log in recent_logs:
-            user_obj = self.db.query(User).filter_by(id=log.user_id).first()
+            user_obj = log.user
             recent_changes.append({
                 "timestamp": log.timestamp.isoformat() if log.timestamp else None,
                 "action": log.action_type,
@@ -272,5 +362,6 @@ class AuditService:
         
         self.db.add(audit_log)
         self.db.commit()
+        invalidate_audit_summary(event_id)
         
         return audit_log
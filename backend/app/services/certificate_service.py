@@ -35,7 +35,7 @@ def get_eligible_students(db: Session, event_id: int) -> List[Dict]:
     Returns list of student details with attendance information
     """
     # Get event details to check total_days
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return []
     
@@ -117,7 +117,7 @@ def issue_certificates(
         Dictionary with results including success count, failures, and skipped
     """
     # Get event details
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return {
             "success": False,
@@ -278,7 +278,7 @@ def is_student_eligible_for_certificate(db: Session, event_id: int, student_prn:
         True if student attended all required days, False otherwise
     """
     # Get event details
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return False
     
@@ -306,7 +306,7 @@ def resend_failed_certificate_emails(db: Session, event_id: int) -> Dict:
         Dictionary with results including success count and failures
     """
     # Get event details
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return {
             "success": False,
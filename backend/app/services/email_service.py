@@ -4,7 +4,11 @@ Sends professional emails with QR code tickets to students
 """
 
 import smtplib
+import queue
+import threading
+import time
 import qrcode
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -15,6 +19,118 @@ from typing import Optional
 from app.core.config import settings
 
 
+class SMTPPool:
+    """
+    Bounded pool of persistent SMTP connections shared by all senders.
+    Reusing a logged-in connection skips the TCP + TLS handshake and AUTH
+    round trips for every email after the first one.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_messages_per_connection: int,
+        rate_per_second: float,
+        idle_timeout: float
+    ):
+        self.max_messages_per_connection = max_messages_per_connection
+        self.rate_per_second = rate_per_second
+        self.idle_timeout = idle_timeout
+        self._idle: queue.Queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._rate_lock = threading.Lock()
+        self._next_send_at = 0.0
+
+    def _connect(self) -> dict:
+        """Open and authenticate a new connection - SSL on 465, STARTTLS otherwise"""
+        if settings.SMTP_PORT == 465:
+            server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10)
+        else:
+            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10)
+            server.starttls()
+        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        return {"server": server, "messages_sent": 0, "last_used": time.monotonic()}
+
+    def _checkout(self) -> dict:
+        """Reuse an idle connection unless it sat long enough for the server to drop it"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - conn["last_used"] < self.idle_timeout:
+                return conn
+            self._close(conn)
+
+    @staticmethod
+    def _close(conn: dict):
+        try:
+            conn["server"].quit()
+        except Exception:
+            pass
+
+    def _throttle(self):
+        """Space sends out so the pool as a whole stays under rate_per_second"""
+        if self.rate_per_second <= 0:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_send_at - now
+            self._next_send_at = max(now, self._next_send_at) + 1.0 / self.rate_per_second
+        if wait > 0:
+            time.sleep(wait)
+
+    def send_message(self, msg):
+        self._throttle()
+        with self._slots:
+            conn = self._checkout()
+            reused = conn["messages_sent"] > 0
+            
+            try:
+                try:
+                    conn["server"].send_message(msg)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    # A reused connection may have died since its last send:
+                    # reconnect and retry once. A failure on a freshly opened
+                    # connection is raised as is.
+                    if not reused:
+                        raise
+                    self._close(conn)
+                    conn = self._connect()
+                    conn["server"].send_message(msg)
+            except Exception:
+                self._close(conn)
+                raise
+            
+            conn["messages_sent"] += 1
+            conn["last_used"] = time.monotonic()
+            if conn["messages_sent"] >= self.max_messages_per_connection:
+                self._close(conn)
+            else:
+                self._idle.put(conn)
+
+
+smtp_pool = SMTPPool(
+    size=settings.SMTP_POOL_SIZE,
+    max_messages_per_connection=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+    rate_per_second=settings.SMTP_SEND_RATE_PER_SECOND,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT
+)
+
+# Dedicated threads for SMTP sends. Rate-limit sleeps and network waits
+# happen here rather than on the shared AnyIO threadpool that serves sync
+# routes; extra sends queue for a free thread instead of taking more.
+email_executor = ThreadPoolExecutor(
+    max_workers=settings.SMTP_POOL_SIZE,
+    thread_name_prefix="smtp"
+)
+
+
+def submit_email(send_fn, **kwargs) -> Future:
+    """Queue one of the send_* functions on the email executor"""
+    return email_executor.submit(send_fn, **kwargs)
+
+
 def generate_qr_code_image(data: str) -> bytes:
     """
     Generate QR code image as bytes
@@ -329,18 +445,8 @@ def send_ticket_email(
         qr_image.add_header('Content-Disposition', 'inline', filename='qr_code.png')
         msg.attach(qr_image)
         
-        # Send email with timeout - support both SSL (port 465) and TLS (port 587)
-        if settings.SMTP_PORT == 465:
-            # Use SSL for port 465
-            with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-        else:
-            # Use STARTTLS for port 587
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
+        # Send over a pooled connection (SSL on 465, STARTTLS otherwise)
+        smtp_pool.send_message(msg)
         
         print(f"✅ Ticket email sent successfully to {to_email}")
         return True
@@ -523,18 +629,8 @@ def send_teacher_email(
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
         
-        # Send email with timeout - support both SSL (port 465) and TLS (port 587)
-        if settings.SMTP_PORT == 465:
-            # Use SSL for port 465
-            with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-        else:
-            # Use STARTTLS for port 587
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
+        # Send over a pooled connection (SSL on 465, STARTTLS otherwise)
+        smtp_pool.send_message(msg)
         
         print(f"✅ Teacher attendance report sent successfully to {to_email}")
         return True
@@ -727,18 +823,8 @@ def send_certificate_email(
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
         
-        # Send email with timeout - support both SSL (port 465) and TLS (port 587)
-        if settings.SMTP_PORT == 465:
-            # Use SSL for port 465
-            with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-        else:
-            # Use STARTTLS for port 587
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
+        # Send over a pooled connection (SSL on 465, STARTTLS otherwise)
+        smtp_pool.send_message(msg)
         
         print(f"✅ Certificate email sent successfully to {to_email}")
         return True
@@ -1024,18 +1110,8 @@ def send_feedback_request_email(
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
         
-        # Send email with timeout - support both SSL (port 465) and TLS (port 587)
-        if settings.SMTP_PORT == 465:
-            # Use SSL for port 465
-            with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-        else:
-            # Use STARTTLS for port 587
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
+        # Send over a pooled connection (SSL on 465, STARTTLS otherwise)
+        smtp_pool.send_message(msg)
         
         print(f"✅ Feedback request email sent successfully to {to_email}")
         return True
@@ -6,11 +6,12 @@ Detects suspicious patterns and potential fraud in participation records.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, exists, distinct
 from typing import Dict, List
 from datetime import datetime, timedelta, timezone
 from collections import defaultdict
 
+from app.db.database import minute_bucket
 from app.models.certificate import Certificate
 from app.models.attendance import Attendance
 from app.models.ticket import Ticket
@@ -30,6 +31,13 @@ class FraudType:
     BULK_UPLOAD_ANOMALY = "BULK_UPLOAD_ANOMALY"
 
 
+def _as_minute(value) -> datetime:
+    """minute_bucket() yields text on SQLite and a timestamp on PostgreSQL"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
 class FraudDetectionService:
     """
     Detects fraudulent or suspicious patterns in participation data
@@ -119,11 +127,21 @@ class FraudDetectionService:
             func.count(Certificate.id) > 1
         ).all()
         
+        if not duplicates:
+            return alerts
+        
+        # Evidence for every duplicated student in one query
+        certs_by_prn = defaultdict(list)
+        for prn, cert_id, issued_at in self.db.query(
+            Certificate.student_prn, Certificate.certificate_id, Certificate.issued_at
+        ).filter(
+            Certificate.event_id == event_id,
+            Certificate.student_prn.in_([dup.student_prn for dup in duplicates])
+        ).order_by(Certificate.id):
+            certs_by_prn[prn].append((cert_id, issued_at))
+        
         for dup in duplicates:
-            certs = self.db.query(Certificate).filter_by(
-                event_id=event_id,
-                student_prn=dup.student_prn
-            ).all()
+            certs = certs_by_prn[dup.student_prn]
             
             alerts.append({
                 "type": FraudType.DUPLICATE_CERTIFICATE,
@@ -131,8 +149,8 @@ class FraudDetectionService:
                 "student_prn": dup.student_prn,
                 "description": f"Student has {dup.cert_count} certificates for same event",
                 "evidence": {
-                    "certificate_ids": [c.certificate_id for c in certs],
-                    "issued_dates": [c.issued_at.isoformat() if c.issued_at else None for c in certs]
+                    "certificate_ids": [cert_id for cert_id, _ in certs],
+                    "issued_dates": [issued_at.isoformat() if issued_at else None for _, issued_at in certs]
                 },
                 "recommendation": "Revoke duplicate certificates and investigate"
             })
@@ -143,26 +161,34 @@ class FraudDetectionService:
         """Detect certificates issued without registration or attendance"""
         alerts = []
         
+        # Registration and attendance flags are correlated EXISTS subqueries,
+        # so this is one query however many certificates the event has
+        has_ticket_expr = exists().where(
+            Ticket.event_id == event_id,
+            Ticket.student_prn == Certificate.student_prn
+        )
+        has_attendance_expr = exists().where(
+            Attendance.event_id == event_id,
+            Attendance.student_prn == Certificate.student_prn,
+            Attendance.invalidated == False
+        )
+        
         # Only check student certificates (exclude organizer/scanner/volunteer role-based certificates)
-        certificates = self.db.query(Certificate).filter(
+        certificates = self.db.query(
+            Certificate.student_prn,
+            Certificate.certificate_id,
+            Certificate.issued_at,
+            has_ticket_expr.label('has_ticket'),
+            has_attendance_expr.label('has_attendance')
+        ).filter(
             Certificate.event_id == event_id,
             Certificate.revoked == False,
             Certificate.student_prn.isnot(None)  # Exclude role-based certificates
         ).all()
         
         for cert in certificates:
-            # Check if student has ticket (registration)
-            has_ticket = self.db.query(Ticket).filter_by(
-                event_id=event_id,
-                student_prn=cert.student_prn
-            ).first() is not None
-            
-            # Check if student has attendance
-            has_attendance = self.db.query(Attendance).filter_by(
-                event_id=event_id,
-                student_prn=cert.student_prn,
-                invalidated=False
-            ).first() is not None
+            has_ticket = bool(cert.has_ticket)
+            has_attendance = bool(cert.has_attendance)
             
             if not has_ticket and not has_attendance:
                 alerts.append({
@@ -198,37 +224,49 @@ class FraudDetectionService:
         """Detect multiple scans in very short time (potential device cloning)"""
         alerts = []
         
-        # Get all attendance records ordered by time
-        attendance_records = self.db.query(Attendance).filter_by(
-            event_id=event_id,
-            invalidated=False
-        ).order_by(Attendance.scanned_at).all()
-        
-        # Group by minute
-        scans_by_minute = defaultdict(list)
-        for att in attendance_records:
-            if att.scanned_at:
-                minute_key = att.scanned_at.replace(second=0, microsecond=0)
-                scans_by_minute[minute_key].append(att)
-        
-        # Detect suspicious patterns
-        for minute, scans in scans_by_minute.items():
-            if len(scans) > 10:  # More than 10 scans in same minute
-                unique_students = len(set(s.student_prn for s in scans))
-                if unique_students < len(scans) * 0.8:  # Duplicate scans
-                    alerts.append({
-                        "type": FraudType.MULTIPLE_SCANS_SAME_MINUTE,
-                        "severity": "MEDIUM",
-                        "student_prn": "MULTIPLE",
-                        "description": f"{len(scans)} scans in 1 minute with only {unique_students} unique students",
-                        "evidence": {
-                            "timestamp": minute.isoformat(),
-                            "total_scans": len(scans),
-                            "unique_students": unique_students,
-                            "scan_sources": list(set(s.scan_source for s in scans))
-                        },
-                        "recommendation": "Review scanner behavior and device fingerprints"
-                    })
+        # Count scans per minute in the database; only busy minutes come back
+        minute = minute_bucket(self.db, Attendance.scanned_at).label('minute')
+        busy_minutes = self.db.query(
+            minute,
+            func.count(Attendance.id).label('total_scans'),
+            func.count(distinct(Attendance.student_prn)).label('unique_students')
+        ).filter(
+            Attendance.event_id == event_id,
+            Attendance.invalidated == False,
+            Attendance.scanned_at.isnot(None)
+        ).group_by(minute).having(
+            func.count(Attendance.id) > 10  # More than 10 scans in same minute
+        ).order_by(minute).all()
+        
+        suspicious = [
+            row for row in busy_minutes
+            if row.unique_students < row.total_scans * 0.8  # Duplicate scans
+        ]
+        if not suspicious:
+            return alerts
+        
+        sources_by_minute = defaultdict(set)
+        for bucket, scan_source in self.db.query(minute, Attendance.scan_source).filter(
+            Attendance.event_id == event_id,
+            Attendance.invalidated == False,
+            minute.in_([row.minute for row in suspicious])
+        ).distinct():
+            sources_by_minute[bucket].add(scan_source)
+        
+        for row in suspicious:
+            alerts.append({
+                "type": FraudType.MULTIPLE_SCANS_SAME_MINUTE,
+                "severity": "MEDIUM",
+                "student_prn": "MULTIPLE",
+                "description": f"{row.total_scans} scans in 1 minute with only {row.unique_students} unique students",
+                "evidence": {
+                    "timestamp": _as_minute(row.minute).isoformat(),
+                    "total_scans": row.total_scans,
+                    "unique_students": row.unique_students,
+                    "scan_sources": list(sources_by_minute[row.minute])
+                },
+                "recommendation": "Review scanner behavior and device fingerprints"
+            })
         
         return alerts
     
@@ -240,10 +278,12 @@ class FraudDetectionService:
         if not event or not event.start_time:
             return alerts
         
+        # issued_at is a naive UTC column
+        event_start = event.start_time.replace(tzinfo=None)
         premature_certs = self.db.query(Certificate).filter(
             and_(
                 Certificate.event_id == event_id,
-                Certificate.issued_at < event.start_time,
+                Certificate.issued_at < event_start,
                 Certificate.revoked == False
             )
         ).all()
@@ -258,7 +298,7 @@ class FraudDetectionService:
                     "certificate_id": cert.certificate_id,
                     "issued_at": cert.issued_at.isoformat() if cert.issued_at else None,
                     "event_start": event.start_time.isoformat() if event.start_time else None,
-                    "days_before": (event.start_time - cert.issued_at).days if cert.issued_at else None
+                    "days_before": (event_start - cert.issued_at).days if cert.issued_at else None
                 },
                 "recommendation": "Revoke certificate and investigate issuance process"
             })
@@ -270,24 +310,37 @@ class FraudDetectionService:
         alerts = []
         
         # Check audit logs for verification attempts on revoked certificates
-        revoked_certs = self.db.query(Certificate).filter_by(
+        revoked_certs = self.db.query(
+            Certificate.id, Certificate.certificate_id, Certificate.student_prn, Certificate.revoked_at
+        ).filter_by(
             event_id=event_id,
             revoked=True
         ).all()
         
+        if not revoked_certs:
+            return alerts
+        
+        # Verification attempts after each certificate's revocation, in one join
+        logs_by_cert = defaultdict(list)
+        for cert_pk, details, timestamp in self.db.query(
+            Certificate.id, AuditLog.details, AuditLog.timestamp
+        ).join(
+            AuditLog,
+            and_(
+                AuditLog.event_id == Certificate.event_id,
+                AuditLog.action_type == 'certificate_verified',
+                AuditLog.timestamp > Certificate.revoked_at
+            )
+        ).filter(
+            Certificate.event_id == event_id,
+            Certificate.revoked == True
+        ).order_by(AuditLog.timestamp, AuditLog.id):
+            logs_by_cert[cert_pk].append((details, timestamp))
+        
         for cert in revoked_certs:
-            # Check if there are verification attempts after revocation
-            verification_logs = self.db.query(AuditLog).filter(
-                and_(
-                    AuditLog.event_id == event_id,
-                    AuditLog.action_type == 'certificate_verified',
-                    AuditLog.timestamp > cert.revoked_at
-                )
-            ).all()
-            
             relevant_logs = [
-                log for log in verification_logs 
-                if log.details and log.details.get('certificate_id') == cert.certificate_id
+                timestamp for details, timestamp in logs_by_cert[cert.id]
+                if details and details.get('certificate_id') == cert.certificate_id
             ]
             
             if relevant_logs:
@@ -300,7 +353,7 @@ class FraudDetectionService:
                         "certificate_id": cert.certificate_id,
                         "revoked_at": cert.revoked_at.isoformat() if cert.revoked_at else None,
                         "verification_attempts": len(relevant_logs),
-                        "last_attempt": relevant_logs[-1].timestamp.isoformat() if relevant_logs else None
+                        "last_attempt": relevant_logs[-1].isoformat() if relevant_logs else None
                     },
                     "recommendation": "Alert relevant authorities about potential fraud"
                 })
@@ -320,21 +373,22 @@ class FraudDetectionService:
                 Attendance.event_id == event_id,
                 Attendance.scan_source == 'admin_override'
             )
-        ).group_by(Attendance.scanner_id).all()
+        ).group_by(Attendance.scanner_id).having(
+            func.count(Attendance.id) > 20  # Threshold: 20+ overrides
+        ).all()
         
         for override in overrides:
-            if override.override_count > 20:  # Threshold: 20+ overrides
-                alerts.append({
-                    "type": FraudType.MANUAL_OVERRIDE_ABUSE,
-                    "severity": "MEDIUM",
-                    "student_prn": "N/A",
-                    "description": f"Scanner {override.scanner_id} used {override.override_count} manual overrides",
-                    "evidence": {
-                        "scanner_id": override.scanner_id,
-                        "override_count": override.override_count
-                    },
-                    "recommendation": "Review scanner permissions and override justifications"
-                })
+            alerts.append({
+                "type": FraudType.MANUAL_OVERRIDE_ABUSE,
+                "severity": "MEDIUM",
+                "student_prn": "N/A",
+                "description": f"Scanner {override.scanner_id} used {override.override_count} manual overrides",
+                "evidence": {
+                    "scanner_id": override.scanner_id,
+                    "override_count": override.override_count
+                },
+                "recommendation": "Review scanner permissions and override justifications"
+            })
         
         return alerts
     
@@ -342,34 +396,43 @@ class FraudDetectionService:
         """Detect suspicious bulk upload patterns"""
         alerts = []
         
-        # Find bulk uploads with unusual timing
-        bulk_uploads = self.db.query(Attendance).filter(
-            and_(
-                Attendance.event_id == event_id,
-                Attendance.scan_source == 'bulk_upload'
-            )
-        ).all()
+        # Find bulk uploads with unusual timing, bucketed per minute in the database
+        minute = minute_bucket(self.db, Attendance.scanned_at).label('minute')
+        busy_minutes = self.db.query(
+            minute,
+            func.count(Attendance.id).label('record_count')
+        ).filter(
+            Attendance.event_id == event_id,
+            Attendance.scan_source == 'bulk_upload',
+            Attendance.scanned_at.isnot(None)
+        ).group_by(minute).having(
+            func.count(Attendance.id) > 100  # More than 100 records in 1 minute
+        ).order_by(minute).all()
+        
+        if not busy_minutes:
+            return alerts
         
-        # Group by minute
-        uploads_by_minute = defaultdict(list)
-        for att in bulk_uploads:
-            if att.scanned_at:
-                minute_key = att.scanned_at.replace(second=0, microsecond=0)
-                uploads_by_minute[minute_key].append(att)
+        scanners_by_minute = defaultdict(set)
+        for bucket, scanner_id in self.db.query(minute, Attendance.scanner_id).filter(
+            Attendance.event_id == event_id,
+            Attendance.scan_source == 'bulk_upload',
+            Attendance.scanner_id.isnot(None),
+            minute.in_([row.minute for row in busy_minutes])
+        ).distinct():
+            scanners_by_minute[bucket].add(scanner_id)
         
-        for minute, uploads in uploads_by_minute.items():
-            if len(uploads) > 100:  # More than 100 records in 1 minute
-                alerts.append({
-                    "type": FraudType.BULK_UPLOAD_ANOMALY,
-                    "severity": "LOW",
-                    "student_prn": "N/A",
-                    "description": f"Bulk upload of {len(uploads)} records in 1 minute",
-                    "evidence": {
-                        "timestamp": minute.isoformat(),
-                        "record_count": len(uploads),
-                        "scanner_ids": list(set(u.scanner_id for u in uploads if u.scanner_id))
-                    },
-                    "recommendation": "Verify bulk upload source and data integrity"
-                })
+        for row in busy_minutes:
+            alerts.append({
+                "type": FraudType.BULK_UPLOAD_ANOMALY,
+                "severity": "LOW",
+                "student_prn": "N/A",
+                "description": f"Bulk upload of {row.record_count} records in 1 minute",
+                "evidence": {
+                    "timestamp": _as_minute(row.minute).isoformat(),
+                    "record_count": row.record_count,
+                    "scanner_ids": list(scanners_by_minute[row.minute])
+                },
+                "recommendation": "Verify bulk upload source and data integrity"
+            })
         
         return alerts
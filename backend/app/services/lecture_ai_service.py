@@ -5,12 +5,15 @@ Powered by Google Gemini AI
 """
 
 import os
-import json
+import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import func, case, and_
+from sqlalchemy.orm import Session, joinedload
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
+from app.db.database import SessionLocal, json_array_length
 from app.models.lecture_report import LectureReport
 from app.models.event import Event
 from app.models.user import User
@@ -20,8 +23,18 @@ from app.services.gemini_service import GeminiService
 # Configuration
 AUDIO_STORAGE_DIR = "backend/storage/audio"
 ALLOWED_AUDIO_FORMATS = {".mp3", ".wav", ".m4a"}
+# Browsers disagree on audio MIME types; octet-stream is let through and
+# left to the extension check since some mobile clients send nothing better
+ALLOWED_AUDIO_CONTENT_TYPES = frozenset({
+    "audio/mpeg", "audio/mp3",
+    "audio/wav", "audio/x-wav", "audio/wave",
+    "audio/mp4", "audio/x-m4a", "audio/m4a",
+    "application/octet-stream",
+})
 MAX_FILE_SIZE_MB = 100
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Stream uploads to disk 1MB at a time
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # Allowance for form boundaries/headers in Content-Length
 
 
 class LectureAIService:
@@ -41,42 +54,88 @@ class LectureAIService:
         """Create audio storage directory if it doesn't exist"""
         os.makedirs(AUDIO_STORAGE_DIR, exist_ok=True)
     
-    async def validate_audio_file(self, file: UploadFile) -> Tuple[bool, str]:
+    def validate_audio_format(self, filename: str) -> Tuple[bool, str]:
         """
-        Validate audio file format and size
+        Validate audio file format by extension
         Returns: (is_valid, error_message)
         """
-        # Check file extension
-        file_ext = os.path.splitext(file.filename)[1].lower()
+        file_ext = os.path.splitext(filename or "")[1].lower()
         if file_ext not in ALLOWED_AUDIO_FORMATS:
             return False, f"Invalid file format. Allowed: {', '.join(ALLOWED_AUDIO_FORMATS)}"
-        
-        # Check file size
-        file.file.seek(0, 2)  # Seek to end
-        file_size = file.file.tell()
-        file.file.seek(0)  # Reset to beginning
-        
-        if file_size > MAX_FILE_SIZE_BYTES:
-            return False, f"File size exceeds {MAX_FILE_SIZE_MB}MB limit"
-        
         return True, ""
     
+    @staticmethod
+    def _copy_upload(source, file_path: str) -> int:
+        """
+        Copy an upload stream to disk in fixed-size chunks
+        Aborts as soon as the size limit is crossed instead of writing the whole file
+        Returns: bytes written
+        """
+        written = 0
+        with open(file_path, "wb") as dest:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > MAX_FILE_SIZE_BYTES:
+                    raise ValueError(f"File size exceeds {MAX_FILE_SIZE_MB}MB limit")
+                dest.write(chunk)
+        return written
+    
+    @staticmethod
+    def validate_upload_headers(content_length: Optional[str], content_type: Optional[str]):
+        """
+        Cheap pre-checks on request headers before any bytes are copied
+        Raises 413 for oversized bodies and 415 for non-audio content types
+        """
+        if content_length and content_length.isdigit():
+            if int(content_length) > MAX_FILE_SIZE_BYTES + MULTIPART_OVERHEAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File size exceeds {MAX_FILE_SIZE_MB}MB limit"
+                )
+        
+        if content_type and content_type.split(";")[0].strip().lower() not in ALLOWED_AUDIO_CONTENT_TYPES:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Unsupported content type '{content_type}'. Upload an mp3, wav or m4a file"
+            )
+    
     async def save_audio_file(self, file: UploadFile, event_id: int) -> str:
         """
-        Save uploaded audio file to storage
-        Returns: saved filename
+        Validate and stream uploaded audio file to storage
+        Memory use stays at one chunk per upload regardless of file size
+        Returns: saved file path
         """
+        is_valid, error_msg = self.validate_audio_format(file.filename)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_msg)
+        
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         file_ext = os.path.splitext(file.filename)[1].lower()
         saved_filename = f"event_{event_id}_{timestamp}{file_ext}"
         file_path = os.path.join(AUDIO_STORAGE_DIR, saved_filename)
         
-        # Save file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        try:
+            await run_in_threadpool(self._copy_upload, file.file, file_path)
+        except ValueError as e:
+            self.discard_audio_file(file_path)
+            raise HTTPException(status_code=413, detail=str(e))
+        except BaseException:
+            # Disk errors, or the request being cancelled mid-copy
+            self.discard_audio_file(file_path)
+            raise
         
-        return saved_filename
+        return file_path
+    
+    @staticmethod
+    def discard_audio_file(file_path: str):
+        """Delete a saved or partially written upload, if it exists"""
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
     
     async def transcribe_audio(self, audio_path: str) -> str:
         """
@@ -170,50 +229,47 @@ class LectureAIService:
             ]
         }
     
-    async def process_lecture_audio(
+    def create_pending_report(
         self,
-        file: UploadFile,
+        audio_path: str,
         event_id: int,
         user_id: int
     ) -> LectureReport:
         """
-        Main processing pipeline for lecture audio analysis
-        
-        Steps:
-        1. Validate and save audio file
-        2. Transcribe audio to text
-        3. Extract keywords
-        4. Generate structured summary
-        5. Save to database
+        Add the report record in "processing" state for a saved audio file
+        The AI pipeline fills it in later via process_lecture_audio
+        Only flushed: the caller commits it, or rolls it back on failure
         """
         # Validate event exists
-        event = self.db.query(Event).filter(Event.id == event_id).first()
+        event = self.db.get(Event, event_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
         
-        # Validate file
-        is_valid, error_msg = await self.validate_audio_file(file)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Create initial report record
         report = LectureReport(
             event_id=event_id,
-            audio_filename=file.filename,
+            audio_filename=os.path.basename(audio_path),
             generated_by=user_id,
             status="processing"
         )
         self.db.add(report)
-        self.db.commit()
-        self.db.refresh(report)
+        self.db.flush()
+        return report
+    
+    async def process_lecture_audio(self, report_id: int, audio_path: str) -> LectureReport:
+        """
+        Main processing pipeline for lecture audio analysis
+        
+        Steps:
+        1. Transcribe saved audio to text
+        2. Extract keywords
+        3. Generate structured summary
+        4. Save to database
+        """
+        report = self.db.get(LectureReport, report_id)
+        event = self.db.get(Event, report.event_id)
         
         try:
-            # Save audio file
-            saved_filename = await self.save_audio_file(file, event_id)
-            report.audio_filename = saved_filename
-            
             # Step 1: Transcribe audio
-            audio_path = os.path.join(AUDIO_STORAGE_DIR, saved_filename)
             transcript = await self.transcribe_audio(audio_path)
             report.transcript = transcript
             
@@ -228,7 +284,7 @@ class LectureAIService:
                 keywords=keywords,
                 transcript=transcript
             )
-            report.summary = json.dumps(summary_dict, indent=2)
+            report.summary = summary_dict
             
             # Mark as completed
             report.status = "completed"
@@ -246,12 +302,52 @@ class LectureAIService:
     
     def get_lecture_report(self, event_id: int) -> Optional[LectureReport]:
         """Retrieve lecture report for an event"""
-        return self.db.query(LectureReport).filter(
+        return self.db.query(LectureReport).options(
+            joinedload(LectureReport.creator)
+        ).filter(
             LectureReport.event_id == event_id
         ).order_by(LectureReport.generated_at.desc()).first()
     
-    def get_all_reports(self, limit: int = 50) -> List[LectureReport]:
-        """Get all lecture reports (admin view)"""
-        return self.db.query(LectureReport).order_by(
+    def get_all_reports(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        created_by: Optional[int] = None
+    ) -> List[Tuple]:
+        """
+        Get lecture report list rows (admin view, or one organizer's events)
+        Selects only the listing columns so transcripts are never loaded
+        """
+        query = self.db.query(
+            LectureReport.id,
+            LectureReport.event_id,
+            Event.title.label("event_title"),
+            LectureReport.status,
+            LectureReport.generated_at,
+            func.coalesce(json_array_length(self.db, LectureReport.keywords), 0).label("keywords_count"),
+            case(
+                (and_(LectureReport.transcript.isnot(None), LectureReport.transcript != ""), True),
+                else_=False
+            ).label("has_transcript")
+        ).join(Event, LectureReport.event_id == Event.id)
+        
+        if created_by is not None:
+            query = query.filter(Event.created_by == created_by)
+        
+        return query.order_by(
             LectureReport.generated_at.desc()
-        ).limit(limit).all()
+        ).offset(offset).limit(limit).all()
+
+
+def run_lecture_pipeline(report_id: int, audio_path: str):
+    """
+    Background task entry point for the AI pipeline
+    Runs on the threadpool with its own session, so the blocking Gemini calls
+    never hold up the event loop or the request's database session
+    """
+    db = SessionLocal()
+    try:
+        service = LectureAIService(db)
+        asyncio.run(service.process_lecture_audio(report_id, audio_path))
+    finally:
+        db.close()
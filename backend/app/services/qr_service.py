@@ -8,10 +8,15 @@ Part of PS1 Feature 3: Verifiable Certificate & Transcript System
 import qrcode
 import io
 import base64
+from functools import lru_cache
 from PIL import Image
 from typing import Optional
 import os
 
+# QR images are deterministic in (id, base_url, size); keep the encoded PNG
+# bytes so repeat requests skip the qrcode matrix + PIL resize + PNG encode
+QR_CACHE_SIZE = 4096
+
 
 def generate_qr_code(data: str) -> str:
     """Legacy function - generates base64 encoded QR code"""
@@ -49,6 +54,18 @@ def generate_certificate_qr_code(
     if not base_url:
         base_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
     
+    png_bytes = _certificate_qr_png(certificate_id, base_url, size)
+    
+    if return_base64:
+        return base64.b64encode(png_bytes).decode()
+    
+    # Fresh buffer per call so each caller gets its own stream position
+    return io.BytesIO(png_bytes)
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def _certificate_qr_png(certificate_id: str, base_url: str, size: int) -> bytes:
+    """Encode the certificate verification QR code as PNG bytes"""
     # Construct verification URL
     verification_url = f"{base_url}/verify?cert={certificate_id}"
     
@@ -72,12 +89,7 @@ def generate_certificate_qr_code(
     # Save to buffer
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
-    buffer.seek(0)
-    
-    if return_base64:
-        return base64.b64encode(buffer.getvalue()).decode()
-    
-    return buffer
+    return buffer.getvalue()
 
 
 def generate_transcript_qr_code(
@@ -101,6 +113,17 @@ def generate_transcript_qr_code(
     if not base_url:
         base_url = os.getenv("API_BASE_URL", "http://localhost:8000")
     
+    png_bytes = _transcript_qr_png(student_prn, base_url, size)
+    
+    if return_base64:
+        return base64.b64encode(png_bytes).decode()
+    
+    return io.BytesIO(png_bytes)
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def _transcript_qr_png(student_prn: str, base_url: str, size: int) -> bytes:
+    """Encode the transcript QR code as PNG bytes"""
     # Construct transcript URL
     transcript_url = f"{base_url}/ps1/transcript/{student_prn}"
     
@@ -120,12 +143,38 @@ def generate_transcript_qr_code(
     
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
-    buffer.seek(0)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def ticket_qr_png(token: str) -> bytes:
+    """Encode a ticket token as a QR code PNG (tokens never change per ticket)"""
+    qr = qrcode.QRCode()
+    qr.add_data(token)
+    qr.make(fit=True)
     
-    if return_base64:
-        return base64.b64encode(buffer.getvalue()).decode()
+    # Scale the module matrix (border included) up in one resize instead of
+    # drawing every module as its own rectangle; same pixels as qrcode.make()
+    matrix = qr.get_matrix()
+    modules = len(matrix)
+    img = Image.frombytes(
+        "L", (modules, modules),
+        bytes(0 if dark else 255 for row in matrix for dark in row)
+    ).convert("1")
+    img = img.resize((modules * qr.box_size, modules * qr.box_size), Image.Resampling.NEAREST)
     
-    return buffer
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def qr_cache_info() -> dict:
+    """Hit/miss counters for the in-process QR caches"""
+    return {
+        "certificate": _certificate_qr_png.cache_info()._asdict(),
+        "transcript": _transcript_qr_png.cache_info()._asdict(),
+        "ticket": ticket_qr_png.cache_info()._asdict(),
+    }
 
 
 def embed_qr_in_certificate_pdf(
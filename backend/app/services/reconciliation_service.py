@@ -7,7 +7,7 @@ and produces one authoritative participation status.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, exists, and_, or_, case
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -263,35 +263,126 @@ class ReconciliationService:
         """
         Get all conflicts for an entire event
         """
-        # Get all students who have any participation record for this event
-        tickets = self.db.query(Ticket.student_prn).filter_by(event_id=event_id).all()
-        # Exclude invalidated attendance
-        attendances = self.db.query(Attendance.student_prn).filter_by(
-            event_id=event_id,
-            invalidated=False
-        ).distinct().all()
-        certificates = self.db.query(Certificate.student_prn).filter_by(event_id=event_id).all()
+        # Let the database narrow the event down to students whose records
+        # can produce a conflict, instead of evaluating every participant
+        candidates = self._conflict_candidates(event_id)
+        if not candidates:
+            return []
+        
+        event = self.db.query(Event).filter_by(id=event_id).first()
         
-        # Combine all student PRNs (filter out None values for non-student certificates)
-        all_prns = set()
-        all_prns.update([t.student_prn for t in tickets if t.student_prn])
-        all_prns.update([a.student_prn for a in attendances if a.student_prn])
-        all_prns.update([c.student_prn for c in certificates if c.student_prn])
+        # Load the candidates' records in one query per table
+        ticket_by_prn = {}
+        for ticket in self.db.query(Ticket).filter(
+            Ticket.event_id == event_id,
+            Ticket.student_prn.in_(candidates)
+        ).order_by(Ticket.id):
+            ticket_by_prn.setdefault(ticket.student_prn, ticket)
         
-        # Get conflicts for each student
+        attendance_by_prn = {}
+        for att in self.db.query(Attendance).filter(
+            Attendance.event_id == event_id,
+            Attendance.student_prn.in_(candidates),
+            Attendance.invalidated == False
+        ):
+            attendance_by_prn.setdefault(att.student_prn, []).append(att)
+        
+        certificate_by_prn = {}
+        for cert in self.db.query(Certificate).filter(
+            Certificate.event_id == event_id,
+            Certificate.student_prn.in_(candidates)
+        ).order_by(Certificate.id):
+            certificate_by_prn.setdefault(cert.student_prn, cert)
+        
+        # Get conflicts for each candidate student
         event_conflicts = []
-        for prn in all_prns:
-            status_data = self.get_canonical_status(event_id, prn)
-            if status_data["conflicts"]:
+        for prn in sorted(candidates):
+            ticket = ticket_by_prn.get(prn)
+            attendance = attendance_by_prn.get(prn, [])
+            certificate = certificate_by_prn.get(prn)
+            
+            conflicts = self._detect_conflicts(
+                event_id, prn, ticket, attendance, certificate
+            )
+            if conflicts:
                 event_conflicts.append({
                     "student_prn": prn,
-                    "canonical_status": status_data["canonical_status"],
-                    "conflicts": status_data["conflicts"],
-                    "trust_score": status_data["trust_score"]
+                    "canonical_status": self._compute_status(
+                        ticket, attendance, certificate, event
+                    ),
+                    "conflicts": conflicts,
+                    "trust_score": self._compute_trust_score(
+                        ticket, attendance, certificate, conflicts
+                    )
                 })
         
         return event_conflicts
     
+    def _conflict_candidates(self, event_id: int) -> set:
+        """
+        PRNs in an event that match at least one conflict rule, computed in SQL
+        Served by the (event_id, student_prn) indexes on each table
+        """
+        valid_attendance = and_(
+            Attendance.event_id == event_id,
+            Attendance.invalidated == False
+        )
+        active_certificate = or_(
+            Certificate.revoked == False,
+            Certificate.revoked.is_(None)
+        )
+        
+        certificates = self.db.query(Certificate.student_prn).filter(
+            Certificate.event_id == event_id,
+            Certificate.student_prn.isnot(None),
+            active_certificate
+        )
+        
+        # Certificate without attendance
+        cert_no_attendance = certificates.filter(~exists().where(
+            valid_attendance,
+            Attendance.student_prn == Certificate.student_prn
+        ))
+        
+        # Certificate without registration
+        cert_no_registration = certificates.filter(~exists().where(
+            Ticket.event_id == event_id,
+            Ticket.student_prn == Certificate.student_prn
+        ))
+        
+        # Attendance without registration
+        attendance_no_registration = self.db.query(Attendance.student_prn).filter(
+            valid_attendance,
+            ~exists().where(
+                Ticket.event_id == event_id,
+                Ticket.student_prn == Attendance.student_prn
+            )
+        )
+        
+        # Multiple scans on the same day
+        multiple_scans = self.db.query(Attendance.student_prn).filter(
+            valid_attendance
+        ).group_by(
+            Attendance.student_prn,
+            func.coalesce(Attendance.day_number, 1)
+        ).having(func.count(Attendance.id) > 1)
+        
+        # Both QR scan and admin override recorded
+        mixed_sources = self.db.query(Attendance.student_prn).filter(
+            valid_attendance
+        ).group_by(Attendance.student_prn).having(and_(
+            func.sum(case((Attendance.scan_source == "qr_scan", 1), else_=0)) > 0,
+            func.sum(case((Attendance.scan_source == "admin_override", 1), else_=0)) > 0
+        ))
+        
+        rows = cert_no_attendance.union(
+            cert_no_registration,
+            attendance_no_registration,
+            multiple_scans,
+            mixed_sources
+        ).all()
+        return {prn for (prn,) in rows if prn}
+    
     def resolve_conflict(
         self,
         event_id: int,
@@ -64,7 +64,7 @@ def generate_event_report_pdf(db: Session, event_id: int) -> BytesIO:
     Returns BytesIO buffer containing the PDF
     """
     # Get event details
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         raise ValueError(f"Event with ID {event_id} not found")
     
@@ -3,19 +3,24 @@ Role-Based Certificate Service Functions
 Handles certificate issuance for different roles: Attendee, Organizer, Scanner, Volunteer
 """
 
-from typing import Dict, List
+import logging
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
+from app.db.database import SessionLocal
 from app.models.certificate import Certificate
 from app.models.attendance import Attendance
 from app.models.volunteer import Volunteer
 from app.models.student import Student
 from app.models.event import Event
 from app.models.user import User
+from app.services.audit_service import create_audit_log
 from app.services.certificate_service import generate_certificate_id
 from app.services.email_service import send_certificate_email
 
+logger = logging.getLogger(__name__)
+
 
 def issue_attendee_certificates(db: Session, event_id: int) -> Dict:
     """
@@ -25,7 +30,7 @@ def issue_attendee_certificates(db: Session, event_id: int) -> Dict:
     from app.services.certificate_service import get_students_without_certificates
     
     # Get event
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return {"success": False, "error": "Event not found"}
     
@@ -87,8 +92,8 @@ def issue_attendee_certificates(db: Session, event_id: int) -> Dict:
                 else:
                     failed += 1
         
-        except Exception as e:
-            print(f"Error issuing attendee certificate: {e}")
+        except Exception:
+            logger.exception("Error issuing attendee certificate to %s for event %s", student.prn, event_id)
             failed += 1
     
     db.commit()
@@ -106,12 +111,12 @@ def issue_organizer_certificates(db: Session, event_id: int) -> Dict:
     Issue certificates to event organizers
     Includes event creator and any assigned organizers
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return {"success": False, "error": "Event not found"}
     
     # Get event creator
-    creator = db.query(User).filter(User.id == event.created_by).first()
+    creator = db.get(User, event.created_by) if event.created_by else None
     if not creator:
         return {
             "success": True,
@@ -180,8 +185,8 @@ def issue_organizer_certificates(db: Session, event_id: int) -> Dict:
         else:
             failed += 1
     
-    except Exception as e:
-        print(f"Error issuing organizer certificate: {e}")
+    except Exception:
+        logger.exception("Error issuing organizer certificate for event %s", event_id)
         failed += 1
     
     db.commit()
@@ -198,7 +203,7 @@ def issue_scanner_certificates(db: Session, event_id: int) -> Dict:
     """
     Issue certificates to users who scanned attendees for this event
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return {"success": False, "error": "Event not found"}
     
@@ -223,64 +228,67 @@ def issue_scanner_certificates(db: Session, event_id: int) -> Dict:
     emailed = 0
     failed = 0
     
-    for scanner_id in scanner_ids:
-        # Get scanner user
-        scanner = db.query(User).filter(User.id == scanner_id).first()
-        if not scanner:
-            continue
-        
-        # Check if certificate already exists
-        existing = db.query(Certificate).filter(
-            Certificate.event_id == event_id,
-            Certificate.role_type == 'scanner',
-            Certificate.recipient_email == scanner.email
-        ).first()
-        
-        if existing:
-            continue
-        
-        try:
-            cert_id = generate_certificate_id()
+    # The per-scanner lookups must not autoflush the certificates added so
+    # far; each one is flushed explicitly right after it is added
+    with db.no_autoflush:
+        for scanner_id in scanner_ids:
+            # Get scanner user
+            scanner = db.get(User, scanner_id)
+            if not scanner:
+                continue
             
-            # Create scanner certificate
-            cert = Certificate(
-                event_id=event_id,
-                student_prn=None,  # Scanners may not be students
-                certificate_id=cert_id,
-                role_type='scanner',
-                recipient_name=scanner.full_name or scanner.email,
-                recipient_email=scanner.email,
-                issued_at=datetime.now(timezone.utc)
-            )
+            # Check if certificate already exists
+            existing = db.query(Certificate).filter(
+                Certificate.event_id == event_id,
+                Certificate.role_type == 'scanner',
+                Certificate.recipient_email == scanner.email
+            ).first()
             
-            cert.verification_hash = cert.generate_verification_hash()
-            
-            db.add(cert)
-            db.flush()
-            issued += 1
+            if existing:
+                continue
             
-            # Send email
-            event_date = event.start_time.strftime('%B %d, %Y') if event.start_time else 'TBD'
-            success = send_certificate_email(
-                to_email=scanner.email,
-                student_name=scanner.full_name or scanner.email,
-                event_title=event.title,
-                event_location=event.location or 'TBD',
-                event_date=event_date,
-                certificate_id=cert_id,
-                role_type='scanner'
-            )
+            try:
+                cert_id = generate_certificate_id()
+                
+                # Create scanner certificate
+                cert = Certificate(
+                    event_id=event_id,
+                    student_prn=None,  # Scanners may not be students
+                    certificate_id=cert_id,
+                    role_type='scanner',
+                    recipient_name=scanner.full_name or scanner.email,
+                    recipient_email=scanner.email,
+                    issued_at=datetime.now(timezone.utc)
+                )
+                
+                cert.verification_hash = cert.generate_verification_hash()
+                
+                db.add(cert)
+                db.flush()
+                issued += 1
+                
+                # Send email
+                event_date = event.start_time.strftime('%B %d, %Y') if event.start_time else 'TBD'
+                success = send_certificate_email(
+                    to_email=scanner.email,
+                    student_name=scanner.full_name or scanner.email,
+                    event_title=event.title,
+                    event_location=event.location or 'TBD',
+                    event_date=event_date,
+                    certificate_id=cert_id,
+                    role_type='scanner'
+                )
+                
+                if success:
+                    cert.email_sent = True
+                    cert.email_sent_at = datetime.now(timezone.utc)
+                    emailed += 1
+                else:
+                    failed += 1
             
-            if success:
-                cert.email_sent = True
-                cert.email_sent_at = datetime.now(timezone.utc)
-                emailed += 1
-            else:
+            except Exception:
+                logger.exception("Error issuing scanner certificate to user %s for event %s", scanner_id, event_id)
                 failed += 1
-        
-        except Exception as e:
-            print(f"Error issuing scanner certificate: {e}")
-            failed += 1
     
     db.commit()
     
@@ -296,7 +304,7 @@ def issue_volunteer_certificates(db: Session, event_id: int) -> Dict:
     """
     Issue certificates to volunteers who haven't received one yet
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.get(Event, event_id)
     if not event:
         return {"success": False, "error": "Event not found"}
     
@@ -361,8 +369,8 @@ def issue_volunteer_certificates(db: Session, event_id: int) -> Dict:
             else:
                 failed += 1
         
-        except Exception as e:
-            print(f"Error issuing volunteer certificate: {e}")
+        except Exception:
+            logger.exception("Error issuing volunteer certificate to %s for event %s", volunteer.email, event_id)
             failed += 1
     
     db.commit()
@@ -373,3 +381,59 @@ def issue_volunteer_certificates(db: Session, event_id: int) -> Dict:
         "emailed": emailed,
         "failed": failed
     }
+
+
+def resend_volunteer_certificate_email(
+    volunteer_id: int,
+    certificate_id: str,
+    to_email: str,
+    volunteer_name: str,
+    event_id: int,
+    event_title: str,
+    event_location: str,
+    event_date: str,
+    user_id: Optional[int] = None,
+    ip_address: Optional[str] = None
+) -> bool:
+    """
+    Email an existing volunteer certificate again, mark it sent and audit it
+    For BackgroundTasks: runs after the response, with its own session
+    Nothing is written if the email could not be sent
+    """
+    success = send_certificate_email(
+        to_email=to_email,
+        student_name=volunteer_name,
+        event_title=event_title,
+        event_location=event_location,
+        event_date=event_date,
+        certificate_id=certificate_id,
+        role_type='volunteer'
+    )
+    if not success:
+        return False
+    
+    sent_at = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        db.query(Volunteer).filter(Volunteer.id == volunteer_id).update(
+            {"certificate_sent": True, "certificate_sent_at": sent_at},
+            synchronize_session=False
+        )
+        db.query(Certificate).filter(Certificate.certificate_id == certificate_id).update(
+            {"email_sent": True, "email_sent_at": sent_at},
+            synchronize_session=False
+        )
+        # Commits the sent flags together with the audit entry
+        create_audit_log(
+            db=db,
+            event_id=event_id,
+            user_id=user_id,
+            action_type="volunteer_certificate_resent",
+            details={
+                "volunteer_id": volunteer_id,
+                "volunteer_name": volunteer_name,
+                "volunteer_email": to_email,
+                "certificate_id": certificate_id
+            },
+            ip_address=ip_address
+        )
+    return True
@@ -3,7 +3,7 @@ Student Snapshot Service
 Manages creation and retrieval of historical student snapshots
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer, load_only, undefer
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -117,8 +117,11 @@ class SnapshotService:
         student_prn: str, 
         event_id: int
     ) -> Optional[StudentSnapshot]:
-        """Get snapshot for student at specific event"""
-        return self.db.query(StudentSnapshot).filter(
+        """Get snapshot for student at specific event (profile_data as raw JSON text)"""
+        return self.db.query(StudentSnapshot).options(
+            defer(StudentSnapshot.profile_data),
+            undefer(StudentSnapshot.profile_data_raw)
+        ).filter(
             StudentSnapshot.student_prn == student_prn,
             StudentSnapshot.event_id == event_id
         ).order_by(StudentSnapshot.captured_at.desc()).first()
@@ -128,8 +131,17 @@ class SnapshotService:
         student_prn: str,
         limit: int = 50
     ) -> List[StudentSnapshot]:
-        """Get all snapshots for a student in chronological order"""
-        return self.db.query(StudentSnapshot).filter(
+        """
+        Get all snapshots for a student in chronological order
+        profile_data is loaded as raw JSON text (profile_data_raw)
+        """
+        return self.db.query(StudentSnapshot).options(
+            load_only(
+                StudentSnapshot.event_id, StudentSnapshot.captured_at,
+                StudentSnapshot.snapshot_trigger, StudentSnapshot.profile_data_raw,
+                StudentSnapshot.participation_status
+            )
+        ).filter(
             StudentSnapshot.student_prn == student_prn
         ).order_by(StudentSnapshot.captured_at.desc()).limit(limit).all()
     
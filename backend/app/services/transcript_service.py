@@ -22,6 +22,38 @@ from app.models.certificate import Certificate
 from app.models.participation_role import ParticipationRole
 from app.services.qr_service import generate_transcript_qr_code
 
+# Chunk size used when streaming a finished PDF to the client
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Stylesheets are built once per process rather than on every PDF request
+_styles = getSampleStyleSheet()
+
+_title_style = ParagraphStyle(
+    'CustomTitle',
+    parent=_styles['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1e3a8a'),
+    spaceAfter=12,
+    alignment=TA_CENTER
+)
+
+_heading_style = ParagraphStyle(
+    'CustomHeading',
+    parent=_styles['Heading2'],
+    fontSize=16,
+    textColor=colors.HexColor('#1e40af'),
+    spaceAfter=10,
+    spaceBefore=20
+)
+
+_footer_style = ParagraphStyle(
+    'Footer',
+    parent=_styles['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#64748b'),
+    alignment=TA_CENTER
+)
+
 
 class TranscriptService:
     """Service for generating student participation transcripts"""
@@ -43,33 +75,35 @@ class TranscriptService:
             .all()
         )
         
-        # Get all attendance records
-        attendances = (
-            self.db.query(Attendance, Event)
-            .join(Event, Attendance.event_id == Event.id)
+        # Attendance, certificates and roles are keyed by event id so each
+        # registration is matched with a dict lookup; the Event rows come
+        # from the registration query and are not re-joined here
+        attendance_by_event = {}
+        for attendance in (
+            self.db.query(Attendance)
             .filter(Attendance.student_prn == prn)
-            .order_by(Event.start_time.desc())
-            .all()
-        )
+            .order_by(Attendance.scanned_at)
+        ):
+            attendance_by_event.setdefault(attendance.event_id, attendance)
         
-        # Get all certificates
-        certificates = (
-            self.db.query(Certificate, Event)
-            .join(Event, Certificate.event_id == Event.id)
+        # Get all certificates (latest issued per event)
+        certificate_by_event = {}
+        for certificate in (
+            self.db.query(Certificate)
             .filter(Certificate.student_prn == prn)
             .filter(Certificate.revoked == False)
             .order_by(Certificate.issued_at.desc())
-            .all()
-        )
+        ):
+            certificate_by_event.setdefault(certificate.event_id, certificate)
         
         # Get all roles
-        roles = (
-            self.db.query(ParticipationRole, Event)
-            .join(Event, ParticipationRole.event_id == Event.id)
+        roles_by_event = {}
+        for event_id, role in (
+            self.db.query(ParticipationRole.event_id, ParticipationRole.role)
             .filter(ParticipationRole.student_prn == prn)
             .order_by(ParticipationRole.assigned_at.desc())
-            .all()
-        )
+        ):
+            roles_by_event.setdefault(event_id, []).append(role)
         
         # Compile comprehensive participation list
         participations = []
@@ -77,22 +111,9 @@ class TranscriptService:
         
         for ticket, event in registrations:
             if event.id not in event_ids_seen:
-                # Find matching attendance
-                attendance_record = next(
-                    (a for a, e in attendances if e.id == event.id),
-                    None
-                )
-                
-                # Find matching certificate
-                cert_record = next(
-                    (c for c, e in certificates if e.id == event.id),
-                    None
-                )
-                
-                # Find roles for this event
-                event_roles = [
-                    r.role for r, e in roles if e.id == event.id
-                ]
+                attendance_record = attendance_by_event.get(event.id)
+                cert_record = certificate_by_event.get(event.id)
+                event_roles = roles_by_event.get(event.id, [])
                 
                 participations.append({
                     'event_id': event.id,
@@ -151,26 +172,9 @@ class TranscriptService:
         
         # Container for PDF elements
         story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e3a8a'),
-            spaceAfter=12,
-            alignment=TA_CENTER
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#1e40af'),
-            spaceAfter=10,
-            spaceBefore=20
-        )
+        styles = _styles
+        title_style = _title_style
+        heading_style = _heading_style
         
         # Title
         story.append(Paragraph("Campus Participation Transcript", title_style))
@@ -294,13 +298,7 @@ class TranscriptService:
             # If QR generation fails, continue without it
             print(f"Warning: QR code generation failed: {e}")
         
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#64748b'),
-            alignment=TA_CENTER
-        )
+        footer_style = _footer_style
         story.append(Paragraph(
             "This transcript is generated automatically from the UniPass participation database.<br/>"
             f"Scan QR code above or visit /ps1/transcript/{data['prn']} for verification",
@@ -312,3 +310,17 @@ class TranscriptService:
         buffer.seek(0)
         
         return buffer
+
+    @staticmethod
+    def iter_pdf_chunks(buffer: BytesIO, chunk_size: int = PDF_CHUNK_SIZE):
+        """
+        Yield a built PDF in fixed-size chunks.
+        Iterating a BytesIO directly splits on newline bytes, which for
+        binary PDF data produces thousands of tiny writes.
+        """
+        buffer.seek(0)
+        while True:
+            chunk = buffer.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -13,7 +13,6 @@ from app.models.lecture_report import LectureReport
 from app.models.event import Event
 from app.models.user import User
 from datetime import datetime, timezone
-import json
 
 
 def create_sample_reports():
@@ -128,7 +127,7 @@ Thank you all for your attention and participation. Remember to practice what we
                 audio_filename=f"sample_lecture_{event.id}.mp3",
                 transcript=sample_transcript,
                 keywords=sample_keywords,
-                summary=json.dumps(sample_summary, indent=2),
+                summary=sample_summary,
                 generated_at=datetime.now(timezone.utc),
                 generated_by=user.id,
                 status="completed"
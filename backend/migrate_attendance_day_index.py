@@ -0,0 +1,90 @@
+"""
+Database Migration: Unique per-day attendance index
+
+Adds the index declared on the Attendance model so existing databases get
+it too:
+- attendance(event_id, student_prn, day_number)  UNIQUE, WHERE invalidated = false
+
+The scan endpoint inserts with ON CONFLICT against this index, so it must
+exist before deploying that code. It also covers the per-student
+COUNT(DISTINCT day_number) done on every scan.
+
+attendance(ticket_id) and tickets(student_prn) already have single-column
+indexes from the models, so neither is touched here.
+
+The index is built CONCURRENTLY so the migration does not block writes
+during a deploy.
+
+Run this script from the backend directory:
+    python migrate_attendance_day_index.py
+"""
+
+import sys
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+INDEX_NAME = "ix_att_event_prn_day"
+
+
+def index_exists(conn) -> bool:
+    """Check whether the per-day attendance index is already there"""
+    result = conn.execute(
+        text("SELECT 1 FROM pg_indexes WHERE tablename = 'attendance' AND indexname = :name"),
+        {"name": INDEX_NAME}
+    )
+    return result.first() is not None
+
+
+def find_duplicate_scans(conn) -> list:
+    """Valid rows sharing (event_id, student_prn, day_number) would make the unique index fail"""
+    result = conn.execute(text("""
+        SELECT event_id, student_prn, day_number, COUNT(*)
+        FROM attendance
+        WHERE invalidated = false AND day_number IS NOT NULL
+        GROUP BY event_id, student_prn, day_number
+        HAVING COUNT(*) > 1
+    """))
+    return result.fetchall()
+
+
+def migrate():
+    """Add the unique per-day attendance index"""
+    print("🔄 Starting migration: Unique per-day attendance index")
+
+    try:
+        engine = create_engine(settings.DATABASE_URL)
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if index_exists(conn):
+                print(f"  ⏭️  {INDEX_NAME} already exists")
+                return True
+
+            duplicates = find_duplicate_scans(conn)
+            if duplicates:
+                print(f"  ❌ {len(duplicates)} duplicate same-day scans found, invalidate the extras first:")
+                for event_id, student_prn, day_number, count in duplicates[:10]:
+                    print(f"     event {event_id} / {student_prn} / day {day_number}: {count} rows")
+                return False
+
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+                "ON attendance(event_id, student_prn, day_number) WHERE invalidated = false"
+            ))
+            print(f"  ✅ {INDEX_NAME} - for same-day duplicate scan checks")
+
+        print("\n" + "="*60)
+        print("✅ Migration completed successfully!")
+        print("="*60)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
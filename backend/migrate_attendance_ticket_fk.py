@@ -0,0 +1,88 @@
+"""
+Database Migration: Cascade attendance deletes from tickets
+
+Adds the foreign key declared on the Attendance model so existing databases
+get it too:
+- attendance(ticket_id) REFERENCES tickets(id) ON DELETE CASCADE
+
+delete_ticket still removes a ticket's attendance rows explicitly; the
+constraint makes the database enforce the same rule for any other delete.
+
+The constraint is added NOT VALID and validated separately, so existing
+rows are checked without holding a write lock on attendance.
+
+Run this script from the backend directory:
+    python migrate_attendance_ticket_fk.py
+"""
+
+import sys
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+CONSTRAINT_NAME = "attendance_ticket_id_fkey"
+
+
+def constraint_exists(conn) -> bool:
+    """Check whether the attendance -> tickets foreign key is already there"""
+    result = conn.execute(
+        text("""
+            SELECT 1 FROM information_schema.table_constraints
+            WHERE table_name = 'attendance' AND constraint_name = :name
+        """),
+        {"name": CONSTRAINT_NAME}
+    )
+    return result.first() is not None
+
+
+def find_orphaned_attendance(conn) -> list:
+    """Attendance rows pointing at deleted tickets would make validation fail"""
+    result = conn.execute(text("""
+        SELECT a.id, a.ticket_id, a.event_id, a.student_prn
+        FROM attendance a
+        LEFT JOIN tickets t ON t.id = a.ticket_id
+        WHERE a.ticket_id IS NOT NULL AND t.id IS NULL
+    """))
+    return result.fetchall()
+
+
+def migrate():
+    """Add the cascading attendance -> tickets foreign key"""
+    print("🔄 Starting migration: Cascade attendance deletes from tickets")
+
+    try:
+        engine = create_engine(settings.DATABASE_URL)
+
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if constraint_exists(conn):
+                print(f"  ⏭️  {CONSTRAINT_NAME} already exists")
+                return True
+
+            orphans = find_orphaned_attendance(conn)
+            if orphans:
+                print(f"  ❌ {len(orphans)} attendance rows reference missing tickets, remove them first:")
+                for attendance_id, ticket_id, event_id, student_prn in orphans[:10]:
+                    print(f"     attendance {attendance_id}: ticket {ticket_id} (event {event_id} / {student_prn})")
+                return False
+
+            conn.execute(text(
+                f"ALTER TABLE attendance ADD CONSTRAINT {CONSTRAINT_NAME} "
+                "FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE NOT VALID"
+            ))
+            conn.execute(text(f"ALTER TABLE attendance VALIDATE CONSTRAINT {CONSTRAINT_NAME}"))
+            print(f"  ✅ {CONSTRAINT_NAME} - ticket deletes cascade to attendance")
+
+        print("\n" + "="*60)
+        print("✅ Migration completed successfully!")
+        print("="*60)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,81 @@
+"""
+Migration: Store lecture report summaries as JSONB
+Converts lecture_reports.summary from TEXT (serialized JSON string) to JSONB
+so the driver parses it once on write instead of on every report read
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.db.database import engine
+
+
+def migrate():
+    """Convert lecture_reports.summary to JSONB"""
+
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT data_type
+            FROM information_schema.columns
+            WHERE table_name = 'lecture_reports' AND column_name = 'summary'
+        """))
+        row = result.fetchone()
+        if not row:
+            print("❌ lecture_reports.summary column not found")
+            return False
+
+        if row[0] == "jsonb":
+            print("⏭️  lecture_reports.summary is already JSONB")
+            return True
+
+        # Wrap legacy plain-text summaries so the cast below cannot fail
+        print("🔄 Checking existing summaries...")
+        rows = conn.execute(text(
+            "SELECT id, summary FROM lecture_reports WHERE summary IS NOT NULL"
+        )).fetchall()
+
+        wrapped = 0
+        for report_id, summary in rows:
+            try:
+                json.loads(summary)
+            except json.JSONDecodeError:
+                conn.execute(
+                    text("UPDATE lecture_reports SET summary = :summary WHERE id = :id"),
+                    {"summary": json.dumps({"raw_summary": summary}), "id": report_id}
+                )
+                wrapped += 1
+
+        if wrapped:
+            print(f"  ✅ Wrapped {wrapped} non-JSON summaries as raw_summary")
+
+        print("🔄 Converting summary column to JSONB...")
+        conn.execute(text("""
+            ALTER TABLE lecture_reports
+            ALTER COLUMN summary TYPE JSONB USING summary::jsonb
+        """))
+        conn.commit()
+        print("✅ lecture_reports.summary converted to JSONB")
+
+    return True
+
+
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("CORTEX LECTURE INTELLIGENCE ENGINE - SUMMARY JSONB MIGRATION")
+    print("="*60 + "\n")
+
+    try:
+        success = migrate()
+        if success:
+            print("\n✅ Migration completed successfully!")
+        else:
+            print("\n❌ Migration failed!")
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Migration error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,97 @@
+"""
+Database Migration: Composite indexes for ticket/attendance lookup keys
+
+Adds the indexes declared on the models so existing databases get them too:
+- tickets(event_id, student_prn)     UNIQUE - one ticket per student per event
+- attendance(event_id, student_prn)  partial, WHERE invalidated = false
+
+certificates(event_id, student_prn) is already covered by
+idx_certificate_event_student and events.share_slug already has a unique
+index, so neither is touched here.
+
+Indexes are built CONCURRENTLY so the migration does not block writes
+during a deploy.
+
+Run this script from the backend directory:
+    python migrate_lookup_indexes.py
+"""
+
+import sys
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+INDEXES = [
+    ("ix_ticket_event_prn", "tickets",
+     "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_ticket_event_prn "
+     "ON tickets(event_id, student_prn)",
+     "for duplicate registration checks"),
+    ("ix_att_event_prn_valid", "attendance",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_att_event_prn_valid "
+     "ON attendance(event_id, student_prn) WHERE invalidated = false",
+     "for valid attendance lookups"),
+]
+
+
+def get_existing_indexes(conn, table_name: str) -> list:
+    """Get list of existing indexes for a table"""
+    result = conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+        {"table": table_name}
+    )
+    return [row[0] for row in result]
+
+
+def find_duplicate_tickets(conn) -> list:
+    """Tickets sharing (event_id, student_prn) would make the unique index fail"""
+    result = conn.execute(text("""
+        SELECT event_id, student_prn, COUNT(*)
+        FROM tickets
+        GROUP BY event_id, student_prn
+        HAVING COUNT(*) > 1
+    """))
+    return result.fetchall()
+
+
+def migrate():
+    """Add composite indexes for lookup keys"""
+    print("🔄 Starting migration: Composite indexes for lookup keys")
+
+    try:
+        engine = create_engine(settings.DATABASE_URL)
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            indexes_created = 0
+
+            for index_name, table_name, statement, purpose in INDEXES:
+                if index_name in get_existing_indexes(conn, table_name):
+                    print(f"  ⏭️  {index_name} already exists")
+                    continue
+
+                if index_name == "ix_ticket_event_prn":
+                    duplicates = find_duplicate_tickets(conn)
+                    if duplicates:
+                        print(f"  ⚠️  Skipping {index_name}: {len(duplicates)} duplicate registrations found")
+                        for event_id, student_prn, count in duplicates[:10]:
+                            print(f"     event {event_id} / {student_prn}: {count} tickets")
+                        continue
+
+                conn.execute(text(statement))
+                print(f"  ✅ {index_name} - {purpose}")
+                indexes_created += 1
+
+        print("\n" + "="*60)
+        print(f"✅ Migration completed successfully! ({indexes_created} new indexes)")
+        print("="*60)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
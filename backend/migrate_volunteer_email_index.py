@@ -0,0 +1,85 @@
+"""
+Database Migration: Unique volunteer email per event
+
+Adds the index declared on the Volunteer model so existing databases get
+it too:
+- volunteers(event_id, email)  UNIQUE - one volunteer record per email per event
+
+Adding volunteers inserts with ON CONFLICT against this index, so it must
+exist before deploying that code.
+
+The index is built CONCURRENTLY so the migration does not block writes
+during a deploy.
+
+Run this script from the backend directory:
+    python migrate_volunteer_email_index.py
+"""
+
+import sys
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+INDEX_NAME = "ix_volunteer_event_email"
+
+
+def index_exists(conn) -> bool:
+    """Check whether the volunteer email index is already there"""
+    result = conn.execute(
+        text("SELECT 1 FROM pg_indexes WHERE tablename = 'volunteers' AND indexname = :name"),
+        {"name": INDEX_NAME}
+    )
+    return result.first() is not None
+
+
+def find_duplicate_volunteers(conn) -> list:
+    """Volunteers sharing (event_id, email) would make the unique index fail"""
+    result = conn.execute(text("""
+        SELECT event_id, email, COUNT(*)
+        FROM volunteers
+        GROUP BY event_id, email
+        HAVING COUNT(*) > 1
+    """))
+    return result.fetchall()
+
+
+def migrate():
+    """Add the unique volunteer email index"""
+    print("🔄 Starting migration: Unique volunteer email per event")
+
+    try:
+        engine = create_engine(settings.DATABASE_URL)
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if index_exists(conn):
+                print(f"  ⏭️  {INDEX_NAME} already exists")
+                return True
+
+            duplicates = find_duplicate_volunteers(conn)
+            if duplicates:
+                print(f"  ❌ {len(duplicates)} duplicate volunteers found, remove the extras first:")
+                for event_id, email, count in duplicates[:10]:
+                    print(f"     event {event_id} / {email}: {count} rows")
+                return False
+
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+                "ON volunteers(event_id, email)"
+            ))
+            print(f"  ✅ {INDEX_NAME} - for duplicate volunteer checks")
+
+        print("\n" + "="*60)
+        print("✅ Migration completed successfully!")
+        print("="*60)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+"""
+Shared fixtures: the app runs against a throwaway SQLite database, and every
+test starts from empty tables
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Settings are read at import time, so the environment is set up first
+_db_dir = tempfile.mkdtemp(prefix="unipass-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'test.db'}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402  (creates the tables)
+from app.db.base import Base  # noqa: E402
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.models import Event, Ticket, User, UserRole  # noqa: E402
+from app.routes import scan  # noqa: E402
+from app.security.jwt import create_access_token, create_ticket_token  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+        # Ids are reused once the tables are emptied
+        scan._event_cache.clear()
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin(db):
+    user = User(email="admin@example.com", password_hash="x", role=UserRole.ADMIN)
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def admin_headers(admin):
+    return {"Authorization": f"Bearer {create_access_token({'user_id': admin.id})}"}
+
+
+@pytest.fixture
+def event(db, admin):
+    now = datetime.now(timezone.utc)
+    event = Event(
+        title="Test Event",
+        description="",
+        location="Main Hall",
+        start_time=now - timedelta(hours=1),
+        end_time=now + timedelta(hours=5),
+        created_by=admin.id,
+        share_slug="test-event",
+        total_days=1
+    )
+    db.add(event)
+    db.commit()
+    return event
+
+
+@pytest.fixture
+def issue_ticket(db):
+    """Issue tickets the way registration does; returns their QR tokens"""
+    def issue(event_id: int, student_prn: str) -> str:
+        ticket = Ticket(event_id=event_id, student_prn=student_prn, token="TEMP")
+        db.add(ticket)
+        db.flush()
+        ticket.token = create_ticket_token({
+            "ticket_id": ticket.id,
+            "event_id": event_id,
+            "student_prn": student_prn
+        })
+        db.commit()
+        return ticket.token
+    return issue
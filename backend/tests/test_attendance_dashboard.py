@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+
+
+def test_override_returns_utc_timestamps(client, event, issue_ticket, admin_headers):
+    issue_ticket(event.id, "PRN001")
+    url = f"/attendance/event/{event.id}/override"
+
+    marked = client.post(url, headers=admin_headers, params={"student_prn": "PRN001"}).json()
+    again = client.post(url, headers=admin_headers, params={"student_prn": "PRN001"}).json()
+
+    assert marked["status"] == "success"
+    assert again["status"] == "already_marked"
+    # Both branches send the same aware UTC format
+    for body in (marked, again):
+        assert datetime.fromisoformat(body["scanned_at"]).tzinfo == timezone.utc
+    assert again["scanned_at"] == marked["scanned_at"]
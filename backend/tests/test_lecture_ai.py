@@ -0,0 +1,63 @@
+import pytest
+
+from app.models import LectureReport
+from app.routes import lecture_ai
+from app.services import lecture_ai_service
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lecture_ai_service, "AUDIO_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(lecture_ai, "run_lecture_pipeline", lambda report_id, audio_path: None)
+    return tmp_path
+
+
+def upload(client, headers, event_id, content=b"audio bytes"):
+    return client.post(
+        f"/ai/lecture/upload/{event_id}",
+        headers=headers,
+        files={"file": ("lecture.mp3", content, "audio/mpeg")}
+    )
+
+
+def test_upload_saves_file_and_report(client, db, event, admin_headers, storage_dir):
+    response = upload(client, admin_headers, event.id)
+
+    assert response.status_code == 202
+    report = db.get(LectureReport, response.json()["report_id"])
+    assert report.status == "processing"
+    assert [path.name for path in storage_dir.iterdir()] == [report.audio_filename]
+
+
+def test_oversized_upload_leaves_no_file(client, db, event, admin_headers, storage_dir, monkeypatch):
+    monkeypatch.setattr(lecture_ai_service, "MAX_FILE_SIZE_BYTES", 4)
+
+    response = upload(client, admin_headers, event.id)
+
+    assert response.status_code == 413
+    assert list(storage_dir.iterdir()) == []
+
+
+def test_failed_copy_leaves_no_file(client, db, event, admin_headers, storage_dir, monkeypatch):
+    def copy_then_fail(source, file_path):
+        with open(file_path, "wb") as dest:
+            dest.write(b"partial")
+        raise OSError("disk full")
+    monkeypatch.setattr(lecture_ai_service.LectureAIService, "_copy_upload", staticmethod(copy_then_fail))
+
+    response = upload(client, admin_headers, event.id)
+
+    assert response.status_code == 500
+    assert list(storage_dir.iterdir()) == []
+
+
+def test_failure_after_save_removes_file_and_report(client, db, event, admin_headers, storage_dir, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("audit log unavailable")
+    monkeypatch.setattr(lecture_ai, "create_audit_log", fail)
+
+    response = upload(client, admin_headers, event.id)
+
+    assert response.status_code == 500
+    assert list(storage_dir.iterdir()) == []
+    assert db.query(LectureReport).count() == 0
@@ -0,0 +1,55 @@
+from app.models import Attendance, Student
+
+
+def scan(client, token):
+    response = client.post("/scan/", params={"token": token})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_first_scan_marks_attendance(client, db, event, issue_ticket):
+    db.add(Student(prn="PRN001", name="Asha"))
+    db.commit()
+    token = issue_ticket(event.id, "PRN001")
+
+    body = scan(client, token)
+
+    assert body["status"] == "success"
+    assert body["student_name"] == "Asha"
+    assert body["attended_days"] == 1
+    assert db.query(Attendance).filter_by(student_prn="PRN001").count() == 1
+
+
+def test_same_day_rescan_is_a_no_op(client, db, event, issue_ticket):
+    token = issue_ticket(event.id, "PRN001")
+    first = scan(client, token)
+
+    second = scan(client, token)
+
+    assert second["status"] == "already_scanned"
+    assert second["attendance_id"] == first["attendance_id"]
+    assert second["attended_days"] == 1
+    assert db.query(Attendance).filter_by(student_prn="PRN001").count() == 1
+
+
+def test_rescan_after_invalidation_records_new_attendance(client, db, event, issue_ticket):
+    token = issue_ticket(event.id, "PRN001")
+    first = scan(client, token)
+    db.query(Attendance).filter_by(id=first["attendance_id"]).update({"invalidated": True})
+    db.commit()
+
+    # The unique index only covers valid rows, so the invalidated scan
+    # does not block a new one for the same day
+    second = scan(client, token)
+
+    assert second["status"] == "success"
+    assert second["attendance_id"] != first["attendance_id"]
+    rows = db.query(Attendance.invalidated).filter_by(student_prn="PRN001").all()
+    assert sorted(invalidated for (invalidated,) in rows) == [False, True]
+
+
+def test_scans_are_tracked_per_student(client, db, event, issue_ticket):
+    for prn in ("PRN001", "PRN002"):
+        assert scan(client, issue_ticket(event.id, prn))["status"] == "success"
+
+    assert db.query(Attendance).filter_by(event_id=event.id).count() == 2
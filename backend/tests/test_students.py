@@ -0,0 +1,131 @@
+from app.models import Student
+
+
+def import_csv(client, headers, content: str):
+    return client.post(
+        "/students/bulk-import-csv",
+        headers=headers,
+        files={"file": ("students.csv", content, "text/csv")}
+    )
+
+
+def test_list_students_pages_with_after_id(client, db, admin_headers):
+    db.add_all([Student(prn=f"PRN{i:03d}", name=f"Student {i}") for i in range(5)])
+    db.commit()
+
+    first = client.get("/students/", headers=admin_headers, params={"limit": 2, "include_total": True}).json()
+    assert [s["prn"] for s in first["students"]] == ["PRN004", "PRN003"]
+    assert first["total"] == 5
+
+    second = client.get(
+        "/students/", headers=admin_headers, params={"limit": 2, "after_id": first["next_cursor"]}
+    ).json()
+    assert [s["prn"] for s in second["students"]] == ["PRN002", "PRN001"]
+    assert "total" not in second
+
+    last = client.get(
+        "/students/", headers=admin_headers, params={"limit": 2, "after_id": second["next_cursor"]}
+    ).json()
+    assert [s["prn"] for s in last["students"]] == ["PRN000"]
+    assert last["next_cursor"] is None
+
+
+def test_list_students_full_last_page_has_cursor(client, db, admin_headers):
+    db.add_all([Student(prn=f"PRN{i:03d}", name=f"Student {i}") for i in range(2)])
+    db.commit()
+
+    page = client.get("/students/", headers=admin_headers, params={"limit": 2}).json()
+    assert page["next_cursor"] is not None
+
+    empty = client.get(
+        "/students/", headers=admin_headers, params={"limit": 2, "after_id": page["next_cursor"]}
+    ).json()
+    assert empty["students"] == []
+    assert empty["next_cursor"] is None
+
+
+def test_csv_import_counts_rows(client, db, admin_headers):
+    response = import_csv(client, admin_headers, (
+        "prn,name,email,department,year\n"
+        "PRN001,Asha,asha@example.com,Computer,3\n"
+        "PRN002,Ravi,,Electrical,\n"
+    ))
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results == {"total": 2, "imported": 2, "duplicates": 0, "errors": []}
+    ravi = db.query(Student).filter_by(prn="PRN002").one()
+    assert (ravi.email, ravi.branch, ravi.year) == (None, "Electrical", None)
+
+
+def test_csv_import_keeps_leading_zeros(client, db, admin_headers):
+    response = import_csv(client, admin_headers, (
+        "prn,name,email,department,year\n"
+        "007,Bond,,Field,1\n"
+    ))
+
+    assert response.json()["results"]["imported"] == 1
+    assert db.query(Student).filter_by(prn="007").count() == 1
+
+
+def test_csv_import_counts_duplicates(client, db, admin_headers):
+    db.add(Student(prn="PRN001", name="Existing"))
+    db.commit()
+
+    results = import_csv(client, admin_headers, (
+        "prn,name,email,department,year\n"
+        "PRN001,Asha,,,\n"
+        "PRN002,Ravi,,,\n"
+        "PRN002,Ravi again,,,\n"
+    )).json()["results"]
+
+    assert results["total"] == 3
+    assert results["imported"] == 1
+    assert results["duplicates"] == 2
+    assert db.query(Student).filter_by(prn="PRN001").one().name == "Existing"
+
+
+def test_csv_import_reports_malformed_rows(client, db, admin_headers):
+    results = import_csv(client, admin_headers, (
+        "prn,name,email,department,year\n"
+        "PRN001,Asha,asha@example.com,Computer,3,\n"
+        ",No PRN,,,\n"
+        "PRN003,Ravi,not-an-email,Electrical,third\n"
+    )).json()["results"]
+
+    # The trailing extra field is ignored, the row without a PRN is
+    # rejected and the bad email and year are dropped from an imported row
+    assert results["total"] == 3
+    assert results["imported"] == 2
+    assert results["errors"] == [
+        {"row": 3, "error": "PRN and Name are required"},
+        {"row": 4, "prn": "PRN003", "error": "Invalid email 'not-an-email' was not imported"},
+    ]
+    ravi = db.query(Student).filter_by(prn="PRN003").one()
+    assert (ravi.email, ravi.year) == (None, None)
+
+
+def test_csv_import_reports_unparseable_rows(client, db, admin_headers):
+    response = import_csv(client, admin_headers, (
+        "prn,name,email,department,year\n"
+        "PRN001,Asha,,,\n"
+        'PRN002,"Unterminated,,,\n'
+    ))
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results["errors"]
+    assert db.query(Student).filter_by(prn="PRN002").count() == 0
+
+
+def test_csv_import_rejects_missing_columns(client, admin_headers):
+    response = import_csv(client, admin_headers, "prn,name\nPRN001,Asha\n")
+
+    assert response.status_code == 400
+    assert "Missing required CSV columns" in response.json()["detail"]
+
+
+def test_csv_import_rejects_empty_file(client, admin_headers):
+    response = import_csv(client, admin_headers, "")
+
+    assert response.status_code == 400
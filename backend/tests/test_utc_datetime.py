@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models import AuditLog, Event
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def reload_event(db, event_id):
+    db.expire_all()
+    return db.get(Event, event_id)
+
+
+def test_aware_value_round_trips_as_utc(db, event):
+    start = datetime(2025, 3, 1, 15, 30, tzinfo=IST)
+    event.start_time = start
+    db.commit()
+
+    loaded = reload_event(db, event.id).start_time
+    assert loaded == start
+    assert loaded.tzinfo == timezone.utc
+    assert loaded.hour == 10
+
+
+def test_naive_value_is_read_back_as_utc(db, event):
+    event.start_time = datetime(2025, 3, 1, 10, 0)
+    db.commit()
+
+    loaded = reload_event(db, event.id).start_time
+    assert loaded == datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def test_default_timestamp_is_aware(db, event):
+    assert reload_event(db, event.id).created_at.tzinfo == timezone.utc
+
+
+def test_filters_compare_aware_values(db, event):
+    event.start_time = datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+    db.commit()
+
+    cutoff = datetime(2025, 3, 1, 15, 0, tzinfo=IST)  # 09:30 UTC
+    assert db.query(Event).filter(Event.start_time > cutoff).count() == 1
+    assert db.query(Event).filter(Event.start_time < cutoff).count() == 0
+
+
+def test_timezone_column_round_trips(db, event):
+    db.add(AuditLog(
+        event_id=event.id,
+        action_type="event_edited",
+        details={},
+        timestamp=datetime(2025, 3, 1, 15, 30, tzinfo=IST)
+    ))
+    db.commit()
+
+    db.expire_all()
+    timestamp = db.query(AuditLog.timestamp).scalar()
+    assert timestamp == datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+    assert timestamp.tzinfo == timezone.utc
@@ -0,0 +1,64 @@
+from app.models import AuditLog, User, UserRole, Volunteer
+from app.security.jwt import create_access_token
+
+
+def add_bulk(client, headers, event_id, volunteers):
+    return client.post(f"/volunteers/{event_id}/bulk", headers=headers, json=volunteers)
+
+
+def test_bulk_add_skips_repeats_and_existing_emails(client, db, event, admin, admin_headers):
+    db.add(Volunteer(event_id=event.id, name="Existing", email="old@example.com", added_by=admin.id))
+    db.commit()
+
+    response = add_bulk(client, admin_headers, event.id, [
+        {"name": "Asha", "email": "asha@example.com"},
+        {"name": "Asha again", "email": "asha@example.com"},
+        {"name": "Returning", "email": "old@example.com"},
+        {"name": "Ravi", "email": "ravi@example.com"},
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert body["message"] == "Added 2 volunteers"
+    # The first entry for a repeated email wins
+    assert sorted((v["name"], v["email"]) for v in body["added"]) == [
+        ("Asha", "asha@example.com"),
+        ("Ravi", "ravi@example.com"),
+    ]
+    assert all(v["id"] and v["added_at"] for v in body["added"])
+    assert body["skipped"] == ["old@example.com"]
+
+    assert db.query(Volunteer).filter_by(event_id=event.id).count() == 3
+    assert db.query(Volunteer).filter_by(email="old@example.com").one().name == "Existing"
+    audit = db.query(AuditLog).filter_by(action_type="volunteers_bulk_added").one()
+    assert audit.details["count"] == 2
+
+
+def test_bulk_add_with_nothing_new(client, db, event, admin, admin_headers):
+    db.add(Volunteer(event_id=event.id, name="Existing", email="old@example.com", added_by=admin.id))
+    db.commit()
+
+    body = add_bulk(client, admin_headers, event.id, [{"name": "Again", "email": "old@example.com"}]).json()
+
+    assert body["added"] == []
+    assert body["skipped"] == ["old@example.com"]
+    assert db.query(AuditLog).filter_by(action_type="volunteers_bulk_added").count() == 0
+
+
+def test_bulk_add_requires_event_ownership(client, db, event):
+    other = User(email="other@example.com", password_hash="x", role=UserRole.ORGANIZER)
+    db.add(other)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': other.id})}"}
+
+    response = add_bulk(client, headers, event.id, [{"name": "Asha", "email": "asha@example.com"}])
+
+    assert response.status_code == 403
+    assert db.query(Volunteer).count() == 0
+
+
+def test_bulk_add_unknown_event(client, admin_headers):
+    response = add_bulk(client, admin_headers, 999, [{"name": "Asha", "email": "asha@example.com"}])
+
+    assert response.status_code == 404
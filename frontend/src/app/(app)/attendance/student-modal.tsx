@@ -41,6 +41,12 @@ interface StudentAnalytics {
     month: string;
     count: number;
   }>;
+  pagination: {
+    limit: number;
+    offset: number;
+    total_history: number;
+    total_registered: number;
+  };
 }
 
 interface StudentModalProps {
@@ -50,18 +56,22 @@ interface StudentModalProps {
   onAuthRequired: () => Promise<boolean>;
 }
 
+// Rows per request; the analytics endpoint pages history and tickets together
+const PAGE_SIZE = 50;
+
 export default function StudentModal({ prn, onClose, overrideMode, onAuthRequired }: StudentModalProps) {
   const [data, setData] = useState<StudentAnalytics | null>(null);
   const [loading, setLoading] = useState(true);
   const [expandedTicket, setExpandedTicket] = useState<number | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [authenticatedForPending, setAuthenticatedForPending] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     async function fetchData() {
       try {
         setError(null);
-        const res = await api.get(`/students/${prn}/analytics`);
+        const res = await api.get(`/students/${prn}/analytics?limit=${PAGE_SIZE}&offset=0`);
         setData(res);
       } catch (e: any) {
         console.error("Failed to load student analytics:", e);
@@ -73,6 +83,32 @@ export default function StudentModal({ prn, onClose, overrideMode, onAuthRequire
     fetchData();
   }, [prn]);
 
+  const hasMore = data
+    ? data.attendance_history.length < data.pagination.total_history ||
+      data.registered_events.length < data.pagination.total_registered
+    : false;
+
+  async function loadMore() {
+    if (!data) return;
+    setLoadingMore(true);
+    try {
+      const offset = data.pagination.offset + data.pagination.limit;
+      const res: StudentAnalytics = await api.get(
+        `/students/${prn}/analytics?limit=${PAGE_SIZE}&offset=${offset}`
+      );
+      setData({
+        ...res,
+        attendance_history: [...data.attendance_history, ...res.attendance_history],
+        registered_events: [...data.registered_events, ...res.registered_events],
+      });
+    } catch (e: any) {
+      console.error("Failed to load more student records:", e);
+      toast.error(e?.message || "Failed to load more records");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   async function handlePendingEventClick(ticketId: number) {
     // If already expanded, just collapse
     if (expandedTicket === ticketId) {
@@ -216,7 +252,7 @@ export default function StudentModal({ prn, onClose, overrideMode, onAuthRequire
             {/* Attendance History */}
             {data.attendance_history.length > 0 && (
               <div className="history-section">
-                <h3>Attendance History ({data.attendance_history.length})</h3>
+                <h3>Attendance History ({data.pagination.total_history})</h3>
                 <div className="history-list">
                   {data.attendance_history.map((att) => (
                     <div key={att.attendance_id} className="history-item">
@@ -255,7 +291,7 @@ export default function StudentModal({ prn, onClose, overrideMode, onAuthRequire
             {/* Registered Events - Show All */}
             {data.registered_events.length > 0 && (
               <div className="history-section">
-                <h3>All Registered Events ({data.registered_events.length})</h3>
+                <h3>All Registered Events ({data.pagination.total_registered})</h3>
                 <div className="tickets-list">
                   {data.registered_events.map((event) => (
                     <div key={event.event_id} className={`ticket-card ${event.status === "completed" ? "completed" : ""}`}>
@@ -385,6 +421,12 @@ export default function StudentModal({ prn, onClose, overrideMode, onAuthRequire
                 </div>
               </div>
             )}
+
+            {hasMore && (
+              <button className="load-more-btn" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : `Load ${PAGE_SIZE} more`}
+              </button>
+            )}
           </>
         ) : null}
       </div>
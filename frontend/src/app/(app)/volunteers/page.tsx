@@ -121,7 +121,7 @@ export default function VolunteersPage() {
     setLoading(true);
     try {
       await api.post(`/volunteers/${volunteerId}/resend-certificate`);
-      toast.success(`Certificate resent to ${volunteerName}`);
+      toast.success(`Certificate resend queued for ${volunteerName}`);
       loadVolunteers();
     } catch (error: any) {
       console.error("Error resending certificate:", error);